@@ -0,0 +1,56 @@
+"""
+Time distinctive-term scoring on a large synthetic group-by-word matrix and report peak memory.
+
+    python benchmarks/bench_distinctive.py --groups 500 --vocab 200000 --words-per-group 40000
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_PATH = os.path.join(PROJECT_ROOT, "src")
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from telegramwordcloud.distinctive import DocumentTermMatrix
+
+
+def synthetic_matrix(groups: int, vocab: int, per_group: int, seed: int = 0) -> DocumentTermMatrix:
+    """Each group uses ``per_group`` distinct words drawn Zipf-like from ``vocab``, with Zipf-like counts."""
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, vocab + 1)
+    weights /= weights.sum()
+    rows = [np.unique(rng.choice(vocab, per_group, p=weights)) for _ in range(groups)]
+    indptr = np.concatenate(([0], np.cumsum([len(r) for r in rows])))
+    indices = np.concatenate(rows)
+    data = np.floor(rng.pareto(1.2, len(indices)) * 10) + 1
+    return DocumentTermMatrix([f"group{i}" for i in range(groups)], [f"w{i}" for i in range(vocab)], indptr, indices, data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TF-IDF and log-odds scoring of many groups in one pass.")
+    parser.add_argument("--groups", type=int, default=500, help="Channels/periods to compare.")
+    parser.add_argument("--vocab", type=int, default=200_000, help="Vocabulary size.")
+    parser.add_argument("--words-per-group", type=int, default=40_000, help="Words drawn per group.")
+    parser.add_argument("--top", type=int, default=200, help="Words kept per group.")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    matrix = synthetic_matrix(args.groups, args.vocab, args.words_per_group)
+    print(f"matrix:      {matrix.shape[0]} x {matrix.shape[1]}, {len(matrix.data):,} non-zero cells "
+          f"({time.perf_counter() - started:.1f}s to generate)")
+    for name, score in (("tfidf", matrix.tfidf), ("logodds", matrix.log_odds)):
+        started = time.perf_counter()
+        tops = matrix.top_terms(score(), args.top)
+        print(f"{name + ':':<12} {time.perf_counter() - started:.2f}s, group0 top {list(tops[0])[:5]}")
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"peak memory: {peak / (1024 ** 3 if sys.platform == 'darwin' else 1024 ** 2):.2f} GB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Measure how long saving a cloud keeps a job busy: the old synchronous JPEG write versus handing
+every format to the background encoder, plus each format's encode time and file size.
+
+    python benchmarks/bench_encoding.py
+    python benchmarks/bench_encoding.py --formats png webp jpeg svg --scales 1 2 --quality 85
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_PATH = os.path.join(PROJECT_ROOT, "src")
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from telegramwordcloud.core import TGWCCore
+from telegramwordcloud.encoding import DEFAULT_JPEG_QUALITY, IMAGE_FORMATS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synchronous JPEG save vs background multi-format encoding.")
+    parser.add_argument("--formats", nargs="+", default=list(IMAGE_FORMATS), choices=list(IMAGE_FORMATS))
+    parser.add_argument("--scales", nargs="+", type=int, default=[1, 2])
+    parser.add_argument("--quality", type=int, default=DEFAULT_JPEG_QUALITY)
+    args = parser.parse_args()
+
+    core = TGWCCore()
+    rng = random.Random(0)
+    wc = core.build_wordcloud({f"слово{i}": rng.randint(1, 1000) for i in range(200)}, set())
+    image = wc.to_image()
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        started = time.perf_counter()
+        wc.to_file(os.path.join(out_dir, "legacy.jpg"))
+        legacy_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        futures = core.save_wordcloud_outputs(
+            wc, out_dir, "wordcloud", formats=args.formats, scales=args.scales, quality=args.quality, image=image
+        )
+        submit_s = time.perf_counter() - started
+        results = {path: future.result() for path, future in futures.items()}
+        total_s = time.perf_counter() - started
+
+        print(f"to_file JPEG (blocks the job):   {legacy_s * 1000:.1f} ms")
+        print(f"background submit (blocks job):  {submit_s * 1000:.1f} ms")
+        print(f"background total ({len(results)} files):    {total_s:.2f}s wall, "
+              f"{sum(r['seconds'] for r in results.values()):.2f}s summed")
+        for path, result in results.items():
+            print(f"  {result['format']:<5} {result['scale']}x  {result['seconds'] * 1000:7.1f} ms  "
+                  f"{os.path.getsize(path) / 1024:8.1f} KiB  {os.path.basename(path)}")
+    core.close()
+
+
+if __name__ == "__main__":
+    main()
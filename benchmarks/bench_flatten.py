@@ -0,0 +1,146 @@
+"""
+Time the flattening stage of Telegram JSON exports (messages -> DataFrame) on its own: the
+entity-aware single pass against the previous recursive join with one row dict per message.
+Token counts are printed to show what the split keeps out of word tokenization; tokenization
+itself is not timed.
+
+    python benchmarks/bench_flatten.py --messages 500000
+    python benchmarks/bench_flatten.py --json path/to/result.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_PATH = os.path.join(PROJECT_ROOT, "src")
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from telegramwordcloud.core import CLOUD_TOKEN_PATTERN, TGWCCore
+
+
+class LegacyLoader:
+    """The previous load_json_export body: a recursive join per message, one row dict per message."""
+
+    def _stringify_telegram_text(self, value):
+        if isinstance(value, str):
+            return value
+        if isinstance(value, dict):
+            return value.get("text") or value.get("href") or ""
+        if isinstance(value, list):
+            parts = [self._stringify_telegram_text(item) for item in value]
+            return "".join(parts)
+        return ""
+
+    def frame(self, messages):
+        rows = []
+        for msg in messages:
+            text_content = self._stringify_telegram_text(msg.get("text", ""))
+            rows.append(
+                {
+                    "id": msg.get("id"),
+                    "date": msg.get("date"),
+                    "from": msg.get("from") or msg.get("actor"),
+                    "type": msg.get("type"),
+                    "text": text_content,
+                }
+            )
+        return pd.DataFrame(rows)
+
+
+def tokenize(texts):
+    """Token counts as the word-cloud tokenizer sees them, before stopwords and collocations."""
+    counts = Counter()
+    for text in texts:
+        counts.update(CLOUD_TOKEN_PATTERN.findall(text))
+    return counts
+
+
+def synthetic_messages(count: int, plain: float = 0.0, seed: int = 0):
+    """
+    Messages shaped like Telegram Desktop exports: mixed prose, tags, mentions and links. A
+    ``plain`` share of them has no formatting at all, which the export stores as a bare string.
+    """
+    rng = random.Random(seed)
+    words = [f"word{i}" for i in range(5000)]
+    for index in range(count):
+        if rng.random() < plain:
+            text = " ".join(rng.choices(words, k=rng.randint(5, 60)))
+            yield {"id": index, "type": "message", "date": "2024-01-01T00:00:00", "text": text,
+                   "text_entities": [{"type": "plain", "text": text}]}
+            continue
+        entities = []
+        for _ in range(rng.randint(1, 8)):
+            roll = rng.random()
+            if roll < 0.6:
+                entities.append({"type": "plain", "text": " ".join(rng.choices(words, k=rng.randint(3, 20))) + " "})
+            elif roll < 0.75:
+                entities.append({"type": "hashtag", "text": f"#{rng.choice(words)}"})
+            elif roll < 0.85:
+                entities.append({"type": "mention", "text": f"@{rng.choice(words)}"})
+            elif roll < 0.95:
+                entities.append({"type": "link", "text": f"https://www.site{rng.randint(1, 50)}.com/{index}"})
+            else:
+                entities.append({"type": "text_link", "text": "read more", "href": f"https://news{rng.randint(1, 9)}.org/a"})
+        text = [e["text"] if e["type"] == "plain" else e for e in entities]
+        yield {"id": index, "type": "message", "date": "2024-01-01T00:00:00", "text": text, "text_entities": entities}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entity-aware vs recursive flattening of Telegram JSON text.")
+    parser.add_argument("--json", help="Telegram Desktop result.json to read messages from.")
+    parser.add_argument("--messages", type=int, default=300_000, help="Synthetic message count.")
+    parser.add_argument(
+        "--plain", type=float, default=0.0,
+        help="Share of synthetic messages without formatting (default 0: every message carries entities).",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs; the best is reported.")
+    args = parser.parse_args()
+
+    if args.json:
+        with open(args.json, "r", encoding="utf-8") as f:
+            messages = TGWCCore()._extract_messages_from_dump(json.load(f))
+    else:
+        messages = list(synthetic_messages(args.messages, args.plain))
+
+    def best_of(func):
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    core, legacy = TGWCCore(), LegacyLoader()
+    legacy_stage_s = best_of(lambda: legacy.frame(messages))
+    entity_stage_s = best_of(lambda: core._messages_to_frame(messages))
+
+    df = core._messages_to_frame(messages)
+    tables_s = best_of(lambda: core.count_entities(df))
+    tables = core.count_entities(df)
+    legacy_tokens = tokenize(core.flatten_text_columns(legacy.frame(messages)))
+    entity_tokens = tokenize(core.flatten_text_columns(df))
+
+    print(f"messages:             {len(messages)}")
+    print(
+        f"messages -> frame:    recursive join {legacy_stage_s:.3f}s, entity-aware {entity_stage_s:.3f}s "
+        f"({legacy_stage_s / entity_stage_s:.2f}x)"
+    )
+    print(f"entity tables:        {tables_s:.3f}s, only when hashtag/mention/domain clouds are asked for")
+    print(
+        f"tokens (distinct):    recursive join {sum(legacy_tokens.values())} ({len(legacy_tokens)}), "
+        f"entity-aware {sum(entity_tokens.values())} ({len(entity_tokens)})"
+    )
+    for name, counts in tables.items():
+        top = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:3]
+        print(f"{name + ':':<21} {len(counts)} distinct, top {top}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compare grouped word counting in one pass with running the counting pipeline once per group.
+
+    python benchmarks/bench_groups.py --senders 300 --messages 200000
+    python benchmarks/bench_groups.py --csv exports/channel/20240101120000/messages.csv --column sender_id
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_PATH = os.path.join(PROJECT_ROOT, "src")
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from telegramwordcloud.core import TGWCCore
+from telegramwordcloud.counting import tokenize
+
+
+def synthetic_frame(messages: int, senders: int, seed: int = 0) -> pd.DataFrame:
+    """Messages from ``senders`` authors with Zipf-like activity and vocabulary."""
+    rng = random.Random(seed)
+    words = [f"word{i}" for i in range(20_000)]
+    word_weights = [1 / (rank + 1) for rank in range(len(words))]
+    sender_weights = [1 / (rank + 1) for rank in range(senders)]
+    return pd.DataFrame({
+        "from": rng.choices([f"sender{i}" for i in range(senders)], weights=sender_weights, k=messages),
+        "text": [" ".join(rng.choices(words, weights=word_weights, k=rng.randint(5, 40))) for _ in range(messages)],
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="One grouped counting pass vs one counting pass per group.")
+    parser.add_argument("--csv", help="Export to group instead of synthetic data.")
+    parser.add_argument("--column", default="from", help="Column to group by.")
+    parser.add_argument("--messages", type=int, default=200_000, help="Synthetic message count.")
+    parser.add_argument("--senders", type=int, default=300, help="Synthetic sender count.")
+    parser.add_argument("--top", type=int, default=0, help="Only the N largest groups (0 = all).")
+    args = parser.parse_args()
+
+    core = TGWCCore()
+    df = core.load_csv(args.csv) if args.csv else synthetic_frame(args.messages, args.senders)
+    stopwords = core.load_stopwords(os.path.join(PROJECT_ROOT, "stopwords.txt"))
+
+    started = time.perf_counter()
+    grouped = core.count_words_by_group(df, args.column, stopwords, top_groups=args.top or None)
+    grouped_s = time.perf_counter() - started
+
+    # Baseline: filter the frame and count each group separately, as a per-group pipeline would.
+    lowered = {w.lower() for w in stopwords}
+    started = time.perf_counter()
+    for label, _ in grouped:
+        subset = df[df[args.column].astype(str) == label]
+        counts = {}
+        for text in core.row_texts(subset):
+            for word in tokenize(text, lowered):
+                counts[word] = counts.get(word, 0) + 1
+    per_group_s = time.perf_counter() - started
+
+    print(f"messages:         {len(df)}")
+    print(f"groups:           {len(grouped)} by '{args.column}'")
+    print(f"per-group passes: {per_group_s:.2f}s")
+    print(f"one grouped pass: {grouped_s:.2f}s  ({per_group_s / grouped_s:.1f}x)")
+    label, counts = grouped[0]
+    top = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:5]
+    print(f"largest group:    {label} {top}")
+
+
+if __name__ == "__main__":
+    main()
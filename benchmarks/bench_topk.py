@@ -0,0 +1,85 @@
+"""
+Compare approximate (heavy-hitters) and exact word counting on accuracy, memory and time.
+
+    python benchmarks/bench_topk.py --synthetic 2000000
+    python benchmarks/bench_topk.py --csv exports/channel/20240101120000/messages.csv
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_PATH = os.path.join(PROJECT_ROOT, "src")
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from telegramwordcloud.core import APPROX_CAPACITY, TGWCCore
+from telegramwordcloud.counting import count_top_words, tokenize
+
+
+def synthetic_messages(n_tokens: int, vocab: int, seed: int = 0):
+    """Zipf(1.1)-distributed messages of 20 tokens over ``vocab`` distinct words."""
+    rng = random.Random(seed)
+    cumulative = list(itertools.accumulate(1 / (rank ** 1.1) for rank in range(1, vocab + 1)))
+    words = [f"w{rank}" for rank in range(vocab)]
+    for _ in range(n_tokens // 20):
+        yield " ".join(rng.choices(words, cum_weights=cumulative, k=20))
+
+
+def measure(func):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Approximate vs exact top-K word counting.")
+    parser.add_argument("--csv", help="Telegram CSV export to read text from.")
+    parser.add_argument("--synthetic", type=int, default=1_000_000, help="Token count for the synthetic corpus.")
+    parser.add_argument("--vocab", type=int, default=500_000, help="Distinct words in the synthetic corpus.")
+    parser.add_argument("--capacity", type=int, default=APPROX_CAPACITY, help="Heavy-hitters capacity.")
+    parser.add_argument("--top", type=int, default=200, help="K for top-K accuracy.")
+    args = parser.parse_args()
+
+    if args.csv:
+        core = TGWCCore()
+        texts = core.flatten_text_columns(core.load_csv(args.csv))
+    else:
+        texts = list(synthetic_messages(args.synthetic, args.vocab))
+
+    def exact():
+        counts = Counter()
+        for text in texts:
+            counts.update(tokenize(text, set()))
+        return counts
+
+    exact_counts, exact_s, exact_mem = measure(exact)
+    summary, approx_s, approx_mem = measure(lambda: count_top_words(texts, set(), args.capacity))
+
+    true_top = [w for w, _ in exact_counts.most_common(args.top)]
+    approx_top = [w for w, _ in summary.most_common(args.top)]
+    recall = len(set(true_top) & set(approx_top)) / max(len(true_top), 1)
+    approx_counts = dict(summary.most_common())
+    rel_errors = [(exact_counts[w] - approx_counts.get(w, 0)) / exact_counts[w] for w in true_top]
+
+    print(f"messages:             {len(texts)}")
+    print(f"tokens (N):           {summary.total}")
+    print(f"distinct words:       {len(exact_counts)}")
+    print(f"capacity:             {args.capacity}  (undercount bound {summary.error_bound()}, N/(capacity+1) = {summary.total // (args.capacity + 1)})")
+    print(f"exact   time/peak:    {exact_s:.2f}s  {exact_mem / 1e6:.1f} MB")
+    print(f"approx  time/peak:    {approx_s:.2f}s  {approx_mem / 1e6:.1f} MB")
+    print(f"top-{args.top} recall:       {recall:.3f}")
+    print(f"max rel. undercount:  {max(map(abs, rel_errors)) if rel_errors else 0:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Load-test a running word-cloud service (python main.py --serve) and report throughput and latency.
+
+    python benchmarks/load_test.py --upload exports/channel/20240101120000/messages.csv --requests 200 --concurrency 8
+    python benchmarks/load_test.py --channel bbcrussian --variants 4
+
+``--variants`` spreads requests over that many distinct ``max_words`` settings, so the first
+request of each variant is a cache miss and the rest are hits.
+"""
+import argparse
+import json
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Requests/s and latency of the word-cloud HTTP service.")
+    parser.add_argument("--url", default="http://127.0.0.1:8765", help="Service base URL.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--upload", help="CSV or result.json export to POST with every request.")
+    source.add_argument("--channel", help="Channel to request (uses the service's Telethon session).")
+    parser.add_argument("--requests", type=int, default=100, help="Total requests to send.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight at once.")
+    parser.add_argument("--variants", type=int, default=1, help="Distinct render settings to cycle through.")
+    parser.add_argument("--date-from", help="Optional scope start (YYYY-MM-DD).")
+    parser.add_argument("--date-to", help="Optional scope end (YYYY-MM-DD).")
+    args = parser.parse_args()
+
+    body = None
+    base_query = {}
+    if args.upload:
+        with open(args.upload, "rb") as f:
+            body = f.read()
+        base_query["format"] = "json" if args.upload.lower().endswith(".json") else "csv"
+    else:
+        base_query["channel"] = args.channel
+    if args.date_from:
+        base_query["date_from"] = args.date_from
+    if args.date_to:
+        base_query["date_to"] = args.date_to
+
+    def send(index):
+        query = dict(base_query, max_words=200 - (index % max(args.variants, 1)))
+        request = urllib.request.Request(f"{args.url.rstrip('/')}/cloud?{urlencode(query)}", data=body)
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=600) as response:
+                payload = json.load(response)
+                return time.perf_counter() - started, response.status, payload.get("cached", False)
+        except urllib.error.HTTPError as exc:
+            return time.perf_counter() - started, exc.code, False
+        except OSError:
+            return time.perf_counter() - started, 0, False
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(send, range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for latency, status, _ in results if status == 200]
+    errors = [status for _, status, _ in results if status != 200]
+    hits = sum(1 for _, status, cached in results if status == 200 and cached)
+    print(f"requests:       {args.requests} ({args.concurrency} concurrent, {args.variants} variants)")
+    print(f"elapsed:        {elapsed:.2f}s")
+    print(f"throughput:     {len(latencies) / elapsed:.1f} req/s")
+    if latencies:
+        print(f"latency p50:    {statistics.median(latencies) * 1000:.1f} ms")
+        print(f"latency p95:    {percentile(latencies, 0.95) * 1000:.1f} ms")
+        print(f"latency max:    {max(latencies) * 1000:.1f} ms")
+        print(f"cache hits:     {hits}/{len(latencies)}")
+    if errors:
+        print(f"errors:         {len(errors)} (status codes: {sorted(set(errors))})")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,13 +8,7 @@ SRC_PATH = os.path.join(PROJECT_ROOT, "src")
 if SRC_PATH not in sys.path:
     sys.path.insert(0, SRC_PATH)
 
-from telegramwordcloud.core import (
-    TELEGRAM_SESSION_NAME,
-    TELETHON_CLIENT_KWARGS,
-    TGWCCore,
-    TelegramClient,
-    logger,
-)
+from telegramwordcloud.core import TELEGRAM_SESSION_NAME, TGWCCore, logger
 
 
 def load_credentials(core: TGWCCore):
@@ -39,31 +33,27 @@ def main():
     parser.add_argument("--session-suffix", default="debug", help="Suffix for the session file to avoid clobbering GUI sessions.")
     args = parser.parse_args()
 
-    core = TGWCCore()
+    session_name = f"{TELEGRAM_SESSION_NAME}_{args.session_suffix}"
+    logger.info("Using session %s", session_name)
+
+    core = TGWCCore(session_name=session_name)
     creds = load_credentials(core)
     api_id = int(creds["TELEGRAM_API_ID"])
     api_hash = creds["TELEGRAM_API_HASH"]
     phone = creds["TELEGRAM_PHONE"]
 
-    session_name = f"{TELEGRAM_SESSION_NAME}_{args.session_suffix}"
-    logger.info("Using session %s", session_name)
+    def provider(two_factor=False):
+        return prompt_code(two_factor=two_factor)
 
-    client = TelegramClient(session_name, api_id, api_hash, **TELETHON_CLIENT_KWARGS)
-    client.connect()
     try:
-        if not client.is_user_authorized():
-            logger.info("Requesting login code for %s", phone)
-
-            def provider(two_factor=False):
-                return prompt_code(two_factor=two_factor)
-
-            core._login(client, phone, provider)
-            logger.info("Authentication successful.")
-        else:
+        if core.check_authorization(api_id, api_hash):
             logger.info("Existing session is already authenticated.")
+        else:
+            logger.info("Requesting login code for %s", phone)
 
-        logger.info("Fetching latest message from %s ...", args.channel)
-        message = next(client.iter_messages(args.channel, limit=1))
+        with core.telethon.session(api_id, api_hash, phone, provider) as client:
+            logger.info("Fetching latest message from %s ...", args.channel)
+            message = next(client.iter_messages(args.channel, limit=1))
         snippet = str(message.message or "")[:200]
         try:
             print(f"Latest message snippet: {snippet}")
@@ -71,7 +61,7 @@ def main():
             print("Latest message snippet:", snippet.encode("utf-8", errors="ignore").decode("utf-8"))
         logger.info("Success. You can now use the GUI with the same session.")
     finally:
-        client.disconnect()
+        core.close()
 
 
 if __name__ == "__main__":
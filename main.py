@@ -1,13 +1,62 @@
 # main.py
+import argparse
 import os
 import sys
+import time
 
 PROJECT_ROOT = os.path.dirname(__file__)
 SRC_PATH = os.path.join(PROJECT_ROOT, "src")
 if SRC_PATH not in sys.path:
     sys.path.insert(0, SRC_PATH)
 
-from telegramwordcloud.ui import run_app
+
+def main():
+    parser = argparse.ArgumentParser(description="TelegramWordCloud GUI, or a headless HTTP service with --serve.")
+    parser.add_argument("--serve", action="store_true", help="Run the HTTP word-cloud service instead of the GUI.")
+    parser.add_argument("--host", default=None, help="Service bind address (default 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=None, help="Service port (default 8765).")
+    parser.add_argument("--workers", type=int, default=None, help="Render worker processes (default: CPU count - 1).")
+    render = parser.add_argument_group("re-render a saved frequency table (skips ingestion)")
+    render.add_argument("--frequencies", help="Frequency table (.wcf, .csv or .json) saved next to an earlier cloud.")
+    render.add_argument("--output", help="Image to write: .png, .webp, .jpg or .svg (default: <table>_restyled.png).")
+    render.add_argument("--width", type=int, default=None, help="Image width in pixels.")
+    render.add_argument("--height", type=int, default=None, help="Image height in pixels.")
+    render.add_argument("--max-words", type=int, default=None, help="Maximum number of words.")
+    render.add_argument("--font", default=None, help="Path to a .ttf/.otf font.")
+    render.add_argument("--colormap", default=None, help="Matplotlib colormap name, e.g. plasma.")
+    args = parser.parse_args()
+
+    if args.frequencies:
+        render_frequencies(args)
+    elif args.serve:
+        from telegramwordcloud.service import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_WORKERS, serve
+
+        serve(args.host or DEFAULT_HOST, args.port or DEFAULT_PORT, args.workers or DEFAULT_WORKERS)
+    else:
+        from telegramwordcloud.ui import run_app
+
+        run_app()
+
+
+def render_frequencies(args):
+    from telegramwordcloud.core import PROJECT_ROOT, WORDCLOUD_HEIGHT, WORDCLOUD_MAX_WORDS, WORDCLOUD_WIDTH, TGWCCore
+
+    core = TGWCCore()
+    started = time.perf_counter()
+    stop = core.load_stopwords(str(PROJECT_ROOT / "stopwords.txt"))
+    table = core.load_frequency_table(args.frequencies, stop)
+    loaded = time.perf_counter()
+    wc = core.build_wordcloud(
+        table.frequencies, stop,
+        width=args.width or WORDCLOUD_WIDTH, height=args.height or WORDCLOUD_HEIGHT,
+        max_words=args.max_words or WORDCLOUD_MAX_WORDS, font_path=args.font, colormap=args.colormap,
+    )
+    output = args.output or os.path.splitext(args.frequencies)[0] + "_restyled.png"
+    # Format follows the suffix: .png, .webp, .jpg or .svg.
+    output = core.save_wordcloud_image(wc, os.path.dirname(os.path.abspath(output)), os.path.basename(output))
+    print(f"Loaded {len(table.frequencies)} words in {loaded - started:.2f}s, "
+          f"laid out and saved in {time.perf_counter() - loaded:.2f}s -> {output}")
+
 
 if __name__ == "__main__":
-    run_app()
+    main()
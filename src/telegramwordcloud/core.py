@@ -1,15 +1,52 @@
 # core.py
+import asyncio
+import concurrent.futures
 import datetime
+import glob
+import hashlib
+import io
+import itertools
 import json
 import logging
+import multiprocessing
 import os
 import platform
 import re
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from typing import Callable, Dict, Iterable, List, Optional, Set, Union
+from typing import Callable, ContextManager, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Union
 
+import numpy as np
 import pandas as pd
+from PIL import Image, ImageDraw, ImageFont
 from wordcloud import WordCloud
+from wordcloud.tokenization import unigrams_and_bigrams
+
+from .counting import TOKEN_PATTERN, count_top_words, tokenize
+from .csvindex import CsvDateIndex
+from .dedup import MessageDeduplicator
+from .distinctive import SCORING_METHODS, DocumentTermMatrix
+from .encoding import DEFAULT_IMAGE_FORMATS, DEFAULT_JPEG_QUALITY, IMAGE_FORMATS, encode_wordcloud, output_path
+from .entities import ENTITY_COLUMN, MESSAGE_COLUMNS, count_entities, flatten_messages
+from .fonts import REQUIRED_CHARS, FontIndex
+from .frequencies import TABLE_SUFFIXES, FrequencyTable, stopwords_hash
+from .history import RunHistory
+from .live import LIVE_POLL_SECONDS, LIVE_RENDER_INTERVAL, LIVE_TICK_SECONDS, LiveCloudRenderer, LiveWordCounts
+from .tokenizer import Tokenizer
+
+def user_data_dir() -> Path:
+    """Per-user directory for the app's own state (run history, font index), outside the project tree."""
+    if sys.platform.startswith("win"):
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Application Support"
+    else:
+        base = Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local" / "share"))
+    return base / "TelegramWordCloud"
+
 
 PACKAGE_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = PACKAGE_DIR.parent.parent
@@ -17,7 +54,27 @@ LOG_FILE = PROJECT_ROOT / "telegramwordcloud.log"
 ENV_FILE = PROJECT_ROOT / ".env"
 ENV_KEYS = ("TELEGRAM_API_ID", "TELEGRAM_API_HASH", "TELEGRAM_PHONE")
 TELEGRAM_SESSION_NAME = "telegramwordcloud_session"
+# A font file next to the app wins over the index when present (the original default).
 FONT_FAMILY = "arial.ttf"  # keep current default  :contentReference[oaicite:9]{index=9}
+USER_DATA_DIR = user_data_dir()
+FONT_INDEX_FILE = USER_DATA_DIR / "fonts_index.json"
+HISTORY_FILE = USER_DATA_DIR / "history.db"
+# One date index per CSV export that has been read with a date window (see csvindex.py).
+CSV_INDEX_DIR = USER_DATA_DIR / "csv_index"
+WORDCLOUD_WIDTH = 1000
+WORDCLOUD_HEIGHT = 700
+WORDCLOUD_MAX_WORDS = 200
+# Calendar buckets for time-sliced clouds: pandas period alias and the label format used in filenames.
+TIME_BUCKETS = {"week": ("W", "%Y-%m-%d"), "month": ("M", "%Y-%m")}
+ANIMATION_FORMATS = ("gif", "mp4", "frames")
+# Words tracked by the approximate counter; reported counts are within N / (APPROX_CAPACITY + 1).
+APPROX_CAPACITY = 50_000
+# Seconds closing the app waits for a job that still holds the Telegram session.
+CLOSE_TIMEOUT = 2.0
+# Background threads encoding saved images; Pillow's encoders release the GIL.
+ENCODE_WORKERS = min(4, os.cpu_count() or 1)
+# Words whose per-frame font size would drop below this are hidden for that frame.
+MIN_FRAME_FONT_SIZE = 6
 TELETHON_CLIENT_KWARGS = {
     "device_model": "TelegramWordCloud",
     "system_version": "Android 13",
@@ -25,6 +82,31 @@ TELETHON_CLIENT_KWARGS = {
     "lang_code": "en",
     "system_lang_code": "en",
 }
+# Telethon sleeps 1s per history request on large pulls by default; takeout sessions
+# have relaxed flood limits so bulk exports skip the wait entirely.
+TAKEOUT_WAIT_TIME = 0
+# GetHistory returns at most 100 messages per request, so report progress once per page.
+PROGRESS_EVERY = 100
+CONNECT_ATTEMPTS = 3
+DATE_COLUMN = "date"
+CSV_CHUNK_ROWS = 20_000
+# Long loops poll the cancel event every this many items; pools are polled at this interval.
+CANCEL_CHECK_EVERY = 5_000
+CANCEL_POLL_SECONDS = 0.1
+# Pools are started from job threads; forking a threaded process can copy held locks into the
+# child, so workers are spawned fresh instead (the default on Windows and macOS anyway).
+POOL_START_METHOD = "spawn"
+JSON_READ_BYTES = 8 * 1024 * 1024
+EXPORT_SUFFIXES = (".csv", ".json")
+# Added by load_exports so merged rows remember which export they came from.
+SOURCE_COLUMN = "source_file"
+# Columns worth grouping by: JSON exports carry "from", Telethon downloads "sender_id", and merged
+# folders the source file. Any other categorical column works too.
+GROUP_COLUMNS = ("from", "sender_id", SOURCE_COLUMN)
+TOP_GROUPS = 20
+GROUP_TABLE_WORDS = 50
+# WordCloud.process_text's default tokenization (min_word_length=0, include_numbers=False).
+CLOUD_TOKEN_PATTERN = re.compile(r"\w[\w']*")
 
 logger = logging.getLogger("telegramwordcloud")
 if not logger.handlers:
@@ -44,12 +126,14 @@ logger.propagate = False
 # Optional Telethon import (unchanged behavior)  :contentReference[oaicite:10]{index=10}
 try:
     from telethon.sync import TelegramClient  # type: ignore
+    from telethon import events  # type: ignore
     from telethon.errors import (  # type: ignore
         ChannelPrivateError,
         FloodWaitError,
         PhoneCodeInvalidError,
         PhoneNumberInvalidError,
         SessionPasswordNeededError,
+        TakeoutInitDelayError,
         UpdateAppToLoginError,
         UsernameInvalidError,
         UsernameNotOccupiedError,
@@ -57,8 +141,16 @@ try:
     TELETHON_AVAILABLE = True
 except ImportError:
     TELETHON_AVAILABLE = False
-    TelegramClient = None  # type: ignore
-    ChannelPrivateError = FloodWaitError = PhoneCodeInvalidError = PhoneNumberInvalidError = SessionPasswordNeededError = UsernameInvalidError = UsernameNotOccupiedError = Exception  # type: ignore
+    TelegramClient = events = None  # type: ignore
+    ChannelPrivateError = FloodWaitError = PhoneCodeInvalidError = PhoneNumberInvalidError = SessionPasswordNeededError = TakeoutInitDelayError = UpdateAppToLoginError = UsernameInvalidError = UsernameNotOccupiedError = Exception  # type: ignore
+
+try:
+    import imageio.v2 as imageio
+
+    imageio_available = True
+except ImportError:
+    imageio = None
+    imageio_available = False
 
 try:
     import nltk
@@ -71,11 +163,219 @@ except ImportError:
     nltk_available = False
 
 
+class CancelledError(Exception):
+    """Raised when the user cancels a running job."""
+
+
+def check_cancelled(cancel_event: Optional[threading.Event]) -> None:
+    if cancel_event is not None and cancel_event.is_set():
+        raise CancelledError()
+
+
+class _CancellableColorFunc:
+    """Wraps a WordCloud color_func, which the layout loop calls once per placed word."""
+
+    def __init__(self, color_func, cancel_event: threading.Event):
+        self.color_func = color_func
+        self.cancel_event = cancel_event
+
+    def __call__(self, *args, **kwargs):
+        check_cancelled(self.cancel_event)
+        return self.color_func(*args, **kwargs)
+
+
+def _render_frequencies_to_file(frequencies: Dict[str, float], path: str, font_path: Optional[str]) -> str:
+    """Process-pool worker: lay out one cloud from precomputed frequencies and write it to ``path``."""
+    wc = WordCloud(font_path=font_path, width=WORDCLOUD_WIDTH, height=WORDCLOUD_HEIGHT, max_words=WORDCLOUD_MAX_WORDS)
+    wc.generate_from_frequencies(frequencies)
+    wc.to_file(path)
+    return path
+
+
+def _load_export_file(path: str, date_from, date_to) -> Tuple[pd.DataFrame, float]:
+    """Process-pool worker: parse one CSV or JSON export; returns the rows and the parse time."""
+    started = time.perf_counter()
+    core = TGWCCore()
+    if path.lower().endswith(".json"):
+        df = core.load_json_export(path, date_from=date_from, date_to=date_to)
+    else:
+        df = core.load_csv(path, date_from=date_from, date_to=date_to)
+    return df, time.perf_counter() - started
+
+
+def _render_in_slot(render_slot: Callable[[], ContextManager], renderer, top: Dict[str, int], version: int) -> Image.Image:
+    with render_slot():
+        return renderer.render(top, version)
+
+
+def _read_frames(paths: List[str], cancel_event: Optional[threading.Event] = None) -> Iterator[Image.Image]:
+    """Decode saved frames lazily, one at a time, as the animation encoder consumes them."""
+    for path in paths:
+        check_cancelled(cancel_event)
+        with Image.open(path) as img:
+            yield img.convert("RGB")
+
+
+def _render_layout_frame(layout: List, label: str, path: str, font_path: Optional[str]) -> str:
+    """Process-pool worker: draw a precomputed layout (no placement search) and stamp the period label."""
+    wc = WordCloud(font_path=font_path, width=WORDCLOUD_WIDTH, height=WORDCLOUD_HEIGHT)
+    wc.layout_ = layout
+    image = wc.to_image()
+    ImageDraw.Draw(image).text((12, WORDCLOUD_HEIGHT - 24), label, fill="white")
+    image.save(path)
+    return path
+
+
+class TelethonClientManager:
+    """
+    Keeps one authenticated TelegramClient open between jobs.
+
+    Telethon's sync API drives the client through the event loop it was created on, so the
+    manager owns that loop and hands the client out to one caller at a time. Serialising
+    access also keeps concurrent jobs from fighting over the SQLite session file.
+    """
+
+    def __init__(self, session_name: str = TELEGRAM_SESSION_NAME, login: Optional[Callable] = None):
+        self.session_name = session_name
+        self._login = login
+        self._lock = threading.RLock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client = None
+        self._credentials = None
+
+    @contextmanager
+    def session(self, api_id: int, api_hash: str, phone: str = "", code_provider=None, *, authorize: bool = True) -> Iterator:
+        """
+        Yield a connected client, logging in through ``code_provider`` when ``authorize`` is set.
+        A dropped connection is re-established on the next call; use ``run`` to also retry the
+        interrupted call.
+        """
+        if not TELETHON_AVAILABLE:
+            raise ImportError("Telethon is required. Install it with 'pip install telethon'.")
+        with self._lock:
+            previous_loop = self._current_loop()
+            asyncio.set_event_loop(self._ensure_loop())
+            try:
+                client = self._ensure_client(api_id, api_hash)
+                if authorize and not client.is_user_authorized():
+                    if self._login is None:
+                        raise ValueError("This session is not signed in.")
+                    self._login(client, phone, code_provider)
+                yield client
+            except (ConnectionError, OSError):
+                self._drop_client()
+                raise
+            finally:
+                asyncio.set_event_loop(previous_loop)
+
+    def run(self, api_id: int, api_hash: str, func: Callable, phone: str = "", code_provider=None, *, authorize: bool = True):
+        """
+        Return ``func(client)`` inside ``session``. If the connection drops mid-call, the client
+        is reconnected and ``func`` is called once more, so it must be safe to repeat.
+        """
+        for attempt in (1, 2):
+            try:
+                with self.session(api_id, api_hash, phone, code_provider, authorize=authorize) as client:
+                    return func(client)
+            except (ConnectionError, OSError) as exc:
+                if attempt == 2:
+                    raise
+                logger.warning("Telegram connection dropped (%s); reconnecting and retrying once.", exc)
+
+    def is_authorized(self, api_id: int, api_hash: str) -> bool:
+        return self.run(api_id, api_hash, lambda client: bool(client.is_user_authorized()), authorize=False)
+
+    def close(self, timeout: float = CLOSE_TIMEOUT) -> bool:
+        """
+        Disconnect and release the loop from a helper thread, waiting at most ``timeout`` seconds.
+        A job may hold the session for a whole download, or while it waits for a login prompt on
+        the very thread calling this, so the caller is never blocked on the lock. Returns False
+        when the session was still busy; it is then closed once the job lets go of it.
+        """
+        closer = threading.Thread(target=self._close, name="telethon-close", daemon=True)
+        closer.start()
+        closer.join(timeout)
+        if closer.is_alive():
+            logger.warning("Telethon session still in use; it will be closed when the running job releases it.")
+            return False
+        return True
+
+    def _close(self) -> None:
+        with self._lock:
+            if self._loop is None:
+                return
+            previous_loop = self._current_loop()
+            asyncio.set_event_loop(self._loop)
+            try:
+                self._drop_client()
+            finally:
+                asyncio.set_event_loop(previous_loop)
+                self._loop.close()
+                self._loop = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop
+
+    def _ensure_client(self, api_id: int, api_hash: str):
+        if self._client is not None and self._credentials != (api_id, api_hash):
+            logger.info("Telethon credentials changed; reopening the client.")
+            self._drop_client()
+        if self._client is None:
+            self._client = TelegramClient(self.session_name, api_id, api_hash, **TELETHON_CLIENT_KWARGS)
+            self._credentials = (api_id, api_hash)
+        if not self._client.is_connected():
+            for attempt in range(1, CONNECT_ATTEMPTS + 1):
+                try:
+                    self._client.connect()
+                    break
+                except (ConnectionError, OSError) as exc:
+                    if attempt == CONNECT_ATTEMPTS:
+                        self._drop_client()
+                        raise ConnectionError(f"Unable to connect to Telegram: {exc}") from exc
+                    logger.warning("Telegram connection failed (attempt %s/%s): %s", attempt, CONNECT_ATTEMPTS, exc)
+                    time.sleep(attempt)
+        return self._client
+
+    def _drop_client(self) -> None:
+        client, self._client, self._credentials = self._client, None, None
+        if client is None:
+            return
+        try:
+            client.disconnect()
+        except Exception as exc:
+            logger.warning("Error while disconnecting Telethon client: %s", exc)
+
+    @staticmethod
+    def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            return asyncio.get_event_loop_policy().get_event_loop()
+        except RuntimeError:
+            return None
+
+
 class TGWCCore:
     """Logic service: environment, IO, Telethon, processing, saving."""
 
-    def __init__(self):
+    def __init__(self, session_name: str = TELEGRAM_SESSION_NAME):
         self.project_root = PROJECT_ROOT
+        self.telethon = TelethonClientManager(session_name, login=self._login)
+        # Font chosen in the GUI; None picks one from the font index per cloud.
+        self.font_path: Optional[str] = None
+        self._font_index: Optional[FontIndex] = None
+        self._font_lock = threading.Lock()
+        self._font_warned = False
+        self._encoder = concurrent.futures.ThreadPoolExecutor(max_workers=ENCODE_WORKERS, thread_name_prefix="encode")
+        self._history: Optional[RunHistory] = None
+        self._history_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Release long-lived resources such as the Telethon connection; waits for pending image writes."""
+        self._encoder.shutdown(wait=True)
+        if self._history is not None:
+            self._history.close()
+        self.telethon.close()
 
     # ------- ENV -------
     def read_env_credentials(self) -> Dict[str, str]:
@@ -118,42 +418,209 @@ class TGWCCore:
         export_dir.mkdir(parents=True, exist_ok=True)
         return export_dir
 
-    def load_csv(self, csv_path: str) -> pd.DataFrame:
+    def load_csv(
+        self,
+        csv_path: str,
+        *,
+        date_from: Optional[datetime.datetime] = None,
+        date_to: Optional[datetime.datetime] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> pd.DataFrame:
         path = self._sanitize_path(csv_path)
         if not path:
             raise ValueError("Please select a Telegram export CSV file.")
         if not os.path.exists(path):
             raise FileNotFoundError(f"{path} does not exist.")
-        df = pd.read_csv(path, low_memory=False, encoding="utf-8")
+        if date_from is None and date_to is None and cancel_event is None:
+            df = pd.read_csv(path, low_memory=False, encoding="utf-8")
+            return df.replace(["NaN", "nan"], float("nan"))
+
+        lower, upper = self._as_utc(date_from), self._as_utc(date_to)
+        if lower is not None or upper is not None:
+            index = CsvDateIndex.load(
+                self._csv_index_path(path), path, DATE_COLUMN, self._parse_dates,
+                check=lambda: check_cancelled(cancel_event),
+            )
+            if index is not None:
+                return self._read_csv_window(path, index, lower, upper, cancel_event)
+
+        kept: List[pd.DataFrame] = []
+        for chunk in pd.read_csv(path, low_memory=False, encoding="utf-8", chunksize=CSV_CHUNK_ROWS):
+            check_cancelled(cancel_event)
+            if lower is None and upper is None:
+                kept.append(chunk)
+                continue
+            if DATE_COLUMN not in chunk.columns:
+                raise ValueError(f"{path} has no '{DATE_COLUMN}' column to filter on.")
+            kept.append(chunk[self._window_mask(chunk, lower, upper)])
+        df = pd.concat(kept, ignore_index=True) if kept else pd.DataFrame()
         return df.replace(["NaN", "nan"], float("nan"))
 
-    def load_json_export(self, json_path: str) -> pd.DataFrame:
+    def _csv_index_path(self, path: str) -> Path:
+        return CSV_INDEX_DIR / f"{hashlib.sha1(path.encode('utf-8')).hexdigest()}.json"
+
+    def _window_mask(self, chunk: pd.DataFrame, lower: Optional[pd.Timestamp], upper: Optional[pd.Timestamp]) -> np.ndarray:
+        dates = self._parse_dates(chunk[DATE_COLUMN])
+        mask = dates.notna()
+        if lower is not None:
+            mask &= dates >= lower
+        if upper is not None:
+            mask &= dates < upper
+        return mask.to_numpy()
+
+    def _read_csv_window(
+        self,
+        path: str,
+        index: CsvDateIndex,
+        lower: Optional[pd.Timestamp],
+        upper: Optional[pd.Timestamp],
+        cancel_event: Optional[threading.Event] = None,
+    ) -> pd.DataFrame:
+        """Seek to the indexed blocks that overlap ``[lower, upper)`` and parse only those, with the header prepended."""
+        kept: List[pd.DataFrame] = []
+        with open(path, "rb") as f:
+            header = f.read(index.header_end)
+            ranges = index.ranges(lower, upper)
+            for start, end in ranges:
+                check_cancelled(cancel_event)
+                f.seek(start)
+                chunk = pd.read_csv(io.BytesIO(header + f.read(end - start)), low_memory=False, encoding="utf-8")
+                kept.append(chunk[self._window_mask(chunk, lower, upper)])
+        if not kept:
+            kept.append(pd.read_csv(io.BytesIO(header), encoding="utf-8"))
+        logger.info(
+            "Date window: parsed %s of %s bytes of %s.",
+            sum(end - start for start, end in ranges), index.signature[1], path,
+        )
+        df = pd.concat(kept, ignore_index=True)
+        return df.replace(["NaN", "nan"], float("nan"))
+
+    def load_json_export(
+        self,
+        json_path: str,
+        *,
+        date_from: Optional[datetime.datetime] = None,
+        date_to: Optional[datetime.datetime] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> pd.DataFrame:
         path = self._sanitize_path(json_path)
         if not path:
             raise ValueError("Please select a Telegram export JSON file.")
         if not os.path.exists(path):
             raise FileNotFoundError(f"{path} does not exist.")
 
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        if cancel_event is None:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        else:
+            # Read in blocks so a cancel lands during IO; the parse itself is a single C call.
+            parts: List[str] = []
+            with open(path, "r", encoding="utf-8") as f:
+                for block in iter(lambda: f.read(JSON_READ_BYTES), ""):
+                    check_cancelled(cancel_event)
+                    parts.append(block)
+            data = json.loads("".join(parts))
+            del parts
+            check_cancelled(cancel_event)
 
         messages = self._extract_messages_from_dump(data)
-        rows: List[Dict[str, Union[str, int]]] = []
-        for msg in messages:
-            text_content = self._stringify_telegram_text(msg.get("text", ""))
-            rows.append(
-                {
-                    "id": msg.get("id"),
-                    "date": msg.get("date"),
-                    "from": msg.get("from") or msg.get("actor"),
-                    "type": msg.get("type"),
-                    "text": text_content,
-                }
-            )
+        if date_from is not None or date_to is not None:
+            # Select the window before flattening so out-of-range rich text is never joined.
+            dates = self._parse_dates(pd.Series([msg.get(DATE_COLUMN) for msg in messages], dtype=object))
+            start, stop = self._date_bounds(dates, date_from, date_to)
+            if start is None:
+                messages = [msg for msg, keep in zip(messages, stop) if keep]
+            else:
+                messages = messages[start:stop]
 
-        if not rows:
-            raise ValueError("No messages were found inside the JSON export.")
-        return pd.DataFrame(rows)
+        return self._messages_to_frame(messages, cancel_event)
+
+    def find_export_files(self, source: str) -> List[Path]:
+        """Supported exports under a directory (searched recursively) or matching a glob pattern."""
+        pattern = self._sanitize_path(source)
+        if not pattern:
+            raise ValueError("Please select a folder or glob pattern of exports.")
+        if os.path.isdir(pattern):
+            candidates = Path(pattern).rglob("*")
+        else:
+            candidates = (Path(p) for p in glob.glob(pattern, recursive=True))
+        files = sorted(p for p in candidates if p.suffix.lower() in EXPORT_SUFFIXES and p.is_file())
+        if not files:
+            raise ValueError(f"No .csv or .json exports were found in {pattern}.")
+        return files
+
+    def load_exports(
+        self,
+        source: str,
+        *,
+        date_from: Optional[datetime.datetime] = None,
+        date_to: Optional[datetime.datetime] = None,
+        max_workers: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> pd.DataFrame:
+        """
+        Parse every export found by ``find_export_files`` in a process pool and merge the rows,
+        tagged with their ``SOURCE_COLUMN``. A file that cannot be read is skipped rather than
+        aborting the batch; per-file rows, timings and errors go to ``df.attrs["ingest_stats"]``.
+        """
+        files = self.find_export_files(source)
+        started = time.perf_counter()
+        results = self._run_in_process_pool(
+            _load_export_file,
+            [(str(path), date_from, date_to) for path in files],
+            max_workers=max_workers,
+            cancel_event=cancel_event,
+            return_exceptions=True,
+        )
+        frames: List[pd.DataFrame] = []
+        stats: List[Dict] = []
+        for path, result in zip(files, results):
+            if isinstance(result, Exception):
+                logger.warning("Skipping %s: %s", path, result)
+                stats.append({"file": str(path), "messages": 0, "seconds": None, "error": str(result)})
+                continue
+            df, seconds = result
+            stats.append({"file": str(path), "messages": len(df), "seconds": seconds, "error": None})
+            frames.append(df.assign(**{SOURCE_COLUMN: str(path)}))
+        if not frames:
+            raise ValueError(f"None of the {len(files)} exports could be read; first error: {stats[0]['error']}")
+        merged = pd.concat(frames, ignore_index=True)
+        merged.attrs["ingest_stats"] = stats
+        logger.info(
+            "Loaded %s messages from %s/%s exports in %.1fs.",
+            len(merged), len(frames), len(files), time.perf_counter() - started,
+        )
+        return merged
+
+    def slice_by_date(
+        self,
+        df: pd.DataFrame,
+        *,
+        date_from: Optional[datetime.datetime] = None,
+        date_to: Optional[datetime.datetime] = None,
+        last_n: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Restrict ``df`` to ``[date_from, date_to)`` and/or its ``last_n`` newest rows.
+        Rows are ordered by the date column once, then the window is located with a binary search.
+        """
+        if date_from is None and date_to is None and not last_n:
+            return df
+        if DATE_COLUMN not in df.columns:
+            if date_from is not None or date_to is not None:
+                raise ValueError(f"The data has no '{DATE_COLUMN}' column to filter on.")
+            return df.tail(last_n).reset_index(drop=True)
+
+        dates = self._parse_dates(df[DATE_COLUMN])
+        if not dates.is_monotonic_increasing:
+            order = dates.sort_values(kind="stable", na_position="first").index
+            df = df.loc[order]
+            dates = dates.loc[order]
+        start, stop = self._date_bounds(dates, date_from, date_to)
+        out = df.iloc[start:stop]
+        if last_n and last_n > 0:
+            out = out.tail(last_n)
+        return out.reset_index(drop=True)
 
     def save_messages_csv(self, df: pd.DataFrame, output_dir: str, channel_label: str, filename: Optional[str] = None) -> str:
         directory = Path(self.ensure_dir(output_dir))
@@ -170,23 +637,107 @@ class TGWCCore:
         if not filename:
             filename = f'wordcloud_{datetime.datetime.now().strftime("%Y%m%d%H%M%S")}.jpg'
         path = directory / filename
-        wc.to_file(path)
+        fmt = next((name for name, (suffix, _) in IMAGE_FORMATS.items() if path.suffix.lower() == suffix), "jpeg")
+        encode_wordcloud(wc, str(path), fmt)
         logger.info("Word cloud saved to %s", path)
         return str(path)
 
+    def save_wordcloud_outputs(
+        self,
+        wc: WordCloud,
+        output_dir: str,
+        stem: Optional[str] = None,
+        *,
+        formats: Iterable[str] = DEFAULT_IMAGE_FORMATS,
+        scales: Iterable[int] = (1,),
+        quality: int = DEFAULT_JPEG_QUALITY,
+        image: Optional[Image.Image] = None,
+    ) -> Dict[str, concurrent.futures.Future]:
+        """
+        Start writing ``wc`` as ``<stem>.<ext>`` (``<stem>@<n>x.<ext>`` for larger ``scales``) in
+        every format on background threads and return at once with ``{path: future}``; each
+        future resolves to ``{"format", "scale", "seconds"}``. Pass the already rendered
+        preview as ``image`` so the 1x raster formats skip redrawing it.
+        """
+        directory = self.ensure_dir(output_dir)
+        if not stem:
+            stem = f'wordcloud_{datetime.datetime.now().strftime("%Y%m%d%H%M%S")}'
+        formats = list(formats)
+        for fmt in formats:
+            if fmt not in IMAGE_FORMATS:
+                raise ValueError(f"Unknown image format '{fmt}'. Choose one of: {', '.join(IMAGE_FORMATS)}.")
+
+        def encode(path: str, fmt: str, scale: int) -> Dict:
+            timing = encode_wordcloud(wc, path, fmt, scale=scale, quality=quality, image=image)
+            return {"format": fmt, "scale": scale, "seconds": timing["seconds"]}
+
+        futures: Dict[str, concurrent.futures.Future] = {}
+        for scale in scales:
+            for fmt in formats:
+                if fmt == "svg" and scale != 1:
+                    continue  # vector output has no size
+                path = output_path(directory, stem, fmt, scale)
+                futures[path] = self._encoder.submit(encode, path, fmt, scale)
+        return futures
+
     # ------- Text / stopwords -------
-    def flatten_text_columns(self, df: pd.DataFrame) -> List[str]:
-        text_cols = [c for c in df.columns if c.lower().startswith("text")]
-        if not text_cols:
-            text_cols = df.select_dtypes(include=["object"]).columns.tolist()
+    def flatten_text_columns(self, df: pd.DataFrame, *, cancel_event: Optional[threading.Event] = None) -> List[str]:
         out: List[str] = []
-        for col in text_cols:
-            for val in df[col].dropna().astype(str):
+        for col in self._text_columns(df):
+            for index, val in enumerate(df[col].dropna().astype(str)):
+                if index % CANCEL_CHECK_EVERY == 0:
+                    check_cancelled(cancel_event)
                 s = self._clean_value(val)
                 if s:
                     out.append(s)
         return out
 
+    def row_texts(self, df: pd.DataFrame) -> pd.Series:
+        """Return one cleaned string per row, joining all text columns (empty when a row has no text)."""
+        joined = pd.Series("", index=df.index, dtype=object)
+        for col in self._text_columns(df):
+            values = df[col].astype(object).where(df[col].notna(), "").astype(str).str.strip()
+            values = values.mask(values.str.lower().isin(["nan", "none", "null", "nat"]), "")
+            joined = (joined + " " + values).str.strip()
+        return joined
+
+    def deduplicate_messages(
+        self,
+        df: pd.DataFrame,
+        *,
+        near_duplicates: bool = False,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> pd.DataFrame:
+        """
+        Drop reposted/forwarded messages before tokenization. Texts are compared after case,
+        punctuation and whitespace folding; ``near_duplicates`` adds MinHash/LSH matching.
+        Counts are attached as ``df.attrs["dedup_stats"]``.
+        """
+        started = time.perf_counter()
+        texts = self.row_texts(df)
+        keep = MessageDeduplicator(near_duplicates=near_duplicates).keep_mask(
+            texts, check=lambda: check_cancelled(cancel_event)
+        )
+        out = df[keep].reset_index(drop=True)
+        lengths = texts.str.len()
+        removed_chars = int(lengths[[not k for k in keep]].sum())
+        stats = {
+            "removed": len(df) - len(out),
+            "kept": len(out),
+            "removed_chars": removed_chars,
+            "kept_chars": int(lengths.sum()) - removed_chars,
+            "seconds": time.perf_counter() - started,
+        }
+        out.attrs = {**df.attrs, "dedup_stats": stats}
+        logger.info("Removed %s duplicate messages in %.2fs.", stats["removed"], stats["seconds"])
+        return out
+
+    def _text_columns(self, df: pd.DataFrame) -> List[str]:
+        text_cols = [c for c in df.columns if c.lower().startswith("text")]
+        if not text_cols:
+            text_cols = [c for c in df.select_dtypes(include=["object"]).columns if c != SOURCE_COLUMN]
+        return text_cols
+
     def _clean_value(self, v: str) -> str:
         x = v.strip()
         if not x:
@@ -195,16 +746,6 @@ class TGWCCore:
             return ""
         return x
 
-    def _stringify_telegram_text(self, value: Union[str, List, Dict]) -> str:
-        if isinstance(value, str):
-            return value
-        if isinstance(value, dict):
-            return value.get("text") or value.get("href") or ""
-        if isinstance(value, list):
-            parts = [self._stringify_telegram_text(item) for item in value]
-            return "".join(parts)
-        return ""
-
     def load_stopwords(self, path: str) -> Set[str]:
         stoplist: Set[str] = set()
         if os.path.exists(path):
@@ -223,15 +764,658 @@ class TGWCCore:
                     continue
         return stoplist
 
-    def build_wordcloud(self, tokens: Iterable[str], stopwords: Set[str]) -> WordCloud:
-        corpus = " ".join(tokens)
-        if not corpus.strip():
+    def build_wordcloud(
+        self,
+        tokens: Union[Iterable[str], Mapping[str, float]],
+        stopwords: Set[str],
+        *,
+        cancel_event: Optional[threading.Event] = None,
+        width: int = WORDCLOUD_WIDTH,
+        height: int = WORDCLOUD_HEIGHT,
+        max_words: int = WORDCLOUD_MAX_WORDS,
+        font_path: Optional[str] = None,
+        colormap: Optional[str] = None,
+        tokenizer: Optional[Tokenizer] = None,
+    ) -> WordCloud:
+        """
+        Build a cloud from raw text tokens, or directly from a ``{word: weight}`` mapping
+        when the counting has already been done upstream (e.g. a loaded frequency table).
+        """
+        frequencies = dict(tokens) if isinstance(tokens, Mapping) else self.count_words(
+            tokens, stopwords, cancel_event=cancel_event, tokenizer=tokenizer
+        )
+        if not frequencies:
             raise ValueError("Not enough text to build a word cloud.")
-        font_path = FONT_FAMILY
-        if font_path and not Path(font_path).exists():
-            logger.warning("Font %s not found; falling back to default font.", font_path)
-            font_path = None
-        return WordCloud(font_path=font_path, width=1000, height=700, stopwords=stopwords).generate(corpus)
+        wc = WordCloud(
+            font_path=font_path or self._resolve_font(frequencies), width=width, height=height,
+            max_words=max_words, stopwords=stopwords, colormap=colormap,
+        )
+        if cancel_event is None:
+            return wc.generate_from_frequencies(frequencies)
+        color_func = wc.color_func
+        wc.color_func = _CancellableColorFunc(color_func, cancel_event)
+        try:
+            return wc.generate_from_frequencies(frequencies)
+        finally:
+            wc.color_func = color_func
+
+    def count_words(
+        self,
+        texts: Iterable[str],
+        stopwords: Set[str],
+        *,
+        cancel_event: Optional[threading.Event] = None,
+        tokenizer: Optional[Tokenizer] = None,
+    ) -> Dict[str, int]:
+        """
+        Tokenize and count ``texts`` exactly as ``WordCloud.process_text`` would on the joined
+        corpus, but message by message so a cancel is noticed between messages.
+
+        With a ``tokenizer`` the language-aware tokenization (casefolding, Cyrillic-aware
+        splitting, optional stemming) is used instead; it filters its own stopwords and does
+        not add collocations.
+        """
+        if tokenizer is not None:
+            counts = tokenizer.count(texts, check=lambda: check_cancelled(cancel_event), check_every=CANCEL_CHECK_EVERY)
+            check_cancelled(cancel_event)
+            logger.info("%s", tokenizer.describe())
+            return counts
+        wc = WordCloud(stopwords=stopwords)
+        words: List[str] = []
+        for index, text in enumerate(texts):
+            if index % CANCEL_CHECK_EVERY == 0:
+                check_cancelled(cancel_event)
+            for word in CLOUD_TOKEN_PATTERN.findall(text):
+                if word.lower().endswith("'s"):
+                    word = word[:-2]
+                if not word.isdigit():
+                    words.append(word)
+        check_cancelled(cancel_event)
+        lowered = {w.lower() for w in wc.stopwords}
+        return unigrams_and_bigrams(words, lowered, wc.normalize_plurals, wc.collocation_threshold)
+
+    def count_words_approx(
+        self,
+        texts: Iterable[str],
+        stopwords: Set[str],
+        capacity: int = APPROX_CAPACITY,
+        *,
+        cancel_event: Optional[threading.Event] = None,
+        tokenizer: Optional[Tokenizer] = None,
+    ) -> Dict[str, int]:
+        """
+        Count words with a fixed-size heavy-hitters summary instead of the full vocabulary.
+        Memory is bounded by ``capacity``; each count underestimates by at most ``N / (capacity + 1)``.
+        Collocations and plural folding are not applied in this mode.
+        """
+        summary = count_top_words(
+            texts, stopwords, capacity, check=lambda: check_cancelled(cancel_event),
+            tokenize_text=tokenizer.tokens if tokenizer is not None else None,
+        )
+        if tokenizer is not None:
+            logger.info("%s", tokenizer.describe())
+        logger.info(
+            "Approximate counting: %s tokens, %s words tracked, max undercount %s.",
+            summary.total, len(summary), summary.error_bound(),
+        )
+        return dict(summary.most_common())
+
+    # ------- Frequency tables -------
+    def frequency_table(
+        self,
+        frequencies: Mapping[str, int],
+        df: pd.DataFrame,
+        source: str,
+        stopwords: Set[str],
+        *,
+        approximate: bool = False,
+        tokenizer: str = "default",
+    ) -> FrequencyTable:
+        """Wrap counts from ``df`` with the metadata needed to re-render them later."""
+        date_from = date_to = None
+        if DATE_COLUMN in df.columns:
+            dates = self._parse_dates(df[DATE_COLUMN]).dropna()
+            if not dates.empty:
+                date_from, date_to = dates.min().isoformat(), dates.max().isoformat()
+        return FrequencyTable(frequencies, {
+            "source": source,
+            "date_from": date_from,
+            "date_to": date_to,
+            "messages": len(df),
+            "stopwords_hash": stopwords_hash(stopwords),
+            "approximate": approximate,
+            "tokenizer": tokenizer,
+        })
+
+    def save_frequency_tables(self, table: FrequencyTable, output_dir: str, stem: str) -> List[str]:
+        """Write ``table`` as ``<stem>.wcf`` (compact binary), ``<stem>.csv`` and ``<stem>.json``."""
+        directory = Path(self.ensure_dir(output_dir))
+        paths = [table.save(str(directory / f"{stem}{suffix}")) for suffix in TABLE_SUFFIXES]
+        logger.info("Frequency table (%s words) saved to %s", len(table.frequencies), directory / f"{stem}.*")
+        return paths
+
+    def load_frequency_table(self, path: str, stopwords: Optional[Set[str]] = None) -> FrequencyTable:
+        """
+        Load a saved table. When ``stopwords`` differ from the list the table was counted with,
+        the current stopwords are filtered out so edits to stopwords.txt still apply.
+        """
+        path = self._sanitize_path(path)
+        if not path:
+            raise ValueError("Please select a frequency table (.wcf, .csv or .json).")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} does not exist.")
+        table = FrequencyTable.load(path)
+        if stopwords is not None and table.metadata.get("stopwords_hash") != stopwords_hash(stopwords):
+            logger.info("Stopwords changed since %s was saved; filtering the current list.", path)
+            table = table.without(stopwords)
+        return table
+
+    def build_time_sliced_wordclouds(
+        self,
+        df: pd.DataFrame,
+        stopwords: Set[str],
+        output_dir: str,
+        *,
+        bucket: str = "month",
+        max_workers: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
+        tokenizer: Optional[Tokenizer] = None,
+    ) -> List[Tuple[str, str]]:
+        """
+        Render one cloud per calendar ``bucket`` ("week" or "month") into ``output_dir``.
+        Counting is shared via ``count_words_by_period``; layout and encoding run in a process
+        pool. Returns ``(label, path)`` pairs in chronological order.
+        """
+        counted = self.count_words_by_period(df, stopwords, bucket=bucket, cancel_event=cancel_event, tokenizer=tokenizer)
+        results = self._render_labelled_clouds(counted, output_dir, max_workers=max_workers, cancel_event=cancel_event)
+        logger.info("Rendered %s %sly word clouds into %s", len(results), bucket, output_dir)
+        return results
+
+    def count_entities(self, df: pd.DataFrame) -> Dict[str, Dict[str, int]]:
+        """Hashtag, mention and domain counts from the entity column of a JSON export."""
+        if ENTITY_COLUMN not in df.columns:
+            return {}
+        found = (v for v in df[ENTITY_COLUMN] if isinstance(v, (list, tuple)))
+        return {name: dict(counts) for name, counts in count_entities(found).items()}
+
+    def build_entity_wordclouds(
+        self,
+        df: pd.DataFrame,
+        output_dir: str,
+        *,
+        max_workers: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> List[Tuple[str, str]]:
+        """Render ``wordcloud_hashtags/mentions/domains.jpg`` for whichever entity tables are non-empty."""
+        tables = self.count_entities(df)
+        if not tables:
+            raise ValueError("No hashtags, mentions or links were found (entity clouds need a Telegram JSON export).")
+        check_cancelled(cancel_event)
+        return self._render_labelled_clouds(
+            list(tables.items()), output_dir, max_workers=max_workers, cancel_event=cancel_event
+        )
+
+    def build_per_file_wordclouds(
+        self,
+        df: pd.DataFrame,
+        stopwords: Set[str],
+        output_dir: str,
+        *,
+        max_workers: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
+        tokenizer: Optional[Tokenizer] = None,
+    ) -> List[Tuple[str, str]]:
+        """
+        Render one cloud per source export of a ``load_exports`` result, labelled by the file's
+        path relative to the common folder. Returns ``(label, path)`` pairs in file order.
+        """
+        if SOURCE_COLUMN not in df.columns:
+            raise ValueError("Per-file clouds need data loaded from a folder of exports.")
+        texts = self.row_texts(df)
+        keep = texts != ""
+        sources = df.loc[keep, SOURCE_COLUMN]
+        if sources.empty:
+            raise ValueError("Not enough text to build per-file word clouds.")
+        root = os.path.commonpath([os.path.dirname(p) for p in sources.unique()])
+        counted: List[Tuple[str, Dict[str, int]]] = []
+        for source, group in texts[keep].groupby(sources, sort=False):
+            counts = self.count_words(group, stopwords, cancel_event=cancel_event, tokenizer=tokenizer)
+            if counts:
+                counted.append((os.path.splitext(os.path.relpath(source, root))[0], counts))
+        if not counted:
+            raise ValueError("Not enough text to build per-file word clouds.")
+        results = self._render_labelled_clouds(counted, output_dir, max_workers=max_workers, cancel_event=cancel_event)
+        logger.info("Rendered %s per-file word clouds into %s", len(results), output_dir)
+        return results
+
+    def count_words_by_group(
+        self,
+        df: pd.DataFrame,
+        column: str,
+        stopwords: Set[str],
+        *,
+        top_groups: Optional[int] = TOP_GROUPS,
+        tokenizer: Optional[Tokenizer] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> List[Tuple[str, Dict[str, int]]]:
+        """
+        Word counts per value of ``column`` (sender, channel, source file, ... or a
+        ``TIME_BUCKETS`` period), for the ``top_groups`` values with the most messages (all values
+        when None), largest first. Counted in one pass by ``group_term_matrix``; counts are single
+        words (no collocations).
+        """
+        matrix = self.group_term_matrix(
+            df, self._group_keys(df, column), stopwords, top_groups=top_groups, tokenizer=tokenizer, cancel_event=cancel_event
+        )
+        return [
+            (label, {word: int(count) for word, count in matrix.row_dict(row).items()})
+            for row, label in enumerate(matrix.labels)
+        ]
+
+    def group_term_matrix(
+        self,
+        df: pd.DataFrame,
+        keys: pd.Series,
+        stopwords: Set[str],
+        *,
+        top_groups: Optional[int] = None,
+        tokenizer: Optional[Tokenizer] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> DocumentTermMatrix:
+        """
+        Sparse group-by-word count matrix of ``df``, one row per value of ``keys`` (aligned with
+        ``df``), limited to the ``top_groups`` values with the most messages, largest first.
+
+        Every message is split once and all tokens are counted together: tokens are factorized
+        to integer codes, stopword/number filtering runs once per distinct token, and the
+        (group, word) pairs are counted with one ``np.unique``, whose sorted output is already
+        the CSR layout. The cost follows the size of the data rather than the number of groups.
+        """
+        texts = self.row_texts(df)
+        keep = keys.notna() & (texts != "")
+        sizes = keys[keep].value_counts()
+        if top_groups:
+            sizes = sizes.iloc[:top_groups]
+            keep &= keys.isin(sizes.index)
+        if sizes.empty:
+            raise ValueError("No messages with text have a value to group by.")
+
+        token_lists: List[List[str]] = []
+        for index, text in enumerate(texts[keep]):
+            if index % CANCEL_CHECK_EVERY == 0:
+                check_cancelled(cancel_event)
+            token_lists.append(tokenizer.tokens(text) if tokenizer is not None else TOKEN_PATTERN.findall(text.lower()))
+        if tokenizer is not None:
+            logger.info("%s", tokenizer.describe())
+        check_cancelled(cancel_event)
+
+        lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+        groups = np.repeat(pd.Index(sizes.index).get_indexer(keys[keep]), lengths)
+        codes, raw_words = pd.factorize(np.fromiter(itertools.chain.from_iterable(token_lists), dtype=object, count=int(lengths.sum())))
+        # Map each distinct raw token to its final word id (-1 when filtered out).
+        word_ids: Dict[str, int] = {}
+        remap = np.full(len(raw_words), -1, dtype=np.int64)
+        lowered = {w.lower() for w in stopwords}
+        for code, raw in enumerate(raw_words):
+            kept = [raw] if tokenizer is not None else tokenize(raw, lowered)
+            if kept:
+                remap[code] = word_ids.setdefault(kept[0], len(word_ids))
+        width = max(len(word_ids), 1)
+        ids = remap[codes]
+        valid = ids >= 0
+        pairs, counts = np.unique(groups[valid] * width + ids[valid], return_counts=True)
+        pair_groups, pair_words = np.divmod(pairs, width)
+        indptr = np.searchsorted(pair_groups, np.arange(len(sizes) + 1))
+
+        # Groups whose messages were all stopwords end up with empty rows; drop them.
+        present = np.flatnonzero(np.diff(indptr))
+        if not len(present):
+            raise ValueError("Not enough text to build grouped word clouds.")
+        labels = [self._group_label(sizes.index[row]) for row in present]
+        indptr = np.concatenate(([0], np.cumsum(np.diff(indptr)[present])))
+        logger.info("Counted %s tokens across %s groups in one pass.", int(valid.sum()), len(labels))
+        return DocumentTermMatrix(labels, list(word_ids), indptr, pair_words, counts)
+
+    def distinctive_terms(
+        self,
+        df: pd.DataFrame,
+        by: str,
+        stopwords: Set[str],
+        *,
+        method: str = "logodds",
+        top_groups: Optional[int] = None,
+        top_words: int = WORDCLOUD_MAX_WORDS,
+        tokenizer: Optional[Tokenizer] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> List[Tuple[str, Dict[str, float]]]:
+        """
+        Words that set each group apart from the others, as ``(label, {word: weight})`` ready for
+        ``build_wordcloud``. ``by`` is a column (channel, sender, source file, ...) or a
+        ``TIME_BUCKETS`` period; every group is scored against all the other groups together in
+        one vectorised pass over the sparse group-by-word matrix, with ``method`` "tfidf" or
+        "logodds" (weighted log-odds with an informative prior; steadier for small groups).
+        """
+        if method not in SCORING_METHODS:
+            raise ValueError(f"Unknown scoring method '{method}'. Choose one of: {', '.join(SCORING_METHODS)}.")
+        matrix = self.group_term_matrix(
+            df, self._group_keys(df, by), stopwords, top_groups=top_groups, tokenizer=tokenizer, cancel_event=cancel_event
+        )
+        if len(matrix.labels) < 2:
+            raise ValueError(f"Distinctive terms need at least two '{by}' groups to compare.")
+        check_cancelled(cancel_event)
+        scores = matrix.tfidf() if method == "tfidf" else matrix.log_odds()
+        weighted = [(label, top) for label, top in zip(matrix.labels, matrix.top_terms(scores, top_words)) if top]
+        logger.info(
+            "Scored %s groups x %s words (%s non-zero cells) by %s.",
+            matrix.shape[0], matrix.shape[1], len(matrix.data), method,
+        )
+        return sorted(weighted) if by in TIME_BUCKETS else weighted
+
+    def save_group_top_words(
+        self,
+        counted: List[Tuple[str, Mapping[str, float]]],
+        output_dir: str,
+        column: str,
+        top: int = GROUP_TABLE_WORDS,
+        value_name: str = "count",
+    ) -> str:
+        """Write the ``top`` words of every group as ``top_words_by_<column>.csv`` (group, rank, word, ``value_name``)."""
+        rows = []
+        for label, counts in counted:
+            ranked = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:top]
+            rows.extend((label, rank, word, count) for rank, (word, count) in enumerate(ranked, start=1))
+        path = Path(self.ensure_dir(output_dir)) / f"top_words_by_{self.sanitize_channel_label(column)}.csv"
+        pd.DataFrame(rows, columns=["group", "rank", "word", value_name]).to_csv(path, index=False, encoding="utf-8")
+        return str(path)
+
+    def build_group_wordclouds(
+        self,
+        counted: List[Tuple[str, Mapping[str, float]]],
+        output_dir: str,
+        *,
+        max_workers: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> List[Tuple[str, str]]:
+        """
+        Render ``count_words_by_group`` (or ``distinctive_terms``) results in parallel, one
+        ``wordcloud_<group>.jpg`` each.
+        """
+        return self._render_labelled_clouds(counted, output_dir, max_workers=max_workers, cancel_event=cancel_event)
+
+    def _group_keys(self, df: pd.DataFrame, by: str) -> pd.Series:
+        """Group key of every row: the ``by`` column, or the period label for a ``TIME_BUCKETS`` name."""
+        if by in TIME_BUCKETS:
+            if DATE_COLUMN not in df.columns:
+                raise ValueError(f"The data has no '{DATE_COLUMN}' column to slice by.")
+            freq, label_format = TIME_BUCKETS[by]
+            dates = self._parse_dates(df[DATE_COLUMN])
+            return dates.dt.tz_convert(None).dt.to_period(freq).dt.start_time.dt.strftime(label_format)
+        if by not in df.columns:
+            raise ValueError(f"The data has no '{by}' column to group by.")
+        return df[by]
+
+    def _group_label(self, value) -> str:
+        # Telethon sender ids come back from CSV as floats when the column has gaps.
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return str(value).strip() or "(empty)"
+
+    def _render_labelled_clouds(
+        self,
+        counted: List[Tuple[str, Dict[str, int]]],
+        output_dir: str,
+        *,
+        max_workers: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> List[Tuple[str, str]]:
+        """
+        Render ``wordcloud_<label>.jpg`` for each ``(label, counts)`` pair in a process pool.
+        Labels become file names with their Unicode word characters kept; labels that clash
+        (after case folding) with each other or with a cloud already in ``output_dir`` get a
+        numeric suffix, so no two workers ever write the same file.
+        """
+        directory = Path(self.ensure_dir(output_dir))
+        used = {name.lower() for name in os.listdir(directory)}
+        jobs = []
+        for label, counts in counted:
+            name = base = re.sub(r"[^\w-]+", "_", str(label)).strip("_")[:60] or "cloud"
+            suffix = 2
+            while f"wordcloud_{name}.jpg".lower() in used:
+                name, suffix = f"{base}_{suffix}", suffix + 1
+            used.add(f"wordcloud_{name}.jpg".lower())
+            top = dict(sorted(counts.items(), key=lambda item: item[1], reverse=True)[:WORDCLOUD_MAX_WORDS])
+            jobs.append((label, directory / f"wordcloud_{name}.jpg", top))
+        font_path = self._resolve_font(word for _, _, freqs in jobs for word in freqs)
+        paths = self._run_in_process_pool(
+            _render_frequencies_to_file,
+            [(freqs, str(path), font_path) for _, path, freqs in jobs],
+            max_workers=max_workers,
+            cancel_event=cancel_event,
+        )
+        return [(label, path) for (label, _, _), path in zip(jobs, paths)]
+
+    def build_wordcloud_animation(
+        self,
+        df: pd.DataFrame,
+        stopwords: Set[str],
+        output_dir: str,
+        *,
+        bucket: str = "week",
+        fmt: str = "gif",
+        tween: int = 0,
+        frame_duration: float = 0.6,
+        max_workers: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
+        tokenizer: Optional[Tokenizer] = None,
+    ) -> str:
+        """
+        Animate how the vocabulary changes per ``bucket`` and return the GIF/MP4 path (or the
+        frames folder for ``fmt="frames"``).
+
+        One reference layout is built with ``build_wordcloud`` from each word's peak share over
+        time. Every frame reuses that layout and only shrinks words in place, so positions stay
+        stable and no frame runs the placement search. ``tween`` inserts linearly interpolated
+        frames between periods. Frames are drawn in a process pool.
+        """
+        if fmt not in ANIMATION_FORMATS:
+            raise ValueError(f"Unknown animation format '{fmt}'. Choose one of: {', '.join(ANIMATION_FORMATS)}.")
+        if fmt == "mp4" and not imageio_available:
+            raise ImportError("MP4 output requires imageio and imageio-ffmpeg. Install them with 'pip install imageio imageio-ffmpeg'.")
+        directory = Path(self.ensure_dir(output_dir))
+        frames_dir = directory / "frames"
+        frames_dir.mkdir(exist_ok=True)
+
+        periods = []
+        for label, counts in self.count_words_by_period(
+            df, stopwords, bucket=bucket, cancel_event=cancel_event, tokenizer=tokenizer
+        ):
+            peak = max(counts.values())
+            periods.append((label, {word: count / peak for word, count in counts.items()}))
+        reference: Dict[str, float] = {}
+        for _, shares in periods:
+            for word, share in shares.items():
+                if share > reference.get(word, 0.0):
+                    reference[word] = share
+        reference = dict(sorted(reference.items(), key=lambda item: item[1], reverse=True)[:WORDCLOUD_MAX_WORDS])
+
+        wc = self.build_wordcloud(reference, stopwords, cancel_event=cancel_event)
+        self.save_wordcloud_image(wc, str(directory), filename="wordcloud_layout.jpg")
+        boxes = self._layout_boxes(wc)
+
+        frames: List[Tuple[str, Dict[str, float]]] = []
+        for index, (label, shares) in enumerate(periods):
+            frames.append((label, shares))
+            if index + 1 < len(periods):
+                next_shares = periods[index + 1][1]
+                for step in range(1, tween + 1):
+                    t = step / (tween + 1)
+                    frames.append((label, {w: (1 - t) * shares.get(w, 0.0) + t * next_shares.get(w, 0.0) for w in reference}))
+
+        frame_paths = self._run_in_process_pool(
+            _render_layout_frame,
+            [
+                (self._frame_layout(wc.layout_, boxes, reference, shares), label, str(frames_dir / f"frame_{index:04d}.png"), wc.font_path)
+                for index, (label, shares) in enumerate(frames)
+            ],
+            max_workers=max_workers,
+            cancel_event=cancel_event,
+        )
+        logger.info("Rendered %s animation frames into %s", len(frame_paths), frames_dir)
+
+        seconds_per_frame = frame_duration / (tween + 1)
+        if fmt == "frames":
+            return str(frames_dir)
+        if fmt == "mp4":
+            path = directory / "wordcloud_animation.mp4"
+            imageio.mimwrite(path, (imageio.imread(p) for p in frame_paths), fps=1 / seconds_per_frame)
+        else:
+            path = directory / "wordcloud_animation.gif"
+            # Frames are decoded one at a time as the encoder asks for them; it only keeps each
+            # frame's palette-reduced difference from the previous one, never the RGB frames.
+            with Image.open(frame_paths[0]) as first:
+                first.convert("RGB").save(
+                    path, save_all=True, append_images=_read_frames(frame_paths[1:], cancel_event),
+                    duration=int(seconds_per_frame * 1000), loop=0,
+                )
+        logger.info("Word cloud animation saved to %s", path)
+        return str(path)
+
+    def _layout_boxes(self, wc: WordCloud) -> Dict[str, Tuple[int, int]]:
+        """Measure each placed word's box once so frames can shrink words about their centre."""
+        draw = ImageDraw.Draw(Image.new("L", (1, 1)))
+        boxes: Dict[str, Tuple[int, int]] = {}
+        for (word, _), font_size, _, orientation, _ in wc.layout_:
+            font = ImageFont.TransposedFont(ImageFont.truetype(wc.font_path, font_size), orientation=orientation)
+            left, top, right, bottom = draw.textbbox((0, 0), word, font=font, anchor="lt")
+            boxes[word] = (bottom - top, right - left)
+        return boxes
+
+    def _frame_layout(self, layout: List, boxes: Dict[str, Tuple[int, int]], reference: Dict[str, float], shares: Dict[str, float]) -> List:
+        # A word's share in any frame never exceeds its reference (peak) share, so scaled words
+        # always fit inside their reserved slot. Font size follows sqrt(share) to keep area ~ share.
+        frame = []
+        for (word, freq), font_size, (y, x), orientation, color in layout:
+            ratio = min(1.0, shares.get(word, 0.0) / reference[word])
+            size = int(font_size * ratio ** 0.5)
+            if size < MIN_FRAME_FONT_SIZE:
+                continue
+            scale = size / font_size
+            height, width = boxes[word]
+            offset = (y + int((1 - scale) * height / 2), x + int((1 - scale) * width / 2))
+            frame.append(((word, freq * ratio), size, offset, orientation, color))
+        return frame
+
+    def count_words_by_period(
+        self,
+        df: pd.DataFrame,
+        stopwords: Set[str],
+        *,
+        bucket: str = "month",
+        cancel_event: Optional[threading.Event] = None,
+        tokenizer: Optional[Tokenizer] = None,
+    ) -> List[Tuple[str, Dict[str, int]]]:
+        """
+        Count words per calendar ``bucket`` ("week" or "month"), returning ``(label, counts)``
+        in chronological order. Rows are bucketed in one vectorised pass and each period's text
+        is counted once, so the cost follows the size of the data rather than the number of periods.
+        """
+        if bucket not in TIME_BUCKETS:
+            raise ValueError(f"Unknown time bucket '{bucket}'. Choose one of: {', '.join(TIME_BUCKETS)}.")
+        if DATE_COLUMN not in df.columns:
+            raise ValueError(f"The data has no '{DATE_COLUMN}' column to slice by.")
+        freq, label_format = TIME_BUCKETS[bucket]
+
+        dates = self._parse_dates(df[DATE_COLUMN])
+        texts = self.row_texts(df)
+        keep = dates.notna() & (texts != "")
+        periods = dates[keep].dt.tz_convert(None).dt.to_period(freq)
+
+        counted: List[Tuple[str, Dict[str, int]]] = []
+        for period, group in texts[keep].groupby(periods, sort=True):
+            counts = self.count_words(group, stopwords, cancel_event=cancel_event, tokenizer=tokenizer)
+            if counts:
+                counted.append((period.start_time.strftime(label_format), counts))
+        if not counted:
+            raise ValueError("Not enough dated text to build time-sliced word clouds.")
+        return counted
+
+    def _run_in_process_pool(
+        self,
+        func: Callable,
+        jobs: List[Tuple],
+        *,
+        max_workers: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
+        return_exceptions: bool = False,
+    ) -> List:
+        """
+        Run ``func(*job)`` for every job in a process pool and return results in job order.
+        The cancel event is polled while waiting; on cancel the worker processes are killed
+        rather than left to finish their current job. With ``return_exceptions`` a failed job's
+        exception is returned in its slot instead of being raised.
+        """
+        return_when = concurrent.futures.FIRST_COMPLETED if return_exceptions else concurrent.futures.FIRST_EXCEPTION
+        pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context(POOL_START_METHOD)
+        )
+        try:
+            futures = [pool.submit(func, *job) for job in jobs]
+            pending = set(futures)
+            while pending:
+                done, pending = concurrent.futures.wait(pending, timeout=CANCEL_POLL_SECONDS, return_when=return_when)
+                if not return_exceptions:
+                    for future in done:
+                        future.result()
+                if cancel_event is not None and cancel_event.is_set():
+                    self._terminate_pool(pool)
+                    raise CancelledError()
+            if return_exceptions:
+                return [future.exception() or future.result() for future in futures]
+            return [future.result() for future in futures]
+        finally:
+            pool.shutdown(wait=not (cancel_event is not None and cancel_event.is_set()), cancel_futures=True)
+
+    def _terminate_pool(self, pool: concurrent.futures.ProcessPoolExecutor) -> None:
+        terminate = getattr(pool, "terminate_workers", None)  # Python 3.14+
+        if terminate is not None:
+            terminate()
+            return
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.terminate()
+
+    def font_index(self) -> FontIndex:
+        """The installed-font index, read from ``FONT_INDEX_FILE`` (rescanning only if font directories changed) once per process."""
+        with self._font_lock:
+            if self._font_index is None:
+                self._font_index = FontIndex.load(FONT_INDEX_FILE)
+            return self._font_index
+
+    def run_history(self) -> RunHistory:
+        """The run history database (``HISTORY_FILE``), opened on first use."""
+        with self._history_lock:
+            if self._history is None:
+                self._history = RunHistory(str(HISTORY_FILE))
+            return self._history
+
+    def _resolve_font(self, words: Iterable[str] = ()) -> Optional[str]:
+        """
+        Font for a cloud of ``words``: the GUI choice if set, then ``FONT_FAMILY`` if that file
+        exists, else the indexed font covering the most of their characters plus ``REQUIRED_CHARS``.
+        """
+        if self.font_path:
+            return self.font_path
+        if FONT_FAMILY and Path(FONT_FAMILY).exists():
+            return FONT_FAMILY
+        chars = set(REQUIRED_CHARS)
+        for word in words:
+            chars.update(word)
+        best = self.font_index().best_font(chars)
+        if best is None:
+            if not self._font_warned:
+                logger.warning("No usable system font found; falling back to WordCloud's default font.")
+                self._font_warned = True
+            return None
+        return best["path"]
 
     # ------- Telethon -------
     def download_channel(
@@ -246,61 +1430,241 @@ class TGWCCore:
         date_from: Optional[datetime.datetime] = None,
         date_to: Optional[datetime.datetime] = None,
         last_n: Optional[int] = None,
+        bulk_export: bool = False,
+        authorize: bool = True,
+        cancel_event: Optional[threading.Event] = None,
     ) -> pd.DataFrame:
-        if not TELETHON_AVAILABLE:
-            raise ImportError("Telethon is required. Install it with 'pip install telethon'.")
+        """
+        Download text messages from ``channel``. With ``bulk_export`` the history is pulled
+        through a takeout session (lower flood limits, no inter-request wait). With
+        ``authorize=False`` an unsigned session raises ValueError instead of starting a login
+        (which would make Telegram send a code to the phone).
+
+        When ``cancel_event`` is set mid-download the messages fetched so far are returned
+        with ``download_stats["cancelled"]`` set, so callers can keep them.
+        """
         if not channel:
             raise ValueError("Enter the channel username or invite link to download.")
 
-        client = TelegramClient(TELEGRAM_SESSION_NAME, api_id, api_hash, **TELETHON_CLIENT_KWARGS)
-        messages = []
-        estimated_total = None
-        try:
-            client.connect()
-            if not client.is_user_authorized():
-                self._login(client, phone, code_provider)
-            limit = last_n if last_n and last_n > 0 else None
-            if progress_callback and not last_n:
+        messages: List[Dict] = []
+        limit = last_n if last_n and last_n > 0 else None
+        fetch_kwargs = dict(
+            limit=limit, date_from=date_from, date_to=date_to,
+            progress_callback=progress_callback, cancel_event=cancel_event,
+        )
+        def fetch(client) -> Tuple[str, float]:
+            # Starts over on a retry after a dropped connection.
+            messages.clear()
+            if not authorize and not client.is_user_authorized():
+                raise ValueError("The Telethon session is not signed in; log in once through the GUI first.")
+            if bulk_export:
                 try:
-                    latest_msg = next(client.iter_messages(channel, limit=1))
-                    estimated_total = getattr(latest_msg, "id", None)
-                except StopIteration:
-                    estimated_total = None
-                except Exception:
-                    estimated_total = None
-                progress_callback(0, estimated_total)
-
-            processed = 0
-            for msg in client.iter_messages(
-                channel,
-                limit=limit,
-                offset_date=date_to,
-                reverse=False,
-            ):
-                msg_date = getattr(msg, "date", None)
-                if date_from and msg_date and msg_date < date_from:
-                    break
-                text = getattr(msg, "message", None)
-                if text:
-                    messages.append(
-                        {
-                            "id": msg.id,
-                            "date": msg.date.isoformat() if getattr(msg, "date", None) else "",
-                            "sender_id": getattr(msg, "sender_id", None),
-                            "text": text,
-                        }
+                    with client.takeout(finalize=True, channels=True, megagroups=True) as takeout:
+                        started = time.perf_counter()
+                        self._collect_messages(takeout, channel, messages, wait_time=TAKEOUT_WAIT_TIME, **fetch_kwargs)
+                        return "takeout", started
+                except TakeoutInitDelayError as exc:
+                    logger.warning(
+                        "Telegram delayed the takeout session (%s seconds); falling back to standard download.",
+                        getattr(exc, "seconds", "?"),
                     )
-                processed += 1
-                if progress_callback:
-                    progress_callback(processed, estimated_total)
+            started = time.perf_counter()
+            self._collect_messages(client, channel, messages, wait_time=None, **fetch_kwargs)
+            return "standard", started
+
+        try:
+            mode, started = self.telethon.run(api_id, api_hash, fetch, phone, code_provider, authorize=authorize)
         except (UsernameInvalidError, UsernameNotOccupiedError, ChannelPrivateError) as exc:
             raise ValueError("Unable to access that channel. Check the username/link or join the channel first.") from exc
-        finally:
-            client.disconnect()
 
+        elapsed = time.perf_counter() - started
+        rate = len(messages) / elapsed if elapsed > 0 else 0.0
+        logger.info("Downloaded %s messages in %.1fs (%.0f msg/s, %s mode).", len(messages), elapsed, rate, mode)
+        cancelled = cancel_event is not None and cancel_event.is_set()
         if not messages:
+            check_cancelled(cancel_event)
             raise ValueError("The selected channel did not return any text messages.")
-        return pd.DataFrame(messages)
+        df = pd.DataFrame(messages)
+        df.attrs["download_stats"] = {
+            "mode": mode, "messages": len(messages), "seconds": elapsed, "rate": rate, "cancelled": cancelled,
+        }
+        return df
+
+    def monitor_channel(
+        self,
+        api_id: int,
+        api_hash: str,
+        phone: str,
+        channel: str,
+        code_provider,
+        stopwords: Set[str],
+        on_update: Callable[[Image.Image, Dict], None],
+        *,
+        window_seconds: Optional[float] = None,
+        render_interval: float = LIVE_RENDER_INTERVAL,
+        backfill: int = 0,
+        since: Optional[datetime.datetime] = None,
+        until: Optional[datetime.datetime] = None,
+        tokenizer: Optional[Tokenizer] = None,
+        render_slot: Optional[Callable[[], ContextManager]] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> LiveWordCounts:
+        """
+        Follow ``channel`` until ``cancel_event`` is set, keeping a running word count of its new
+        posts and calling ``on_update(image, stats)`` with a fresh cloud at most once every
+        ``render_interval`` seconds (and only when something changed). ``window_seconds`` limits
+        the counts to recent posts; ``backfill`` seeds them with that many latest posts, or
+        ``since`` with every post from that date on. ``until`` ends the session at that time.
+        Each render runs inside ``render_slot()`` when given, so a caller can count it against
+        a CPU limit; posts keep arriving while it waits.
+
+        New posts arrive through a Telethon ``NewMessage`` handler, with a catch-up poll every
+        ``LIVE_POLL_SECONDS`` for channels Telegram does not push updates for. The Telegram
+        connection is held for the whole session, so other Telethon jobs wait until it stops.
+        Returns the final counts.
+        """
+        if not channel:
+            raise ValueError("Enter the channel username or invite link to monitor.")
+        lower, upper = self._as_utc(since), self._as_utc(until)
+        if upper is not None and upper <= pd.Timestamp.now(tz="UTC"):
+            raise ValueError("The end of the date range has already passed; live mode only follows new posts.")
+        stop_at = upper.timestamp() if upper is not None else None
+        lowered = {w.lower() for w in stopwords}
+        counts = LiveWordCounts(
+            tokenizer.tokens if tokenizer is not None else (lambda text: tokenize(text, lowered)), window_seconds
+        )
+        renderer = LiveCloudRenderer(self, stopwords, interval=render_interval, max_words=WORDCLOUD_MAX_WORDS)
+        last_id = [0]
+
+        def take(msg) -> None:
+            if msg.id <= last_id[0]:
+                return
+            last_id[0] = msg.id
+            if msg.message:
+                counts.add(msg.message, msg.date.timestamp() if msg.date else None)
+
+        async def on_new_message(event) -> None:
+            take(event.message)
+
+        def follow(client) -> None:
+            # On a retry after a dropped connection, posts already counted are skipped by ``take``
+            # and the ones missed while disconnected are fetched by the catch-up poll.
+            if last_id[0]:
+                for msg in reversed(client.get_messages(channel, limit=100, min_id=last_id[0])):
+                    take(msg)
+            elif lower is not None:
+                for msg in client.iter_messages(channel, offset_date=lower.to_pydatetime(), reverse=True):
+                    if cancel_event is not None and cancel_event.is_set():
+                        break
+                    take(msg)
+            else:
+                for msg in reversed(client.get_messages(channel, limit=backfill or 1)):
+                    if backfill:
+                        take(msg)
+                    else:
+                        last_id[0] = max(last_id[0], msg.id)
+            logger.info("Live: following %s from message %s (%s counted).", channel, last_id[0], counts.messages)
+            client.add_event_handler(on_new_message, events.NewMessage(chats=channel))
+            try:
+                client.loop.run_until_complete(
+                    self._live_loop(
+                        client, channel, counts, renderer, on_update, take, lambda: last_id[0], cancel_event, stop_at,
+                        render_slot or nullcontext,
+                    )
+                )
+            finally:
+                client.remove_event_handler(on_new_message)
+
+        try:
+            self.telethon.run(api_id, api_hash, follow, phone, code_provider)
+        except (UsernameInvalidError, UsernameNotOccupiedError, ChannelPrivateError) as exc:
+            raise ValueError("Unable to access that channel. Check the username/link or join the channel first.") from exc
+        logger.info(
+            "Live: stopped after %s renders (%s with a new layout).", renderer.full_layouts + renderer.reused_layouts,
+            renderer.full_layouts,
+        )
+        return counts
+
+    async def _live_loop(
+        self, client, channel, counts, renderer, on_update, take, last_seen, cancel_event, stop_at, render_slot
+    ) -> None:
+        # Mostly asleep: wakes every LIVE_TICK_SECONDS, renders off the event loop so new posts
+        # keep being received while a cloud is laid out. Stops on cancel or at ``stop_at`` (epoch).
+        loop = asyncio.get_running_loop()
+        next_poll = time.monotonic() + LIVE_POLL_SECONDS
+        while (cancel_event is None or not cancel_event.is_set()) and (stop_at is None or time.time() < stop_at):
+            await asyncio.sleep(LIVE_TICK_SECONDS)
+            counts.expire()
+            if time.monotonic() >= next_poll:
+                for msg in reversed(await client.get_messages(channel, limit=100, min_id=last_seen())):
+                    take(msg)
+                next_poll = time.monotonic() + LIVE_POLL_SECONDS
+            if not renderer.due(counts.version):
+                continue
+            top = counts.top(WORDCLOUD_MAX_WORDS)
+            if not top:
+                continue
+            try:
+                image = await loop.run_in_executor(None, _render_in_slot, render_slot, renderer, top, counts.version)
+            except CancelledError:
+                break  # stopped while waiting for a slot
+            on_update(image, {
+                "messages": counts.messages, "tokens": counts.tokens, "words": len(counts.counts),
+                "render_seconds": renderer.last_seconds, "full_layouts": renderer.full_layouts,
+                "reused_layouts": renderer.reused_layouts,
+            })
+
+    def check_authorization(self, api_id: int, api_hash: str) -> bool:
+        """Return whether the shared session is signed in, without prompting for a login."""
+        return self.telethon.is_authorized(api_id, api_hash)
+
+    def _collect_messages(
+        self,
+        client,
+        channel: str,
+        messages: List[Dict],
+        *,
+        limit: Optional[int],
+        date_from: Optional[datetime.datetime],
+        date_to: Optional[datetime.datetime],
+        wait_time: Optional[float],
+        progress_callback: Optional[Callable[[int, Optional[int]], None]],
+        cancel_event: Optional[threading.Event] = None,
+    ) -> int:
+        """
+        Append text messages from ``channel`` to ``messages`` and return how many were scanned.
+        The progress estimate comes from the first history page instead of a separate request.
+        """
+        iterator = client.iter_messages(channel, limit=limit, offset_date=date_to, reverse=False, wait_time=wait_time)
+        estimated_total = limit
+        lower = self._as_utc(date_from)
+        processed = 0
+        for msg in iterator:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            if processed == 0 and progress_callback:
+                if estimated_total is None:
+                    estimated_total = getattr(iterator, "total", None) or getattr(msg, "id", None)
+                progress_callback(0, estimated_total)
+            msg_date = getattr(msg, "date", None)
+            if lower is not None and msg_date and msg_date < lower:
+                break
+            text = getattr(msg, "message", None)
+            if text:
+                messages.append(
+                    {
+                        "id": msg.id,
+                        "date": msg_date.isoformat() if msg_date else "",
+                        "sender_id": getattr(msg, "sender_id", None),
+                        "text": text,
+                    }
+                )
+            processed += 1
+            if progress_callback and processed % PROGRESS_EVERY == 0:
+                progress_callback(processed, estimated_total)
+        if progress_callback:
+            progress_callback(processed, estimated_total)
+        return processed
 
     def _login(self, client, phone: str, code_provider):
         """
@@ -362,6 +1726,55 @@ class TGWCCore:
         trimmed = raw.strip().strip('"').strip("'")
         return os.path.abspath(trimmed) if trimmed else ""
 
+    def _as_utc(self, value: Optional[datetime.datetime]) -> Optional[pd.Timestamp]:
+        if value is None:
+            return None
+        ts = pd.Timestamp(value)
+        return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+    def _parse_dates(self, values: pd.Series) -> pd.Series:
+        dates = pd.to_datetime(values, errors="coerce", utc=True, format="ISO8601")
+        return pd.Series(dates, index=values.index)
+
+    def _date_bounds(self, dates: pd.Series, date_from, date_to):
+        """
+        Return ``(start, stop)`` positions of the ``[date_from, date_to)`` window in ``dates``.
+        Unsorted input falls back to ``(None, mask)`` with a boolean mask.
+        """
+        lower, upper = self._as_utc(date_from), self._as_utc(date_to)
+        # Undated rows never match a window; once sorted they sit at the front.
+        missing = int(dates.isna().sum())
+        valid = dates.iloc[missing:]
+        if not valid.isna().any() and valid.is_monotonic_increasing:
+            start = missing + (int(valid.searchsorted(lower, side="left")) if lower is not None else 0)
+            stop = missing + (int(valid.searchsorted(upper, side="left")) if upper is not None else len(valid))
+            return start, max(start, stop)
+        mask = dates.notna()
+        if lower is not None:
+            mask &= dates >= lower
+        if upper is not None:
+            mask &= dates < upper
+        return None, mask.tolist()
+
+    def _messages_to_frame(
+        self, messages: List[Dict], cancel_event: Optional[threading.Event] = None
+    ) -> pd.DataFrame:
+        """
+        Flatten exported messages into one row each. Hashtags, mentions and links are kept out
+        of the prose in an entity column (see ``entities.flatten_messages``), so only plain text
+        reaches word tokenization and ``count_entities`` resolves them only when asked. Columns
+        are built as lists, a chunk at a time, which pandas assembles far faster than a list of
+        row dicts.
+        """
+        if not messages:
+            raise ValueError("No messages were found inside the JSON export.")
+        columns: Dict[str, List] = {name: [] for name in MESSAGE_COLUMNS}
+        for start in range(0, len(messages), CANCEL_CHECK_EVERY):
+            check_cancelled(cancel_event)
+            for name, values in flatten_messages(messages[start:start + CANCEL_CHECK_EVERY]).items():
+                columns[name].extend(values)
+        return pd.DataFrame(columns)
+
     def _extract_messages_from_dump(self, data) -> List[Dict]:
         if isinstance(data, dict):
             if "messages" in data:
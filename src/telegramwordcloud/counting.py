@@ -0,0 +1,94 @@
+# counting.py
+import heapq
+import re
+from collections import Counter
+from typing import Callable, Iterable, List, Mapping, Optional, Set, Tuple
+
+# Same token shape as WordCloud.process_text (without collocations), so approximate and
+# exact clouds agree on what counts as a word.
+TOKEN_PATTERN = re.compile(r"\w[\w']*")
+# Texts are pre-aggregated with a Counter in batches of this many messages before they are
+# merged into the summary; memory stays bounded by batch size + capacity.
+BATCH_MESSAGES = 10_000
+CHECK_EVERY = 2_000
+
+
+def tokenize(text: str, stopwords: Set[str]) -> List[str]:
+    """Lower-cased word tokens with possessive 's, pure numbers and ``stopwords`` removed."""
+    tokens = []
+    for word in TOKEN_PATTERN.findall(text.lower()):
+        if word.endswith("'s"):
+            word = word[:-2]
+        if word and not word.isdigit() and word not in stopwords:
+            tokens.append(word)
+    return tokens
+
+
+class HeavyHittersCounter:
+    """
+    Fixed-size approximate word counter (mergeable Misra-Gries / "Frequent" summary).
+
+    Batches are merged into the summary with ``Counter.update``; whenever more than
+    ``capacity`` words are tracked, the ``capacity + 1``-th largest count is subtracted from
+    every word and non-positive entries are dropped. With ``N`` the total number of tokens
+    seen, this guarantees:
+
+    * every reported count underestimates the true count by at most ``error_bound() <= N / (capacity + 1)``;
+    * every word whose true count exceeds ``error_bound()`` is still tracked.
+
+    For the Zipf-like distributions of natural text the top few hundred words are far above
+    that bound for any reasonable capacity, so they keep their rank and near-exact counts.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive.")
+        self.capacity = capacity
+        self.total = 0
+        self._counts: Counter = Counter()
+        self._error = 0
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def update(self, items: Mapping[str, int]) -> None:
+        self.total += sum(items.values())
+        self._counts.update(items)
+        if len(self._counts) > self.capacity:
+            cut = heapq.nlargest(self.capacity + 1, self._counts.values())[-1]
+            self._error += cut
+            self._counts = Counter({word: count - cut for word, count in self._counts.items() if count > cut})
+
+    def error_bound(self) -> int:
+        """Largest possible undercount of any reported word (at most ``N / (capacity + 1)``)."""
+        return self._error
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        return self._counts.most_common(n)
+
+
+def count_top_words(
+    texts: Iterable[str],
+    stopwords: Set[str],
+    capacity: int,
+    check: Optional[Callable[[], None]] = None,
+    tokenize_text: Optional[Callable[[str], List[str]]] = None,
+) -> HeavyHittersCounter:
+    """
+    Stream ``texts`` into a ``HeavyHittersCounter`` of the given ``capacity``.
+    ``check`` is called every ``CHECK_EVERY`` texts and may raise to abort. ``tokenize_text``
+    replaces ``tokenize`` (and its stopword filtering) when given.
+    """
+    lowered = {w.lower() for w in stopwords}
+    summary = HeavyHittersCounter(capacity)
+    batch: Counter = Counter()
+    for index, text in enumerate(texts, start=1):
+        if check is not None and index % CHECK_EVERY == 0:
+            check()
+        batch.update(tokenize(text, lowered) if tokenize_text is None else tokenize_text(text))
+        if index % BATCH_MESSAGES == 0:
+            summary.update(batch)
+            batch = Counter()
+    if batch:
+        summary.update(batch)
+    return summary
@@ -0,0 +1,156 @@
+# csvindex.py
+import io
+import json
+import logging
+import os
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger("telegramwordcloud")
+
+CSV_INDEX_VERSION = 1
+# Records per indexed block: a date window is read in whole blocks of this many rows.
+INDEX_BLOCK_ROWS = 5_000
+
+
+def file_signature(path: str) -> List[int]:
+    """``[mtime_ns, size]`` of ``path``; rewriting the export in place changes it."""
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def record_blocks(f: BinaryIO, rows: int) -> Iterator[Tuple[int, int, int, bytes]]:
+    """
+    Split a CSV file opened in binary mode into ``(start, end, records, data)`` byte ranges:
+    the header record first, then blocks of ``rows`` records. A record ends at a newline outside
+    quotes; doubled quotes inside a field keep the quote count even, so counting quote characters
+    per line is enough. Blank lines between records are kept in the data but not counted, as
+    pandas skips them.
+    """
+    start = offset = records = 0
+    target = 1
+    quoted = False
+    lines: List[bytes] = []
+    for line in f:
+        offset += len(line)
+        lines.append(line)
+        if line.count(b'"') % 2:
+            quoted = not quoted
+        if quoted or not line.strip():
+            continue
+        records += 1
+        if records == target:
+            yield start, offset, records, b"".join(lines)
+            start, records, target, lines = offset, 0, rows, []
+    if lines:
+        yield start, offset, records, b"".join(lines)
+
+
+class CsvDateIndex:
+    """
+    Byte ranges of a CSV export with the earliest and latest date in each, cached on disk as JSON.
+
+    Built in one pass the first time a date window is asked of a file, then reused until the file's
+    modification time or size changes. ``ranges`` picks the blocks that can hold rows in a window,
+    so reading a window seeks to those blocks and parses only them, in whatever order the export
+    is written.
+    """
+
+    def __init__(self, signature: List[int], date_column: str, header_end: int, blocks: List[List]):
+        self.signature = signature
+        self.date_column = date_column
+        self.header_end = header_end
+        # [start, end, earliest, latest]; dates as UTC nanoseconds, None for a block without dates.
+        self.blocks = blocks
+
+    @classmethod
+    def load(
+        cls,
+        cache_path: Path,
+        csv_path: str,
+        date_column: str,
+        parse_dates: Callable[[pd.Series], pd.Series],
+        check: Optional[Callable[[], None]] = None,
+    ) -> Optional["CsvDateIndex"]:
+        """The index of ``csv_path`` from ``cache_path``, rebuilt if missing or stale; None if the file cannot be indexed."""
+        signature = file_signature(csv_path)
+        try:
+            with cache_path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            if (
+                data.get("version") == CSV_INDEX_VERSION
+                and data.get("signature") == signature
+                and data.get("date_column") == date_column
+            ):
+                return cls(signature, date_column, data["header_end"], data["blocks"])
+        except (OSError, ValueError, KeyError) as exc:
+            logger.debug("CSV index %s not usable: %s", cache_path, exc)
+        index = cls.build(csv_path, date_column, parse_dates, check)
+        if index is not None:
+            index.save(cache_path)
+        return index
+
+    @classmethod
+    def build(
+        cls,
+        csv_path: str,
+        date_column: str,
+        parse_dates: Callable[[pd.Series], pd.Series],
+        check: Optional[Callable[[], None]] = None,
+    ) -> Optional["CsvDateIndex"]:
+        signature = file_signature(csv_path)
+        blocks: List[List] = []
+        with open(csv_path, "rb") as f:
+            parts = record_blocks(f, INDEX_BLOCK_ROWS)
+            first = next(parts, None)
+            if first is None:
+                return None
+            header_end, header = first[1], first[3]
+            if date_column not in pd.read_csv(io.BytesIO(header), nrows=0, encoding="utf-8").columns:
+                raise ValueError(f"{csv_path} has no '{date_column}' column to filter on.")
+            for start, end, records, data in parts:
+                if check is not None:
+                    check()
+                column = pd.read_csv(io.BytesIO(header + data), usecols=[date_column], low_memory=False, encoding="utf-8")
+                if len(column) != records:
+                    # Quoting this scan does not understand (e.g. backslash escapes): read the whole file instead.
+                    logger.info("Not indexing %s: rows at byte %s could not be delimited.", csv_path, start)
+                    return None
+                dates = parse_dates(column[date_column]).dropna()
+                bounds = [int(dates.min().value), int(dates.max().value)] if len(dates) else [None, None]
+                blocks.append([start, end] + bounds)
+        logger.info("Indexed the dates of %s in %s blocks.", csv_path, len(blocks))
+        return cls(signature, date_column, header_end, blocks)
+
+    def save(self, cache_path: Path) -> None:
+        data = {
+            "version": CSV_INDEX_VERSION,
+            "signature": self.signature,
+            "date_column": self.date_column,
+            "header_end": self.header_end,
+            "blocks": self.blocks,
+        }
+        tmp = cache_path.with_suffix(cache_path.suffix + ".tmp")
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, cache_path)
+        except OSError as exc:
+            logger.warning("Unable to write CSV index %s: %s", cache_path, exc)
+
+    def ranges(self, lower: Optional[pd.Timestamp], upper: Optional[pd.Timestamp]) -> List[Tuple[int, int]]:
+        """Byte ranges of the blocks that can hold rows dated in ``[lower, upper)``, adjacent blocks merged."""
+        low = None if lower is None else lower.value
+        high = None if upper is None else upper.value
+        ranges: List[Tuple[int, int]] = []
+        for start, end, earliest, latest in self.blocks:
+            if earliest is None or (low is not None and latest < low) or (high is not None and earliest >= high):
+                continue
+            if ranges and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((start, end))
+        return ranges
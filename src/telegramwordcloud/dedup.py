@@ -0,0 +1,106 @@
+# dedup.py
+import hashlib
+import re
+import unicodedata
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+NON_WORD = re.compile(r"[\W_]+")
+# MinHash signature: NUM_PERM hash functions split into LSH_BANDS bands of NUM_PERM // LSH_BANDS rows.
+# 16 bands x 4 rows surfaces candidate pairs from a Jaccard similarity of about 0.5; candidates
+# are then confirmed against NEAR_DUPLICATE_THRESHOLD using the full signatures.
+NUM_PERM = 64
+LSH_BANDS = 16
+SHINGLE_SIZE = 2
+NEAR_DUPLICATE_THRESHOLD = 0.7
+# Signatures remembered per LSH bucket; when a bucket is full the oldest one makes room, so
+# a popular bucket (e.g. a recurring sign-off) still finds recent reposts at bounded cost.
+BUCKET_CANDIDATES = 8
+CHECK_EVERY = 5_000
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = np.random.default_rng(20240101)
+_PERM_A = _rng.integers(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+
+def normalize_text(text: str) -> str:
+    """Fold case, compatibility forms, punctuation and whitespace so reposts compare equal."""
+    folded = unicodedata.normalize("NFKC", text).casefold()
+    return NON_WORD.sub(" ", folded).strip()
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class MessageDeduplicator:
+    """
+    Streaming duplicate filter for message texts.
+
+    Exact duplicates are detected with a set of 64-bit hashes of the normalised text (8 bytes
+    of payload per distinct message, never the text itself). With ``near_duplicates`` the
+    filter also keeps a 32-bit MinHash signature of word shingles per distinct message and
+    drops messages whose estimated Jaccard similarity to an earlier LSH candidate reaches
+    ``threshold``. Each LSH bucket keeps its ``BUCKET_CANDIDATES`` most recent signatures.
+    Like any MinHash scheme the similarity is an estimate.
+    """
+
+    def __init__(self, near_duplicates: bool = False, threshold: float = NEAR_DUPLICATE_THRESHOLD):
+        self.near_duplicates = near_duplicates
+        self.threshold = threshold
+        self._seen: Set[int] = set()
+        self._bands: List[Dict[int, List[int]]] = [{} for _ in range(LSH_BANDS)]
+        self._signatures: List[np.ndarray] = []
+
+    def is_duplicate(self, text: str) -> bool:
+        normalized = normalize_text(text)
+        if not normalized:
+            return False
+        digest = _hash64(normalized)
+        if digest in self._seen:
+            return True
+        self._seen.add(digest)
+        if not self.near_duplicates:
+            return False
+
+        signature = self._signature(normalized)
+        if signature is None:
+            return False
+        rows = NUM_PERM // LSH_BANDS
+        band_hashes = [hash(signature[i * rows:(i + 1) * rows].tobytes()) for i in range(LSH_BANDS)]
+        checked: Set[int] = set()
+        for h, band in zip(band_hashes, self._bands):
+            for candidate in band.get(h, ()):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                if np.mean(self._signatures[candidate] == signature) >= self.threshold:
+                    return True
+        index = len(self._signatures)
+        self._signatures.append(signature)
+        for h, band in zip(band_hashes, self._bands):
+            bucket = band.setdefault(h, [])
+            if len(bucket) == BUCKET_CANDIDATES:
+                del bucket[0]
+            bucket.append(index)
+        return False
+
+    def keep_mask(self, texts: Iterable[str], check: Optional[Callable[[], None]] = None) -> List[bool]:
+        """``check`` is called every ``CHECK_EVERY`` texts and may raise to abort."""
+        mask = []
+        for index, text in enumerate(texts):
+            if check is not None and index % CHECK_EVERY == 0:
+                check()
+            mask.append(not self.is_duplicate(text))
+        return mask
+
+    def _signature(self, normalized: str) -> Optional[np.ndarray]:
+        words = normalized.split()
+        if len(words) < SHINGLE_SIZE:
+            return None
+        shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+        values = np.fromiter((_hash64(s) & 0xFFFFFFFF for s in shingles), dtype=np.uint64, count=len(shingles))
+        # (a * x + b) mod p with 32-bit a, b, x stays below 2**64, so uint64 arithmetic is exact.
+        minima = ((_PERM_A[:, None] * values[None, :] + _PERM_B[:, None]) % _MERSENNE_PRIME).min(axis=1)
+        return (minima & 0xFFFFFFFF).astype(np.uint32)
@@ -0,0 +1,97 @@
+# distinctive.py
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import scipy.sparse as sparse
+
+    scipy_available = True
+except ImportError:
+    scipy_available = False
+
+SCORING_METHODS = ("tfidf", "logodds")
+# Strength of the informative Dirichlet prior in log-odds scoring, in pseudo-tokens.
+LOG_ODDS_PRIOR = 500.0
+
+
+class DocumentTermMatrix:
+    """
+    Word counts of many documents (channels, periods, senders) in compressed sparse row layout:
+    row ``i`` holds ``data[indptr[i]:indptr[i + 1]]`` counts for the vocabulary ids
+    ``indices[indptr[i]:indptr[i + 1]]``. Only non-zero cells are stored, so 500 documents over
+    a 200k-word vocabulary cost a few bytes per distinct (document, word) pair rather than
+    ``500 * 200_000`` cells.
+
+    The arrays are plain NumPy; ``to_scipy()`` wraps them in a ``scipy.sparse.csr_matrix``
+    without copying when SciPy is installed.
+    """
+
+    def __init__(self, labels: Sequence[str], vocabulary: Sequence[str], indptr: np.ndarray, indices: np.ndarray, data: np.ndarray):
+        self.labels = list(labels)
+        self.vocabulary = list(vocabulary)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.data = np.asarray(data, dtype=np.float64)
+
+    @property
+    def shape(self):
+        return len(self.labels), len(self.vocabulary)
+
+    @property
+    def rows(self) -> np.ndarray:
+        """Row index of every stored cell (the COO view of ``indptr``)."""
+        return np.repeat(np.arange(len(self.labels)), np.diff(self.indptr))
+
+    def row_dict(self, row: int, values: Optional[np.ndarray] = None) -> Dict[str, float]:
+        lo, hi = self.indptr[row], self.indptr[row + 1]
+        values = self.data if values is None else values
+        return {self.vocabulary[i]: float(v) for i, v in zip(self.indices[lo:hi], values[lo:hi])}
+
+    def to_scipy(self):
+        if not scipy_available:
+            raise ImportError("SciPy is not installed. Install it with 'pip install scipy'.")
+        return sparse.csr_matrix((self.data, self.indices, self.indptr), shape=self.shape)
+
+    def tfidf(self) -> np.ndarray:
+        """
+        TF-IDF of every stored cell: term frequency within its document times the smoothed
+        inverse document frequency ``log((1 + n) / (1 + df)) + 1`` across all documents.
+        """
+        n_docs = len(self.labels)
+        rows = self.rows
+        doc_totals = np.bincount(rows, weights=self.data, minlength=n_docs)
+        doc_freq = np.bincount(self.indices, minlength=len(self.vocabulary))
+        idf = np.log((1.0 + n_docs) / (1.0 + doc_freq)) + 1.0
+        return self.data / doc_totals[rows] * idf[self.indices]
+
+    def log_odds(self, prior: float = LOG_ODDS_PRIOR) -> np.ndarray:
+        """
+        Weighted log-odds z-scores with an informative Dirichlet prior (Monroe, Colaresi and
+        Quinn, 2008) of every stored cell: how much more often the document uses the word than
+        all other documents together, scaled by the uncertainty of that difference. Rare words
+        are shrunk toward the corpus rate by ``prior`` pseudo-tokens.
+        """
+        rows = self.rows
+        word_totals = np.bincount(self.indices, weights=self.data, minlength=len(self.vocabulary))
+        corpus_total = word_totals.sum()
+        doc_totals = np.bincount(rows, weights=self.data, minlength=len(self.labels))
+        alpha = prior * word_totals[self.indices] / corpus_total
+        own = self.data
+        rest = word_totals[self.indices] - own
+        own_total = doc_totals[rows]
+        rest_total = corpus_total - own_total
+        delta = np.log((own + alpha) / (own_total + prior - own - alpha)) - np.log(
+            (rest + alpha) / (rest_total + prior - rest - alpha)
+        )
+        return delta / np.sqrt(1.0 / (own + alpha) + 1.0 / (rest + alpha))
+
+    def top_terms(self, scores: np.ndarray, n: int) -> List[Dict[str, float]]:
+        """The ``n`` highest positive-scoring words of each row, as ``{word: score}``."""
+        tops = []
+        for row in range(len(self.labels)):
+            lo, hi = self.indptr[row], self.indptr[row + 1]
+            part = scores[lo:hi]
+            best = np.argsort(part)[::-1][:n]
+            tops.append({self.vocabulary[self.indices[lo + i]]: float(part[i]) for i in best if part[i] > 0})
+        return tops
@@ -0,0 +1,105 @@
+# encoding.py
+import copy
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from PIL import Image
+from wordcloud import WordCloud
+
+from .fonts import fonttools_available
+
+logger = logging.getLogger("telegramwordcloud")
+
+# Output format -> (file suffix, Pillow format name; None for formats written as text).
+IMAGE_FORMATS = {
+    "png": (".png", "PNG"),
+    "webp": (".webp", "WEBP"),
+    "jpeg": (".jpg", "JPEG"),
+    "svg": (".svg", None),
+}
+DEFAULT_IMAGE_FORMATS = ("png", "jpeg")
+DEFAULT_JPEG_QUALITY = 90
+# Lossless WebP keeps thin strokes sharp and is still much smaller than PNG for clouds.
+WEBP_OPTIONS = {"lossless": True, "method": 4}
+# zlib level 6 is Pillow's default trade-off; clouds are mostly flat colour and compress well at it.
+PNG_OPTIONS = {"optimize": False, "compress_level": 6}
+
+# mkstemp creates files as 0600; images are given the mode open() would have used instead.
+# The umask can only be read by setting it, so it is read once here rather than per write
+# (from worker threads).
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_FILE_MODE = 0o666 & ~_UMASK
+
+
+def atomic_write(path: str, write: Callable[[str], None]) -> str:
+    """
+    Call ``write(tmp_path)`` for a temporary file next to ``path`` and rename it into place,
+    so readers (and a crash half-way) never see a truncated image.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=Path(path).suffix, dir=directory)
+    os.close(fd)
+    try:
+        write(tmp)
+        os.chmod(tmp, _FILE_MODE)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+def output_path(directory: str, stem: str, fmt: str, scale: int = 1) -> str:
+    suffix = IMAGE_FORMATS[fmt][0]
+    return str(Path(directory) / (f"{stem}{suffix}" if scale == 1 else f"{stem}@{scale}x{suffix}"))
+
+
+def encode_wordcloud(
+    wc: WordCloud,
+    path: str,
+    fmt: str,
+    *,
+    scale: int = 1,
+    quality: int = DEFAULT_JPEG_QUALITY,
+    image: Optional[Image.Image] = None,
+) -> Dict[str, float]:
+    """
+    Write ``wc`` to ``path`` as ``fmt`` and return ``{"seconds": ...}``. ``image`` is the
+    already rendered 1x image, reused instead of drawing the layout again; other scales
+    redraw the existing layout at that size (no new placement search), so text stays sharp.
+    SVG is written from the layout with ``to_svg`` (embedding a subset of the font when
+    fontTools is installed) and ignores ``scale``.
+    """
+    if fmt not in IMAGE_FORMATS:
+        raise ValueError(f"Unknown image format '{fmt}'. Choose one of: {', '.join(IMAGE_FORMATS)}.")
+    started = time.perf_counter()
+    pil_format = IMAGE_FORMATS[fmt][1]
+    if pil_format is None:
+        svg = wc.to_svg(embed_font=fonttools_available)
+
+        def write(tmp: str) -> None:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(svg)
+    else:
+        if image is None or scale != 1:
+            scaled = copy.copy(wc)
+            scaled.scale = scale
+            image = scaled.to_image()
+        options = {"JPEG": {"quality": quality, "optimize": True}, "WEBP": WEBP_OPTIONS, "PNG": PNG_OPTIONS}[pil_format]
+        frame = image.convert("RGB") if pil_format == "JPEG" else image
+
+        def write(tmp: str) -> None:
+            frame.save(tmp, pil_format, **options)
+
+    atomic_write(path, write)
+    seconds = time.perf_counter() - started
+    logger.info("Encoded %s (%sx) in %.2fs -> %s", fmt, scale, seconds, path)
+    return {"seconds": seconds}
@@ -0,0 +1,124 @@
+# entities.py
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Telegram Desktop exports store rich text as ``text``: a plain string when the message has no
+# formatting, otherwise a flat list of strings (plain runs) and entity dicts {"type", "text",
+# "href"?}. Entity types decide where each piece goes: prose is kept for word tokenization,
+# the rest goes to its own table.
+HASHTAGS, MENTIONS, DOMAINS, BODY = range(4)
+ENTITY_ROUTES = {
+    "plain": BODY, "bold": BODY, "italic": BODY, "underline": BODY, "strikethrough": BODY,
+    "spoiler": BODY, "blockquote": BODY, "code": BODY, "pre": BODY, "text_link": BODY, "custom_emoji": BODY,
+    "hashtag": HASHTAGS, "cashtag": HASHTAGS,
+    "mention": MENTIONS, "mention_name": MENTIONS,
+    "link": DOMAINS, "url": DOMAINS,
+}  # anything else (email, phone, bot_command, ...) carries no topic words and is dropped
+ENTITY_TABLES = ("hashtags", "mentions", "domains")  # indexed by route
+ENTITY_COLUMN = "entities"
+MESSAGE_COLUMNS = ("id", "date", "from", "type", "text", ENTITY_COLUMN)
+PROSE_TYPES = frozenset(kind for kind, route in ENTITY_ROUTES.items() if route == BODY)
+
+_DOMAIN = re.compile(r"^(?:[a-z][a-z0-9+.-]*://)?(?:[^@/?#]*@)?([^/:?#]+)", re.IGNORECASE)
+_NONE: Tuple[str, ...] = ()
+
+
+@lru_cache(maxsize=65536)
+def _host_of(authority: str) -> str:
+    match = _DOMAIN.match(authority.strip())
+    if not match:
+        return ""
+    host = match.group(1).lower().rstrip(".")
+    return host[4:] if host.startswith("www.") else host
+
+
+def domain_of(url: str) -> str:
+    """Host name of ``url`` (scheme optional), lower-cased and without a leading ``www.``."""
+    # Only the part before the path decides the host; caching on it (not the whole URL, which is
+    # usually unique) lets the few hundred sites of a channel skip the regex after the first link.
+    slash = url.find("/", url.find("://") + 3)
+    return _host_of(url if slash == -1 else url[:slash])
+
+
+def flatten_messages(messages: Iterable[Dict]) -> Dict[str, List]:
+    """
+    Flatten exported messages into ``MESSAGE_COLUMNS``, one entry per message, in a single pass.
+    ``text`` is the plain text; hashtags, mentions and bare links are left out of it and kept in
+    the entity column as a flat ``(type, text, type, text, ...)`` tuple for the hashtag, mention
+    and domain tables. A ``text_link`` keeps its visible text and is also kept, with its target,
+    as an entity for the domain table.
+
+    Pieces are only classified by type here; ``count_entities`` resolves them (lower-casing, URL
+    parsing) when the tables are wanted. Messages without entities share one empty tuple, and
+    tuples of strings are untracked by the garbage collector, so a large export does not leave it
+    hundreds of thousands of containers to rescan.
+    """
+    columns: Dict[str, List] = {name: [] for name in MESSAGE_COLUMNS}
+    ids, dates, senders, types, texts, entities = (column.append for column in columns.values())
+    prose, routes = PROSE_TYPES, ENTITY_ROUTES
+    for message in messages:
+        ids(message.get("id"))
+        dates(message.get("date"))
+        senders(message.get("from") or message.get("actor"))  # service messages name an actor
+        types(message.get("type"))
+        text = message.get("text")
+        if text is None:
+            text = message.get("text_entities")
+        if type(text) is not list:
+            texts(text if type(text) is str else "")
+            entities(_NONE)
+            continue
+
+        parts: List[str] = []
+        add = parts.append
+        found = _NONE
+        for item in text:
+            if type(item) is str:
+                add(item)
+                continue
+            try:
+                kind = item["type"]
+                value = item["text"] or ""
+            except (KeyError, TypeError):
+                if type(item) is not dict:
+                    continue
+                kind, value = item.get("type"), ""
+            if kind in prose:
+                add(value)
+                if kind != "text_link":
+                    continue
+                value = item.get("href")
+                if not value:
+                    continue
+            else:
+                add(" ")
+                if kind not in routes:
+                    continue
+            found = (*found, kind, value)
+        texts("".join(parts))
+        entities(found)
+    return columns
+
+
+def count_entities(entity_column: Iterable[Sequence[str]]) -> Dict[str, Counter]:
+    """
+    Hashtag, mention and domain counts from the entities ``flatten_messages`` kept aside.
+    Hashtags and ``@mentions`` are lower-cased; a ``mention_name`` is a display name and is
+    kept as written. Tables without entries are left out.
+    """
+    tables = (Counter(), Counter(), Counter())
+    for found in entity_column:
+        pairs = iter(found)
+        for kind, value in zip(pairs, pairs):
+            route = ENTITY_ROUTES[kind]
+            if route == BODY or route == DOMAINS:
+                value = domain_of(value)
+                if value:
+                    tables[DOMAINS][value] += 1
+            elif route == HASHTAGS or value.startswith("@"):
+                tables[route][value.lower()] += 1
+            else:
+                tables[route][value] += 1
+    return {name: counts for name, counts in zip(ENTITY_TABLES, tables) if counts}
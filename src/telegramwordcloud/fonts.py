@@ -0,0 +1,204 @@
+# fonts.py
+import bisect
+import json
+import logging
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from fontTools.ttLib import TTFont, TTLibError
+
+    fonttools_available = True
+except ImportError:
+    fonttools_available = False
+
+logger = logging.getLogger("telegramwordcloud")
+
+FONT_SUFFIXES = (".ttf", ".otf", ".ttc")
+FONT_INDEX_VERSION = 2
+# Every cloud must render these, whatever the corpus: Telegram exports mix Latin and Cyrillic,
+# so the Russian/Ukrainian/Belarusian alphabets are required even when the top words are English.
+REQUIRED_CHARS = (
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    "абвгдеёжзийклмнопрстуфхцчшщъыьэюяАБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ"
+    "ґєіїўҐЄІЇЎ"
+)
+# Tie-breakers among fonts with equal coverage, most preferred first.
+PREFERRED_FAMILIES = ("Arial", "Segoe UI", "Helvetica", "Noto Sans", "DejaVu Sans", "Liberation Sans", "Roboto", "Open Sans")
+REGULAR_STYLES = ("regular", "book", "normal", "roman")
+
+
+def font_dirs() -> List[Path]:
+    """System and per-user font directories for this platform (existing or not)."""
+    home = Path.home()
+    if sys.platform.startswith("win"):
+        windir = Path(os.environ.get("WINDIR", r"C:\Windows"))
+        local = Path(os.environ.get("LOCALAPPDATA", home / "AppData" / "Local"))
+        return [windir / "Fonts", local / "Microsoft" / "Windows" / "Fonts"]
+    if sys.platform == "darwin":
+        return [Path("/System/Library/Fonts"), Path("/Library/Fonts"), home / "Library" / "Fonts"]
+    data_home = Path(os.environ.get("XDG_DATA_HOME", home / ".local" / "share"))
+    return [Path("/usr/share/fonts"), Path("/usr/local/share/fonts"), data_home / "fonts", home / ".fonts"]
+
+
+def _codepoint_ranges(codepoints: Iterable[int]) -> List[List[int]]:
+    """Sorted ``[first, last]`` runs of consecutive code points."""
+    ranges: List[List[int]] = []
+    for cp in sorted(codepoints):
+        if ranges and cp == ranges[-1][1] + 1:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp])
+    return ranges
+
+
+def read_font(path: str) -> Optional[Dict]:
+    """Family, style and covered Unicode ranges of the first face in ``path``, or None if unreadable."""
+    try:
+        font = TTFont(path, fontNumber=0, lazy=True)
+        try:
+            names = font["name"]
+            family = names.getBestFamilyName() or Path(path).stem
+            style = names.getBestSubFamilyName() or "Regular"
+            cmap = font.getBestCmap() or {}
+        finally:
+            font.close()
+    except (TTLibError, OSError, KeyError, AssertionError, ValueError) as exc:
+        logger.debug("Skipping font %s: %s", path, exc)
+        return None
+    return {"family": str(family), "style": str(style), "ranges": _codepoint_ranges(cmap)}
+
+
+class FontIndex:
+    """
+    Installed fonts with the Unicode ranges each one covers, cached on disk as JSON.
+
+    ``load`` stats the font files (without opening them) and compares their modification
+    times and sizes with those stored in the cache; only new or changed files are opened.
+    A warm start therefore costs one ``stat`` per installed font and no font parsing.
+    Coverage checks are bisections over each font's sorted ranges, and the best font
+    per character set is memoized in memory.
+    """
+
+    def __init__(self, fonts: Optional[List[Dict]] = None, signature: Optional[Dict[str, List[int]]] = None):
+        self.fonts: List[Dict] = fonts or []
+        self.signature: Dict[str, List[int]] = signature or {}
+        self._starts = [[first for first, _ in font["ranges"]] for font in self.fonts]
+        self._best: Dict[frozenset, Optional[Dict]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def directory_signature(dirs: Iterable[Path]) -> Dict[str, List[int]]:
+        """
+        ``{font file: [mtime_ns, size]}`` for every font under ``dirs``. Only ``stat`` calls, no
+        font is opened; adding, removing or replacing a font in place changes it.
+        """
+        signature: Dict[str, List[int]] = {}
+        for root in dirs:
+            if not root.is_dir():
+                continue
+            for current, _, files in os.walk(root):
+                for name in sorted(files):
+                    if not name.lower().endswith(FONT_SUFFIXES):
+                        continue
+                    path = os.path.join(current, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    signature[path] = [stat.st_mtime_ns, stat.st_size]
+        return signature
+
+    @classmethod
+    def load(cls, cache_path: Path, dirs: Optional[List[Path]] = None) -> "FontIndex":
+        dirs = font_dirs() if dirs is None else dirs
+        signature = cls.directory_signature(dirs)
+        cached: List[Dict] = []
+        try:
+            with cache_path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == FONT_INDEX_VERSION:
+                cached = data["fonts"]
+                if data.get("signature") == signature:
+                    return cls(cached, signature)
+        except (OSError, ValueError, KeyError) as exc:
+            logger.debug("Font index %s not usable: %s", cache_path, exc)
+        index = cls(cls._scan(signature, cached), signature)
+        index.save(cache_path)
+        return index
+
+    @staticmethod
+    def _scan(signature: Dict[str, List[int]], cached: List[Dict]) -> List[Dict]:
+        if not fonttools_available:
+            logger.warning("fontTools is not installed; fonts cannot be checked for Cyrillic coverage.")
+            return []
+        known = {font["path"]: font for font in cached}
+        fonts: List[Dict] = []
+        opened = 0
+        for path, (mtime_ns, size) in signature.items():
+            entry = known.get(path)
+            if entry is None or entry["mtime_ns"] != mtime_ns or entry["size"] != size:
+                info = read_font(path)
+                opened += 1
+                if info is None:
+                    continue
+                entry = dict(info, path=path, mtime_ns=mtime_ns, size=size)
+            fonts.append(entry)
+        logger.info("Indexed %s fonts (%s files read, the rest reused from the cache).", len(fonts), opened)
+        return fonts
+
+    def save(self, cache_path: Path) -> None:
+        data = {"version": FONT_INDEX_VERSION, "signature": self.signature, "fonts": self.fonts}
+        tmp = cache_path.with_suffix(cache_path.suffix + ".tmp")
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, cache_path)
+        except OSError as exc:
+            logger.warning("Unable to write font index %s: %s", cache_path, exc)
+
+    def missing(self, position: int, chars: Iterable[str]) -> int:
+        """How many of ``chars`` the font at ``position`` has no glyph for."""
+        ranges = self.fonts[position]["ranges"]
+        starts = self._starts[position]
+        missing = 0
+        for ch in chars:
+            cp = ord(ch)
+            i = bisect.bisect_right(starts, cp) - 1
+            if i < 0 or ranges[i][1] < cp:
+                missing += 1
+        return missing
+
+    def covers(self, path: str, text: str) -> bool:
+        for position, font in enumerate(self.fonts):
+            if font["path"] == path:
+                return self.missing(position, set(text)) == 0
+        return False
+
+    def best_font(self, chars: Iterable[str]) -> Optional[Dict]:
+        """
+        The font with glyphs for most of ``chars`` (whitespace ignored); ties go to
+        ``PREFERRED_FAMILIES``, then regular styles. None when no font is indexed.
+        """
+        key = frozenset(ch for ch in chars if not ch.isspace())
+        with self._lock:
+            if key in self._best:
+                return self._best[key]
+        ranked = []
+        for position, font in enumerate(self.fonts):
+            family = font["family"]
+            preference = PREFERRED_FAMILIES.index(family) if family in PREFERRED_FAMILIES else len(PREFERRED_FAMILIES)
+            regular = 0 if font["style"].lower() in REGULAR_STYLES else 1
+            ranked.append((self.missing(position, key), preference, regular, family, font["path"], position))
+        best = self.fonts[min(ranked)[-1]] if ranked else None
+        with self._lock:
+            self._best[key] = best
+        return best
+
+    def choices(self) -> List[Tuple[str, str]]:
+        """``(label, path)`` for every indexed font, sorted by label, for pickers."""
+        return sorted((f"{font['family']} ({font['style']})", font["path"]) for font in self.fonts)
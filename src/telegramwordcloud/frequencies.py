@@ -0,0 +1,109 @@
+# frequencies.py
+import csv
+import datetime
+import hashlib
+import json
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+# Binary layout: MAGIC, uint32 metadata length, metadata JSON, then one zlib stream holding
+# uint32 word count, the counts as little-endian uint64 and the words joined by NUL.
+MAGIC = b"TGWCFRQ1"
+BINARY_SUFFIX = ".wcf"
+TABLE_SUFFIXES = (BINARY_SUFFIX, ".csv", ".json")
+CSV_META_PREFIX = "#meta "
+
+
+def stopwords_hash(stopwords: Iterable[str]) -> str:
+    """Order-independent fingerprint of a stopword list, stored with each table."""
+    joined = "\n".join(sorted({w.lower() for w in stopwords}))
+    return hashlib.sha256(joined.encode("utf-8")).hexdigest()[:16]
+
+
+class FrequencyTable:
+    """
+    Word counts plus the metadata needed to trust them later: source, date range, stopword
+    hash and message count. Saved next to a rendered cloud so it can be re-styled without
+    reading and tokenizing the messages again.
+    """
+
+    def __init__(self, frequencies: Mapping[str, int], metadata: Optional[Dict] = None):
+        self.frequencies = dict(sorted(frequencies.items(), key=lambda item: item[1], reverse=True))
+        self.metadata = dict(metadata or {})
+        self.metadata.setdefault("created", datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"))
+        self.metadata["words"] = len(self.frequencies)
+
+    def save(self, path: str) -> str:
+        suffix = Path(path).suffix.lower()
+        if suffix == BINARY_SUFFIX:
+            self._save_binary(path)
+        elif suffix == ".csv":
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                f.write(CSV_META_PREFIX + json.dumps(self.metadata, ensure_ascii=False) + "\n")
+                writer = csv.writer(f)
+                writer.writerow(("word", "count"))
+                writer.writerows(self.frequencies.items())
+        elif suffix == ".json":
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"metadata": self.metadata, "frequencies": self.frequencies}, f, ensure_ascii=False)
+        else:
+            raise ValueError(f"Unsupported frequency table format '{suffix}'. Use {', '.join(TABLE_SUFFIXES)}.")
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "FrequencyTable":
+        suffix = Path(path).suffix.lower()
+        try:
+            if suffix == BINARY_SUFFIX:
+                return cls._load_binary(path)
+            if suffix == ".csv":
+                with open(path, "r", encoding="utf-8", newline="") as f:
+                    first = f.readline()
+                    metadata = json.loads(first[len(CSV_META_PREFIX):]) if first.startswith(CSV_META_PREFIX) else {}
+                    if metadata:
+                        first = f.readline()
+                    if first.strip() != "word,count":
+                        raise ValueError("missing 'word,count' header")
+                    return cls({word: int(count) for word, count in csv.reader(f)}, metadata)
+            if suffix == ".json":
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                return cls({w: int(c) for w, c in data["frequencies"].items()}, data.get("metadata"))
+        except (KeyError, TypeError, ValueError, struct.error, zlib.error) as exc:
+            raise ValueError(f"{path} is not a valid frequency table ({exc}).") from exc
+        raise ValueError(f"Unsupported frequency table format '{suffix}'. Use {', '.join(TABLE_SUFFIXES)}.")
+
+    def without(self, stopwords: Iterable[str]) -> "FrequencyTable":
+        """Copy with ``stopwords`` removed, for tables counted against an older stopword list."""
+        lowered = {w.lower() for w in stopwords}
+        kept = {w: c for w, c in self.frequencies.items() if w.lower() not in lowered}
+        return FrequencyTable(kept, {**self.metadata, "stopwords_hash": None})
+
+    def _save_binary(self, path: str) -> None:
+        meta = json.dumps(self.metadata, ensure_ascii=False).encode("utf-8")
+        counts = np.fromiter(self.frequencies.values(), dtype="<u8", count=len(self.frequencies))
+        body = struct.pack("<I", len(counts)) + counts.tobytes() + "\0".join(self.frequencies).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(MAGIC + struct.pack("<I", len(meta)) + meta + zlib.compress(body))
+
+    @classmethod
+    def _load_binary(cls, path: str) -> "FrequencyTable":
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(MAGIC):
+            raise ValueError("bad file signature")
+        offset = len(MAGIC)
+        (meta_len,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        metadata = json.loads(data[offset:offset + meta_len].decode("utf-8"))
+        body = zlib.decompress(data[offset + meta_len:])
+        (n,) = struct.unpack_from("<I", body, 0)
+        counts = np.frombuffer(body, dtype="<u8", count=n, offset=4).tolist()
+        words: List[str] = body[4 + 8 * n:].decode("utf-8").split("\0") if n else []
+        if len(words) != n:
+            raise ValueError("word and count sections disagree")
+        return cls(dict(zip(words, counts)), metadata)
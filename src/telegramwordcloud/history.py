@@ -0,0 +1,168 @@
+# history.py
+import datetime
+import io
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PIL import Image
+
+logger = logging.getLogger("telegramwordcloud")
+
+THUMBNAIL_SIZE = (160, 112)
+# Files a thumbnail can be made from, in order of preference for a run's main image.
+IMAGE_SUFFIXES = (".png", ".webp", ".jpg", ".jpeg", ".gif")
+# Run folders are named by build_export_dir: exports/<channel>/<YYYYmmddHHMMSS>/.
+EXPORT_TIMESTAMP_FORMAT = "%Y%m%d%H%M%S"
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created TEXT NOT NULL,
+    source TEXT NOT NULL,
+    scope TEXT,
+    seconds REAL,
+    messages INTEGER,
+    image_path TEXT NOT NULL UNIQUE,
+    table_path TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_created ON runs (created);
+CREATE TABLE IF NOT EXISTS thumbnails (
+    run_id INTEGER PRIMARY KEY REFERENCES runs (id) ON DELETE CASCADE,
+    mtime_ns INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+"""
+RUN_COLUMNS = ("id", "created", "source", "scope", "seconds", "messages", "image_path", "table_path")
+
+
+class RunHistory:
+    """
+    Index of finished runs (source, scope, timing and output files) in a small SQLite database.
+
+    Runs are added as they finish, so opening the history never walks the exports tree;
+    ``import_exports`` indexes folders written before the history existed, once, on request.
+    Thumbnails are made the first time a run is shown and stored as PNG blobs keyed by the
+    image's modification time, so later views read a few kilobytes instead of decoding the
+    full-size image. Safe to share between threads.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA foreign_keys = ON")
+            self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def record(
+        self,
+        *,
+        source: str,
+        image_path: str,
+        scope: Optional[str] = None,
+        seconds: Optional[float] = None,
+        messages: Optional[int] = None,
+        table_path: Optional[str] = None,
+        created: Optional[datetime.datetime] = None,
+    ) -> int:
+        """Add a run (replacing any earlier entry for the same image) and return its id."""
+        created = (created or datetime.datetime.now()).isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT OR REPLACE INTO runs (created, source, scope, seconds, messages, image_path, table_path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (created, source, scope, seconds, messages, os.path.abspath(image_path),
+                 os.path.abspath(table_path) if table_path else None),
+            )
+            return cursor.lastrowid
+
+    def runs(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """Runs, newest first."""
+        query = f"SELECT {', '.join(RUN_COLUMNS)} FROM runs ORDER BY created DESC, id DESC LIMIT ? OFFSET ?"
+        with self._lock:
+            rows = self._conn.execute(query, (-1 if limit is None else limit, offset)).fetchall()
+        return [dict(row) for row in rows]
+
+    def get(self, run_id: int) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(RUN_COLUMNS)} FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return dict(row) if row else None
+
+    def remove(self, run_id: int) -> None:
+        """Forget a run; its files are left on disk."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+
+    def thumbnail(self, run_id: int) -> Optional[bytes]:
+        """
+        PNG thumbnail of the run's image, made once and cached; None while the image does not
+        exist, or for runs saved only as SVG.
+        """
+        run = self.get(run_id)
+        if run is None or Path(run["image_path"]).suffix.lower() not in IMAGE_SUFFIXES:
+            return None
+        try:
+            mtime_ns = os.stat(run["image_path"]).st_mtime_ns
+        except OSError:
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT mtime_ns, data FROM thumbnails WHERE run_id = ?", (run_id,)).fetchone()
+        if row is not None and row["mtime_ns"] == mtime_ns:
+            return row["data"]
+        try:
+            with Image.open(run["image_path"]) as img:
+                img.draft("RGB", THUMBNAIL_SIZE)  # JPEG: decode at reduced scale
+                img.thumbnail(THUMBNAIL_SIZE)
+                buffer = io.BytesIO()
+                img.convert("RGB").save(buffer, "PNG")
+        except OSError as exc:
+            logger.warning("Unable to make a thumbnail of %s: %s", run["image_path"], exc)
+            return None
+        data = buffer.getvalue()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO thumbnails (run_id, mtime_ns, data) VALUES (?, ?, ?)", (run_id, mtime_ns, data)
+            )
+        return data
+
+    def import_exports(self, base_dir: str) -> int:
+        """
+        Index run folders under ``<base_dir>/exports`` that are not in the history yet; returns
+        how many were added. Each folder's main image (``wordcloud*``, PNG first, else the newest) and
+        its ``*_frequencies.wcf`` table are recorded.
+        """
+        root = Path(base_dir) / "exports"
+        if not root.is_dir():
+            return 0
+        with self._lock:
+            known = {row[0] for row in self._conn.execute("SELECT image_path FROM runs")}
+        added = 0
+        for run_dir in sorted(p for p in root.glob("*/*") if p.is_dir()):
+            images = sorted(
+                (p for p in run_dir.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES),
+                key=lambda p: (not p.stem.startswith("wordcloud"), "@" in p.stem, IMAGE_SUFFIXES.index(p.suffix.lower()), -p.stat().st_mtime),
+            )
+            if not images or os.path.abspath(images[0]) in known:
+                continue
+            image = images[0]
+            table = image.with_name(f"{image.stem}_frequencies.wcf")
+            try:
+                created = datetime.datetime.strptime(run_dir.name, EXPORT_TIMESTAMP_FORMAT)
+            except ValueError:
+                created = datetime.datetime.fromtimestamp(image.stat().st_mtime)
+            self.record(
+                source=run_dir.parent.name, image_path=str(image), created=created,
+                table_path=str(table) if table.exists() else None,
+            )
+            added += 1
+        logger.info("Indexed %s earlier runs from %s", added, root)
+        return added
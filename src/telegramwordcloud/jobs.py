@@ -0,0 +1,187 @@
+# jobs.py
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator, List, Mapping, Optional
+
+from .core import CancelledError, logger
+
+# "io" jobs mostly wait on Telegram; "cpu" jobs tokenize, count and lay out clouds. Each kind
+# has its own concurrency limit so a long download never blocks a render and vice versa.
+JOB_KINDS = ("io", "cpu")
+DEFAULT_LIMITS = {"io": 2, "cpu": 1}
+FINISHED_STATES = ("done", "cancelled", "failed")
+
+
+class Job:
+    """One queued pipeline run. Its cancel event and progress are never shared with other jobs."""
+
+    def __init__(self, job_id: int, title: str, kind: str, func: Callable[["Job"], None],
+                 notify: Callable[["Job"], None], log: Callable[[str], None]):
+        self.id = job_id
+        self.title = title
+        self.kind = kind
+        self.func = func
+        self.cancel_event = threading.Event()
+        self.state = "queued"
+        self.done = 0
+        self.total: Optional[int] = None
+        self.message = ""
+        self.error: Optional[BaseException] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._notify = notify
+        self._log = log
+
+    @property
+    def is_finished(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    def log(self, message: str) -> None:
+        self.message = message
+        self._log(f"[#{self.id}] {message}")
+        self._notify(self)
+
+    def report_progress(self, done: int, total: Optional[int] = None) -> None:
+        self.done = done
+        self.total = total if total and total > 0 else None
+        self._notify(self)
+
+    def check_cancelled(self) -> None:
+        if self.cancel_event.is_set():
+            raise CancelledError()
+
+
+class JobQueue:
+    """
+    Runs submitted jobs on worker threads, at most ``limits[kind]`` of each kind at a time.
+
+    ``on_change(job)`` is called from whichever thread changed the job (submit, start, progress,
+    log line, finish), so GUI callers must hand it over to their main loop.
+    """
+
+    def __init__(self, limits: Optional[Mapping[str, int]] = None,
+                 on_change: Optional[Callable[[Job], None]] = None,
+                 log: Optional[Callable[[str], None]] = None):
+        self._limits = dict(DEFAULT_LIMITS)
+        self._limits.update(limits or {})
+        self._on_change = on_change
+        self._log = log or logger.info
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        self._ids = itertools.count(1)
+        self._jobs: Dict[int, Job] = {}
+        self._pending: Dict[str, Deque[Job]] = {kind: deque() for kind in JOB_KINDS}
+        self._running = {kind: 0 for kind in JOB_KINDS}
+
+    def submit(self, title: str, kind: str, func: Callable[[Job], None]) -> Job:
+        """Queue ``func(job)``; it should poll ``job.cancel_event`` and report through ``job``."""
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind '{kind}'.")
+        with self._lock:
+            job = Job(next(self._ids), title, kind, func, self._notify, self._log)
+            self._jobs[job.id] = job
+            self._pending[kind].append(job)
+        self._notify(job)
+        self._start_ready()
+        return job
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancel a queued job immediately or ask a running one to stop. False if already finished."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.is_finished:
+                return False
+            job.cancel_event.set()
+            if job.state == "queued":
+                self._pending[job.kind].remove(job)
+                job.state = "cancelled"
+                job.finished_at = time.time()
+            else:
+                job.state = "cancelling"
+        self._notify(job)
+        return True
+
+    def cancel_all(self) -> None:
+        for job in self.jobs():
+            self.cancel(job.id)
+
+    @contextmanager
+    def slot(self, kind: str, cancel_event: Optional[threading.Event] = None) -> Iterator[None]:
+        """
+        Hold one ``kind`` slot for a burst of work inside a job of another kind (a live session's
+        renders run inside an "io" job), waiting while the limit is reached.
+        """
+        with self._slot_freed:
+            while self._running[kind] >= self._limits[kind]:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise CancelledError()
+                self._slot_freed.wait(0.25)
+            self._running[kind] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._running[kind] -= 1
+                self._slot_freed.notify_all()
+            self._start_ready()
+
+    def set_limit(self, kind: str, limit: int) -> None:
+        if limit < 1:
+            raise ValueError("Concurrency limit must be at least 1.")
+        with self._lock:
+            self._limits[kind] = limit
+        self._start_ready()
+
+    def limit(self, kind: str) -> int:
+        return self._limits[kind]
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def active(self) -> List[Job]:
+        return [job for job in self.jobs() if not job.is_finished]
+
+    def clear_finished(self) -> List[Job]:
+        with self._lock:
+            finished = [job for job in self._jobs.values() if job.is_finished]
+            for job in finished:
+                del self._jobs[job.id]
+        return finished
+
+    def _start_ready(self) -> None:
+        with self._lock:
+            for kind in JOB_KINDS:
+                while self._pending[kind] and self._running[kind] < self._limits[kind]:
+                    job = self._pending[kind].popleft()
+                    self._running[kind] += 1
+                    job.state = "running"
+                    job.started_at = time.time()
+                    threading.Thread(target=self._run, args=(job,), name=f"job-{job.id}", daemon=True).start()
+
+    def _run(self, job: Job) -> None:
+        self._notify(job)
+        try:
+            job.func(job)
+            state = "done"
+        except CancelledError:
+            state = "cancelled"
+        except Exception as exc:
+            logger.exception("Job #%s (%s) failed: %s", job.id, job.title, exc)
+            job.error = exc
+            state = "failed"
+        with self._lock:
+            job.state = state
+            job.finished_at = time.time()
+            self._running[job.kind] -= 1
+            self._slot_freed.notify_all()
+        self._notify(job)
+        self._start_ready()
+
+    def _notify(self, job: Job) -> None:
+        if self._on_change is not None:
+            self._on_change(job)
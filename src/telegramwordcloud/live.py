@@ -0,0 +1,150 @@
+# live.py
+import time
+from collections import Counter, deque
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from PIL import Image
+from wordcloud import WordCloud
+
+# Seconds between checks of the cancel flag, window expiry and render deadline while idle.
+LIVE_TICK_SECONDS = 0.5
+LIVE_RENDER_INTERVAL = 10.0
+# Seconds between catch-up polls for posts Telegram did not push (e.g. channels not joined).
+LIVE_POLL_SECONDS = 30.0
+# Slots are reserved this much larger than a word's share at layout time, so words that keep
+# growing still fit and the layout can be reused for longer.
+LAYOUT_HEADROOM = 1.25
+# A new layout is searched once this many words outside the current layout would outrank the
+# smallest word on screen.
+RELAYOUT_NEW_WORDS = 10
+
+
+class LiveWordCounts:
+    """
+    Running word frequencies for a stream of messages.
+
+    Each message's tokens are added as they arrive. With ``window`` (seconds) set, a message's
+    counts are subtracted again once it is older than the window, so the table always describes
+    the last ``window`` seconds. Messages are expected roughly in time order.
+    """
+
+    def __init__(self, tokenize: Callable[[str], List[str]], window: Optional[float] = None):
+        self.tokenize = tokenize
+        self.window = window if window and window > 0 else None
+        self.counts: Counter = Counter()
+        self.messages = 0
+        self.tokens = 0
+        self.version = 0
+        self._recent: Deque[Tuple[float, Counter]] = deque()
+
+    def add(self, text: str, timestamp: Optional[float] = None) -> int:
+        """Count ``text`` (posted at ``timestamp``, default now); returns the number of tokens added."""
+        tokens = self.tokenize(text)
+        if not tokens:
+            return 0
+        batch = Counter(tokens)
+        self.counts.update(batch)
+        if self.window is not None:
+            self._recent.append((time.time() if timestamp is None else timestamp, batch))
+        self.messages += 1
+        self.tokens += len(tokens)
+        self.version += 1
+        return len(tokens)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop messages older than the window; returns how many were dropped."""
+        if self.window is None:
+            return 0
+        cutoff = (time.time() if now is None else now) - self.window
+        expired = 0
+        while self._recent and self._recent[0][0] < cutoff:
+            _, batch = self._recent.popleft()
+            self.counts.subtract(batch)
+            for word in batch:
+                if self.counts[word] <= 0:
+                    del self.counts[word]
+            self.messages -= 1
+            self.tokens -= sum(batch.values())
+            expired += 1
+        if expired:
+            self.version += 1
+        return expired
+
+    def top(self, n: int) -> Dict[str, int]:
+        return dict(self.counts.most_common(n))
+
+
+class LiveCloudRenderer:
+    """
+    Debounced preview renderer for ``LiveWordCounts``.
+
+    ``due`` allows at most one render per ``interval`` seconds, and only when the counts changed.
+    The placement search (the expensive part of a word cloud) runs only when the top words no
+    longer fit the current layout: otherwise the previous layout is redrawn with every word
+    scaled to its new share, as the time-slice animation does.
+    """
+
+    def __init__(self, core, stopwords: Set[str], *, interval: float = LIVE_RENDER_INTERVAL, max_words: int = 200):
+        self.core = core
+        self.stopwords = stopwords
+        self.interval = interval
+        self.max_words = max_words
+        self.font_path = core._resolve_font()
+        self.full_layouts = 0
+        self.reused_layouts = 0
+        self.last_seconds = 0.0
+        self._wc: Optional[WordCloud] = None
+        self._boxes: Dict[str, Tuple[int, int]] = {}
+        self._reference: Dict[str, float] = {}
+        self._rendered_version = -1
+        self._last_render = float("-inf")
+
+    def due(self, version: int, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        return version != self._rendered_version and now - self._last_render >= self.interval
+
+    def render(self, frequencies: Dict[str, int], version: int) -> Image.Image:
+        """Draw ``frequencies`` (the current top words), reusing the previous layout when they fit."""
+        started = time.perf_counter()
+        peak = max(frequencies.values())
+        shares = {word: count / peak for word, count in frequencies.items()}
+        if self._fits(shares):
+            wc = WordCloud(font_path=self._wc.font_path, width=self._wc.width, height=self._wc.height)
+            wc.layout_ = self.core._frame_layout(self._wc.layout_, self._boxes, self._reference, shares)
+            self.reused_layouts += 1
+        else:
+            self._reference = {word: share * LAYOUT_HEADROOM for word, share in shares.items()}
+            self._wc = wc = self.core.build_wordcloud(
+                self._reference, self.stopwords, max_words=self.max_words, font_path=self.font_path
+            )
+            self._boxes = self.core._layout_boxes(wc)
+            # Only words that were actually placed can be redrawn later.
+            placed = {word for (word, _), *_ in wc.layout_}
+            self._reference = {word: share for word, share in self._reference.items() if word in placed}
+            wc = WordCloud(font_path=self._wc.font_path, width=self._wc.width, height=self._wc.height)
+            wc.layout_ = self.core._frame_layout(self._wc.layout_, self._boxes, self._reference, shares)
+            self.full_layouts += 1
+        image = wc.to_image()
+        self._rendered_version = version
+        self._last_render = time.monotonic()
+        self.last_seconds = time.perf_counter() - started
+        return image
+
+    def _fits(self, shares: Dict[str, float]) -> bool:
+        # Words that outgrow their slot are drawn at the slot size until they exceed it by the
+        # headroom again; new words only count when they would be larger than the smallest word
+        # on screen, so churn in the long tail does not trigger a new placement search.
+        if self._wc is None:
+            return False
+        smallest = min(self._reference.values(), default=0.0)
+        new_words = 0
+        for word, share in shares.items():
+            slot = self._reference.get(word)
+            if slot is None:
+                if share >= smallest:
+                    new_words += 1
+                    if new_words >= RELAYOUT_NEW_WORDS:
+                        return False
+            elif share > slot * LAYOUT_HEADROOM:
+                return False
+        return True
@@ -0,0 +1,383 @@
+# service.py
+"""
+Headless HTTP mode: render word clouds on demand for dashboards and scripts.
+
+    GET  /cloud?channel=<name>&date_from=2024-01-01&date_to=2024-02-01      (Telethon, .env credentials)
+    POST /cloud?format=json&last_n=5000   body = Telegram export (CSV or result.json)
+    GET  /results/<id>.png  |  /results/<id>.json
+    GET  /health
+
+``/cloud`` answers with JSON (result id, PNG URL, word frequencies); ``/cloud.png`` returns the
+image directly. Render settings: ``width``, ``height``, ``max_words``, ``approx``, ``dedup`` and
+``tokenizer`` ("default", "unicode" or a Snowball stemming language such as "russian").
+"""
+import concurrent.futures
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from dateutil import parser as date_parser
+from wordcloud import WordCloud
+
+from .core import (
+    PROJECT_ROOT,
+    WORDCLOUD_HEIGHT,
+    WORDCLOUD_MAX_WORDS,
+    WORDCLOUD_WIDTH,
+    TGWCCore,
+    logger,
+)
+from .tokenizer import Tokenizer, build_tokenizer, tokenizer_modes
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+# Requests beyond workers * QUEUE_FACTOR waiting renders are refused with 503 instead of piling up.
+QUEUE_FACTOR = 4
+CACHE_MAX_ENTRIES = 128
+# Uploads are cached by content hash and never go stale; channel results are refetched after this.
+CHANNEL_CACHE_TTL = 300
+MAX_UPLOAD_BYTES = 200 * 1024 * 1024
+MAX_IMAGE_SIDE = 4000
+UPLOAD_FORMATS = ("csv", "json")
+STOPWORDS_PATH = PROJECT_ROOT / "stopwords.txt"
+
+_worker_core: Optional[TGWCCore] = None
+# One tokenizer per mode in each worker process, so stem caches stay warm across requests.
+_worker_tokenizers: Dict[str, Optional[Tokenizer]] = {}
+
+
+def _render_texts(texts: List[str], stopwords: Set[str], settings: Dict, font_path: Optional[str]) -> Tuple[bytes, Dict[str, int]]:
+    """Process-pool worker: count ``texts`` and render them; returns PNG bytes and the top frequencies."""
+    global _worker_core
+    if _worker_core is None:
+        _worker_core = TGWCCore()
+    mode = settings["tokenizer"]
+    if mode not in _worker_tokenizers:
+        _worker_tokenizers[mode] = build_tokenizer(mode, stopwords)
+    tokenizer = _worker_tokenizers[mode]
+    if settings["approx"]:
+        counts = _worker_core.count_words_approx(texts, stopwords, tokenizer=tokenizer)
+    else:
+        counts = _worker_core.count_words(texts, stopwords, tokenizer=tokenizer)
+    if not counts:
+        raise ValueError("Not enough text to build a word cloud.")
+    top = dict(sorted(counts.items(), key=lambda item: item[1], reverse=True)[:settings["max_words"]])
+    wc = WordCloud(font_path=font_path, width=settings["width"], height=settings["height"],
+                   max_words=settings["max_words"])
+    wc.generate_from_frequencies(top)
+    output = io.BytesIO()
+    wc.to_image().save(output, "PNG")
+    return output.getvalue(), top
+
+
+class CachedResult:
+    def __init__(self, result_id: str, png: bytes, frequencies: Dict[str, int], messages: int, expires: Optional[float]):
+        self.id = result_id
+        self.png = png
+        self.frequencies = frequencies
+        self.messages = messages
+        self.expires = expires
+
+    def is_fresh(self) -> bool:
+        return self.expires is None or time.monotonic() < self.expires
+
+
+class ServiceBusyError(Exception):
+    """Raised when the render queue is full."""
+
+
+class WordCloudService:
+    """
+    Renders clouds for HTTP requests through a bounded process pool and an LRU result cache.
+
+    Identical requests (same source bytes or channel, same scope and settings) are answered from
+    the cache; concurrent identical requests share one render instead of each starting their own.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, core: Optional[TGWCCore] = None):
+        self.core = core or TGWCCore()
+        self.workers = workers
+        self.stopwords = self.core.load_stopwords(str(STOPWORDS_PATH))
+        self.font_path = self.core._resolve_font()
+        self._pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        self._slots = threading.BoundedSemaphore(workers * QUEUE_FACTOR)
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, CachedResult]" = OrderedDict()
+        self._in_flight: Dict[str, concurrent.futures.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def start(self) -> None:
+        # Fork the workers now, before the server threads exist.
+        self._pool.submit(int).result()
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.core.close()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "status": "ok", "workers": self.workers, "cache_entries": len(self._cache),
+                "in_flight": len(self._in_flight), "hits": self.hits, "misses": self.misses,
+            }
+
+    def lookup(self, result_id: str) -> Optional[CachedResult]:
+        with self._lock:
+            result = self._cache.get(result_id)
+            return result if result is not None and result.is_fresh() else None
+
+    def render(self, query: Dict[str, str], body: Optional[bytes] = None) -> Tuple[CachedResult, bool]:
+        """Return ``(result, cached)`` for a request; raises ValueError for bad input."""
+        settings = self._parse_settings(query)
+        scope = self._parse_scope(query)
+        if body is not None:
+            fmt = query.get("format", "csv").lower()
+            if fmt not in UPLOAD_FORMATS:
+                raise ValueError(f"format must be one of {', '.join(UPLOAD_FORMATS)}.")
+            source = {"upload": hashlib.sha256(body).hexdigest(), "format": fmt}
+        else:
+            channel = query.get("channel", "").strip()
+            if not channel:
+                raise ValueError("Pass ?channel=<username> or POST an export file.")
+            source = {"channel": channel}
+        key_data = json.dumps({"source": source, "scope": scope, "settings": settings}, sort_keys=True)
+        result_id = hashlib.sha256(key_data.encode("utf-8")).hexdigest()[:24]
+
+        with self._lock:
+            cached = self._cache.get(result_id)
+            if cached is not None and cached.is_fresh():
+                self._cache.move_to_end(result_id)
+                self.hits += 1
+                return cached, True
+            future = self._in_flight.get(result_id)
+            owner = future is None
+            if owner:
+                future = concurrent.futures.Future()
+                self._in_flight[result_id] = future
+                self.misses += 1
+        if not owner:
+            return future.result(), True
+
+        try:
+            result = self._compute(result_id, source, scope, settings, body)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(result_id, None)
+        future.set_result(result)
+        return result, False
+
+    def _compute(self, result_id: str, source: Dict, scope: Dict, settings: Dict, body: Optional[bytes]) -> CachedResult:
+        if not self._slots.acquire(blocking=False):
+            raise ServiceBusyError("Too many renders queued; retry later.")
+        try:
+            started = time.perf_counter()
+            texts = self._load_texts(source, scope, settings, body)
+            png, frequencies = self._pool.submit(_render_texts, texts, self.stopwords, settings, self.font_path).result()
+        finally:
+            self._slots.release()
+        expires = time.monotonic() + CHANNEL_CACHE_TTL if "channel" in source else None
+        result = CachedResult(result_id, png, frequencies, len(texts), expires)
+        with self._lock:
+            self._cache[result_id] = result
+            while len(self._cache) > CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+        logger.info("Rendered %s from %s messages in %.2fs.", result_id, len(texts), time.perf_counter() - started)
+        return result
+
+    def _load_texts(self, source: Dict, scope: Dict, settings: Dict, body: Optional[bytes]) -> List[str]:
+        date_from, date_to, last_n = scope["date_from"], scope["date_to"], scope["last_n"]
+        if date_from:
+            date_from = date_parser.parse(date_from)
+        if date_to:
+            date_to = date_parser.parse(date_to)
+        if body is not None:
+            fd, path = tempfile.mkstemp(suffix=f".{source['format']}")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(body)
+                if source["format"] == "json":
+                    df = self.core.load_json_export(path, date_from=date_from, date_to=date_to)
+                else:
+                    df = self.core.load_csv(path, date_from=date_from, date_to=date_to)
+            finally:
+                os.remove(path)
+        else:
+            creds = self.core.read_env_credentials()
+            if not (creds.get("TELEGRAM_API_ID") and creds.get("TELEGRAM_API_HASH")):
+                raise ValueError("Channel requests need TELEGRAM_API_ID and TELEGRAM_API_HASH in .env.")
+            # Never log in from an HTTP request: that would text a login code to the phone each time.
+            df = self.core.download_channel(
+                int(creds["TELEGRAM_API_ID"]), creds["TELEGRAM_API_HASH"], creds.get("TELEGRAM_PHONE", ""),
+                source["channel"], None, date_from=date_from, date_to=date_to, last_n=last_n, authorize=False,
+            )
+        if last_n:
+            df = self.core.slice_by_date(df, last_n=last_n)
+        if settings["dedup"]:
+            df = self.core.deduplicate_messages(df)
+        texts = self.core.flatten_text_columns(df)
+        if not texts:
+            raise ValueError("No text messages were found to process.")
+        return texts
+
+    def _parse_settings(self, query: Dict[str, str]) -> Dict:
+        try:
+            settings = {
+                "width": int(query.get("width", WORDCLOUD_WIDTH)),
+                "height": int(query.get("height", WORDCLOUD_HEIGHT)),
+                "max_words": int(query.get("max_words", WORDCLOUD_MAX_WORDS)),
+            }
+        except ValueError as exc:
+            raise ValueError("width, height and max_words must be integers.") from exc
+        if not (0 < settings["width"] <= MAX_IMAGE_SIDE and 0 < settings["height"] <= MAX_IMAGE_SIDE):
+            raise ValueError(f"width and height must be between 1 and {MAX_IMAGE_SIDE}.")
+        if settings["max_words"] <= 0:
+            raise ValueError("max_words must be positive.")
+        settings["approx"] = _flag(query.get("approx"))
+        settings["dedup"] = _flag(query.get("dedup"))
+        settings["tokenizer"] = query.get("tokenizer") or "default"
+        if settings["tokenizer"] not in tokenizer_modes():
+            raise ValueError(f"tokenizer must be one of {', '.join(tokenizer_modes())}.")
+        return settings
+
+    def _parse_scope(self, query: Dict[str, str]) -> Dict:
+        scope = {"date_from": query.get("date_from") or None, "date_to": query.get("date_to") or None, "last_n": None}
+        for name in ("date_from", "date_to"):
+            if scope[name]:
+                try:
+                    scope[name] = date_parser.parse(scope[name]).isoformat()
+                except (ValueError, OverflowError) as exc:
+                    raise ValueError(f"Could not parse {name} '{scope[name]}'. Use YYYY-MM-DD format.") from exc
+        if query.get("last_n"):
+            try:
+                scope["last_n"] = int(query["last_n"])
+            except ValueError as exc:
+                raise ValueError("last_n must be an integer.") from exc
+        return scope
+
+
+def _flag(value: Optional[str]) -> bool:
+    return (value or "").lower() in ("1", "true", "yes", "on")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service: WordCloudService  # set by make_server
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/health":
+            self._send_json(200, self.service.stats())
+        elif url.path in ("/cloud", "/cloud.png"):
+            self._handle_cloud(url, None)
+        elif url.path.startswith("/results/"):
+            self._handle_result(url.path[len("/results/"):])
+        else:
+            self._send_json(404, {"error": "Not found."})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path not in ("/cloud", "/cloud.png"):
+            self._send_json(404, {"error": "Not found."})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self._send_json(400, {"error": "Content-Length must be a number of bytes."})
+            # The body's extent is unknown, so the connection cannot be reused.
+            self.close_connection = True
+            return
+        if length <= 0:
+            self._send_json(400, {"error": "POST the export file as the request body."})
+            return
+        if length > MAX_UPLOAD_BYTES:
+            self._send_json(413, {"error": f"Uploads are limited to {MAX_UPLOAD_BYTES // (1024 * 1024)} MB."})
+            self.close_connection = True
+            return
+        self._handle_cloud(url, self.rfile.read(length))
+
+    def _handle_cloud(self, url, body: Optional[bytes]):
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        started = time.perf_counter()
+        try:
+            result, cached = self.service.render(query, body)
+        except ServiceBusyError as exc:
+            self._send_json(503, {"error": str(exc)})
+            return
+        except (ValueError, FileNotFoundError) as exc:
+            self._send_json(400, {"error": str(exc)})
+            return
+        except Exception as exc:
+            logger.exception("Service request failed: %s", exc)
+            self._send_json(500, {"error": str(exc)})
+            return
+        if url.path == "/cloud.png":
+            self._send(200, "image/png", result.png, {"X-Cache": "hit" if cached else "miss"})
+            return
+        self._send_json(200, {
+            "id": result.id,
+            "cached": cached,
+            "seconds": round(time.perf_counter() - started, 4),
+            "messages": result.messages,
+            "png": f"/results/{result.id}.png",
+            "frequencies": result.frequencies,
+        })
+
+    def _handle_result(self, name: str):
+        result_id, _, ext = name.partition(".")
+        result = self.service.lookup(result_id)
+        if result is None or ext not in ("png", "json"):
+            self._send_json(404, {"error": "Unknown or expired result."})
+        elif ext == "png":
+            self._send(200, "image/png", result.png)
+        else:
+            self._send_json(200, {"id": result.id, "messages": result.messages, "frequencies": result.frequencies})
+
+    def _send_json(self, status: int, payload: Dict):
+        self._send(status, "application/json; charset=utf-8", json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+    def _send(self, status: int, content_type: str, data: bytes, headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def make_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = DEFAULT_WORKERS) -> ThreadingHTTPServer:
+    service = WordCloudService(workers=workers)
+    service.start()
+    handler = type("Handler", (_Handler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = DEFAULT_WORKERS) -> None:
+    server = make_server(host, port, workers)
+    logger.info("Serving word clouds on http://%s:%s (%s render workers).", host, port, workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.close()
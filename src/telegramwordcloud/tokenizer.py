@@ -0,0 +1,124 @@
+# tokenizer.py
+import re
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from nltk.stem.snowball import SnowballStemmer
+
+    snowball_available = True
+except ImportError:
+    snowball_available = False
+
+# A word starts with a letter (Latin, Cyrillic or any other script) and may continue with
+# letters/digits, joined by the apostrophes and hyphens used inside Russian and Ukrainian words
+# ("что-то", "м'ясо", "п’ять"). Pure numbers and stray punctuation never match.
+WORD_PATTERN = re.compile(r"[^\W\d_]\w*(?:['’ʼ-]\w+)*")
+APOSTROPHES = str.maketrans({"’": "'", "ʼ": "'"})
+STEM_CACHE_SIZE = 100_000
+# "default" keeps WordCloud's own tokenization (with collocations); "unicode" is this module
+# without stemming; any other mode names a Snowball stemming language.
+BASE_MODES = ("default", "unicode")
+
+
+def stem_languages() -> Tuple[str, ...]:
+    """Languages the Snowball stemmer supports here (empty without NLTK)."""
+    if not snowball_available:
+        return ()
+    return tuple(lang for lang in SnowballStemmer.languages if lang != "porter")
+
+
+def tokenizer_modes() -> Tuple[str, ...]:
+    return BASE_MODES + stem_languages()
+
+
+def build_tokenizer(mode: str, stopwords: Iterable[str]) -> Optional["Tokenizer"]:
+    """Tokenizer for a ``tokenizer_modes()`` entry, or None for WordCloud's default tokenization."""
+    if not mode or mode == "default":
+        return None
+    return Tokenizer(stopwords, language=None if mode == "unicode" else mode)
+
+
+class Tokenizer:
+    """
+    Language-aware replacement for WordCloud's English-oriented tokenization.
+
+    Text is NFKC-normalised and casefolded, split with ``WORD_PATTERN`` and filtered against
+    ``stopwords``. With ``language`` set, every token is reduced to its Snowball stem so the
+    inflected forms of one word are counted together. Stems go through an LRU cache of
+    ``cache_size`` entries; most tokens in a corpus repeat, so nearly every lookup is a hit.
+    Counts are keyed by the first surface form seen for each stem, which keeps the cloud readable.
+
+    One instance may be reused across counts (its cache stays warm); it is not thread-safe.
+    """
+
+    def __init__(self, stopwords: Iterable[str], language: Optional[str] = None, cache_size: int = STEM_CACHE_SIZE):
+        self.language = language
+        self.stopwords: Set[str] = {self.normalize(w) for w in stopwords}
+        self.tokens_seen = 0
+        self._forms: Dict[str, str] = {}
+        self._stem: Optional[Callable[[str], str]] = None
+        if language:
+            if not snowball_available:
+                raise ValueError("Stemming needs NLTK (pip install nltk).")
+            if language not in stem_languages():
+                raise ValueError(f"Snowball has no stemmer for '{language}'. Choose one of: {', '.join(stem_languages())}.")
+            self._stem = lru_cache(maxsize=cache_size)(SnowballStemmer(language).stem)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return unicodedata.normalize("NFKC", text).casefold().translate(APOSTROPHES)
+
+    def tokens(self, text: str) -> List[str]:
+        """Normalised tokens of ``text`` without stopwords (stems mapped to their display form when stemming)."""
+        words = [w for w in WORD_PATTERN.findall(self.normalize(text)) if w not in self.stopwords]
+        self.tokens_seen += len(words)
+        stem = self._stem
+        if stem is None:
+            return words
+        forms = self._forms
+        out = []
+        for word in words:
+            root = stem(word)
+            form = forms.get(root)
+            if form is None:
+                form = forms[root] = word
+            out.append(form)
+        return out
+
+    def count(self, texts: Iterable[str], check: Optional[Callable[[], None]] = None, check_every: int = 2_000) -> Dict[str, int]:
+        """Token counts over ``texts``; ``check`` is called every ``check_every`` texts and may raise to abort."""
+        counts: Counter = Counter()
+        for index, text in enumerate(texts):
+            if check is not None and index % check_every == 0:
+                check()
+            counts.update(self.tokens(text))
+        return dict(counts)
+
+    def stats(self) -> Dict[str, float]:
+        """Tokens seen and, when stemming, stem cache hits/misses and hit rate."""
+        stats: Dict[str, float] = {"tokens": self.tokens_seen}
+        if self._stem is not None:
+            info = self._stem.cache_info()
+            lookups = info.hits + info.misses
+            stats.update(
+                stem_hits=info.hits,
+                stem_misses=info.misses,
+                stem_hit_rate=info.hits / lookups if lookups else 0.0,
+                stem_cache_size=info.currsize,
+                stems=len(self._forms),
+            )
+        return stats
+
+    def describe(self) -> str:
+        """One-line summary of ``stats()`` for the log."""
+        stats = self.stats()
+        line = f"Tokenizer ({self.language or 'no'} stemming): {stats['tokens']:,} tokens"
+        if "stem_hit_rate" in stats:
+            line += (
+                f", {stats['stems']:,} stems, stem cache hit rate {stats['stem_hit_rate']:.1%}"
+                f" ({stats['stem_hits']:,} hits / {stats['stem_misses']:,} misses)"
+            )
+        return line
@@ -2,7 +2,9 @@
 import asyncio
 import io
 import os
+import sqlite3
 import threading
+import time
 import queue
 import tkinter as tk
 from pathlib import Path
@@ -12,8 +14,18 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 
 from dateutil import parser as date_parser
-
-from .core import TGWCCore, logger
+from PIL import Image, ImageTk
+
+from .core import (
+    GROUP_COLUMNS, TIME_BUCKETS, TOP_GROUPS, WORDCLOUD_HEIGHT, WORDCLOUD_MAX_WORDS, WORDCLOUD_WIDTH,
+    CancelledError, TGWCCore, logger,
+)
+from .distinctive import SCORING_METHODS
+from .encoding import DEFAULT_IMAGE_FORMATS, DEFAULT_JPEG_QUALITY, IMAGE_FORMATS
+from .history import IMAGE_SUFFIXES, THUMBNAIL_SIZE
+from .jobs import JobQueue
+from .live import LIVE_RENDER_INTERVAL
+from .tokenizer import build_tokenizer, tokenizer_modes
 
 try:
     import win32clipboard
@@ -30,9 +42,6 @@ STOPWORDS_PATH = PROJECT_ROOT / "stopwords.txt"
 THEME_PATH = PROJECT_ROOT / "themes" / "forest-light" / "forest-light.tcl"
 
 
-class CancelledError(Exception):
-    """Raised when the user cancels a running job."""
-
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -47,12 +56,19 @@ class App(tk.Tk):
         self.core = TGWCCore()
         self.log_queue = queue.Queue()
         self.last_wordcloud_image = None
-        self.cancel_event = threading.Event()
-        self.current_thread = None
+        self.history_window = None
+        self._live_job = None
+        self._history_thumbs = {}
+        self._thumbs_pending = set()
+        self._thumbs_after = None
+        self.jobs = JobQueue(on_change=self._on_job_change, log=self._log)
+        self._progress_running = False
         self._build_styles()
         self._build_layout()
         self._load_env()
+        self._load_font_index()
         self._pump_log_queue()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
     # ---------- UI Structure ----------
     def _build_styles(self):
@@ -93,6 +109,8 @@ class App(tk.Tk):
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         self._build_preview_menu()
 
+        self._build_jobs_panel(right)
+
         # Console
         console_group = ttk.LabelFrame(right, text="Log")
         console_group.pack(side=tk.TOP, fill=tk.BOTH, expand=False, pady=(8, 0))
@@ -115,9 +133,34 @@ class App(tk.Tk):
         self.run_button.pack(side=tk.LEFT)
         ttk.Button(cmd, text="Help", command=self.on_help).pack(side=tk.LEFT, padx=(8, 0))
         ttk.Button(cmd, text="Edit stopwords", command=self.on_edit_stopwords).pack(side=tk.LEFT, padx=(8, 0))
-        self.cancel_button = ttk.Button(cmd, text="Cancel", command=self.on_cancel, state="disabled")
+        ttk.Button(cmd, text="History", command=self.on_history).pack(side=tk.LEFT, padx=(8, 0))
+        self.cancel_button = ttk.Button(cmd, text="Cancel job", command=self.on_cancel, state="disabled")
         self.cancel_button.pack(side=tk.LEFT, padx=(8, 0))
 
+    def _build_jobs_panel(self, parent):
+        jobs_group = ttk.LabelFrame(parent, text="Jobs")
+        jobs_group.pack(side=tk.TOP, fill=tk.X, pady=(8, 0))
+        limits = ttk.Frame(jobs_group)
+        limits.pack(fill=tk.X, padx=6, pady=(4, 0))
+        # Downloads and renders are limited separately so a long download never blocks a render.
+        self.io_limit = tk.IntVar(value=self.jobs.limit("io"))
+        self.cpu_limit = tk.IntVar(value=self.jobs.limit("cpu"))
+        ttk.Label(limits, text="Downloads at once:").pack(side=tk.LEFT)
+        ttk.Spinbox(limits, from_=1, to=8, width=3, textvariable=self.io_limit,
+                    command=self._apply_job_limits).pack(side=tk.LEFT, padx=(4, 12))
+        ttk.Label(limits, text="Renders at once:").pack(side=tk.LEFT)
+        ttk.Spinbox(limits, from_=1, to=max(os.cpu_count() or 1, 1), width=3, textvariable=self.cpu_limit,
+                    command=self._apply_job_limits).pack(side=tk.LEFT, padx=(4, 12))
+        ttk.Button(limits, text="Clear finished", command=self.on_clear_finished_jobs).pack(side=tk.RIGHT)
+
+        self.jobs_view = ttk.Treeview(jobs_group, columns=("job", "status", "progress", "step"),
+                                      show="headings", height=4, selectmode="extended")
+        for column, heading, width in (("job", "Job", 200), ("status", "Status", 80),
+                                       ("progress", "Progress", 110), ("step", "Last step", 260)):
+            self.jobs_view.heading(column, text=heading)
+            self.jobs_view.column(column, width=width, stretch=column == "step")
+        self.jobs_view.pack(fill=tk.X, padx=6, pady=6)
+
     def _build_csv_tab(self):
         tab = ttk.Frame(self.nb, padding=8)
         self.nb.add(tab, text="CSV/JSON")
@@ -128,6 +171,8 @@ class App(tk.Tk):
         frm.pack(fill=tk.X)
         self.csv_path = tk.StringVar()
         self.json_path = tk.StringVar()
+        self.dir_path = tk.StringVar()
+        self.freq_path = tk.StringVar()
         self.csv_mode = tk.StringVar(value="csv")
 
         mode_row = ttk.Frame(frm)
@@ -139,6 +184,12 @@ class App(tk.Tk):
         ttk.Radiobutton(
             mode_row, text="Telegram JSON (result.json)", value="json", variable=self.csv_mode, command=self._update_csv_inputs
         ).pack(side=tk.LEFT, padx=(6, 0))
+        ttk.Radiobutton(
+            mode_row, text="Folder / glob", value="dir", variable=self.csv_mode, command=self._update_csv_inputs
+        ).pack(side=tk.LEFT, padx=(6, 0))
+        ttk.Radiobutton(
+            mode_row, text="Frequency table", value="freq", variable=self.csv_mode, command=self._update_csv_inputs
+        ).pack(side=tk.LEFT, padx=(6, 0))
 
         row_csv = ttk.Frame(frm)
         row_csv.pack(fill=tk.X, padx=6, pady=(6, 3))
@@ -156,6 +207,27 @@ class App(tk.Tk):
         self.json_browse = ttk.Button(row_json, text="Browse", command=self._pick_json, state="disabled")
         self.json_browse.pack(side=tk.LEFT)
 
+        row_dir = ttk.Frame(frm)
+        row_dir.pack(fill=tk.X, padx=6, pady=(0, 6))
+        ttk.Label(row_dir, text="Folder or glob:").pack(side=tk.LEFT)
+        self.dir_entry = ttk.Entry(row_dir, textvariable=self.dir_path, width=50, state="disabled")
+        self.dir_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=6)
+        self.dir_browse = ttk.Button(row_dir, text="Browse", command=self._pick_dir, state="disabled")
+        self.dir_browse.pack(side=tk.LEFT)
+
+        row_freq = ttk.Frame(frm)
+        row_freq.pack(fill=tk.X, padx=6, pady=(0, 6))
+        ttk.Label(row_freq, text="Frequency table:").pack(side=tk.LEFT)
+        self.freq_entry = ttk.Entry(row_freq, textvariable=self.freq_path, width=50, state="disabled")
+        self.freq_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=6)
+        self.freq_browse = ttk.Button(row_freq, text="Browse", command=self._pick_freq, state="disabled")
+        self.freq_browse.pack(side=tk.LEFT)
+        self.restyle_width = tk.IntVar(value=WORDCLOUD_WIDTH)
+        self.restyle_height = tk.IntVar(value=WORDCLOUD_HEIGHT)
+        self.restyle_max_words = tk.IntVar(value=WORDCLOUD_MAX_WORDS)
+        self.restyle_colormap = tk.StringVar(value="default")
+        self._build_restyle_row(frm)
+
         out = ttk.LabelFrame(tab, text="Output")
         out.pack(fill=tk.X, pady=(8, 0))
         self.out_dir = tk.StringVar(value=os.getcwd())
@@ -163,12 +235,169 @@ class App(tk.Tk):
         ttk.Label(row, text="Save images/messages to:").pack(side=tk.LEFT)
         ttk.Entry(row, textvariable=self.out_dir, width=50).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=6)
         ttk.Button(row, text="Browse", command=self._pick_out_dir).pack(side=tk.LEFT)
+        self.font_choice = tk.StringVar(value="auto")
+        self._font_paths = {}
+        self._font_boxes = []
+        self.font_choice.trace_add("write", self._on_font_change)
+        self._build_font_row(out)
 
         opts = ttk.LabelFrame(tab, text="Processing options")
         opts.pack(fill=tk.X, pady=(8, 0))
         self.save_image = tk.BooleanVar(value=True)
         ttk.Checkbutton(opts, text="Save wordcloud image", variable=self.save_image).pack(anchor="w", padx=6, pady=6)
+        self.image_formats = {fmt: tk.BooleanVar(value=fmt in DEFAULT_IMAGE_FORMATS) for fmt in IMAGE_FORMATS}
+        self.jpeg_quality = tk.IntVar(value=DEFAULT_JPEG_QUALITY)
+        self.double_size = tk.BooleanVar(value=False)
+        self._build_image_format_row(opts)
+        self.approx_counts = tk.BooleanVar(value=False)
+        ttk.Checkbutton(opts, text="Approximate counting (fixed memory, for very large corpora)",
+                        variable=self.approx_counts).pack(anchor="w", padx=6, pady=(0, 6))
+        self.dedup = tk.BooleanVar(value=False)
+        self.near_dup = tk.BooleanVar(value=False)
+        self._build_dedup_row(opts)
+        self.time_bucket = tk.StringVar(value="none")
+        self.animate = tk.BooleanVar(value=False)
+        self._build_time_bucket_row(opts)
+        self.tokenizer_mode = tk.StringVar(value="default")
+        self._build_tokenizer_row(opts)
+        self.group_by = tk.StringVar(value="none")
+        self.group_top = tk.IntVar(value=TOP_GROUPS)
+        self.group_weight = tk.StringVar(value="frequency")
+        self._build_group_row(opts)
+        self.per_file = tk.BooleanVar(value=False)
+        self.per_file_check = ttk.Checkbutton(opts, text="Also save one cloud per file (folder / glob source)",
+                                              variable=self.per_file, state="disabled")
+        self.per_file_check.pack(anchor="w", padx=6, pady=(0, 6))
+        self.entity_clouds = tk.BooleanVar(value=False)
+        self.entity_check = ttk.Checkbutton(opts, text="Also save hashtag, mention and link-domain clouds (JSON exports)",
+                                            variable=self.entity_clouds, state="disabled")
+        self.entity_check.pack(anchor="w", padx=6, pady=(0, 6))
+
+        self.download_mode = tk.StringVar(value="all")
+        self.date_from = tk.StringVar()
+        self.date_to = tk.StringVar()
+        self.last_n = tk.StringVar()
+        self.date_frames = []
+        self.last_frames = []
+        self._build_scope_frame(tab, "Message scope")
         self._update_csv_inputs()
+        self._update_date_widgets()
+
+    def _build_restyle_row(self, parent):
+        # Only a frequency table is re-rendered with these; the other sources keep the default size.
+        row = ttk.Frame(parent)
+        row.pack(fill=tk.X, padx=6, pady=(0, 6))
+        ttk.Label(row, text="Re-render at").pack(side=tk.LEFT)
+        self.restyle_widgets = []
+        for label, var, top in (
+            ("width", self.restyle_width, 8000),
+            ("height", self.restyle_height, 8000),
+            ("max words", self.restyle_max_words, 5000),
+        ):
+            ttk.Label(row, text=label).pack(side=tk.LEFT, padx=(6, 0))
+            spin = ttk.Spinbox(row, from_=1, to=top, textvariable=var, width=6)
+            spin.pack(side=tk.LEFT, padx=(4, 0))
+            self.restyle_widgets.append(spin)
+        ttk.Label(row, text="colormap").pack(side=tk.LEFT, padx=(6, 0))
+        # Any Matplotlib colormap name can be typed in; "default" keeps WordCloud's own.
+        box = ttk.Combobox(row, textvariable=self.restyle_colormap, width=10,
+                           values=("default", "viridis", "plasma", "inferno", "magma", "cividis", "Set2", "Dark2", "tab10"))
+        box.pack(side=tk.LEFT, padx=(4, 0))
+        self.restyle_widgets.append(box)
+
+    def _build_font_row(self, parent):
+        row = ttk.Frame(parent)
+        row.pack(fill=tk.X, padx=6, pady=(0, 6))
+        ttk.Label(row, text="Font:").pack(side=tk.LEFT)
+        # Filled once the font index is loaded; "auto" picks a font covering each cloud's words.
+        box = ttk.Combobox(row, textvariable=self.font_choice, values=("auto",), state="readonly", width=40)
+        box.pack(side=tk.LEFT, padx=6)
+        self._font_boxes.append(box)
+        ttk.Button(row, text="Browse", command=self._pick_font).pack(side=tk.LEFT)
+
+    def _build_image_format_row(self, parent):
+        row = ttk.Frame(parent)
+        row.pack(fill=tk.X, padx=6, pady=(0, 6))
+        ttk.Label(row, text="Save as:").pack(side=tk.LEFT)
+        for fmt, var in self.image_formats.items():
+            ttk.Checkbutton(row, text=fmt.upper(), variable=var).pack(side=tk.LEFT, padx=(6, 0))
+            if fmt == "jpeg":
+                ttk.Label(row, text="quality").pack(side=tk.LEFT, padx=(2, 0))
+                ttk.Spinbox(row, from_=1, to=100, textvariable=self.jpeg_quality, width=4).pack(side=tk.LEFT, padx=(4, 0))
+        ttk.Checkbutton(row, text="Also at 2x size", variable=self.double_size).pack(side=tk.LEFT, padx=(8, 0))
+
+    def _build_dedup_row(self, parent):
+        row = ttk.Frame(parent)
+        row.pack(fill=tk.X, padx=6, pady=(0, 6))
+        ttk.Checkbutton(row, text="Drop duplicate/reposted messages", variable=self.dedup).pack(side=tk.LEFT)
+        ttk.Checkbutton(row, text="Include near-duplicates", variable=self.near_dup).pack(side=tk.LEFT, padx=(8, 0))
+
+    def _build_time_bucket_row(self, parent):
+        row = ttk.Frame(parent)
+        row.pack(fill=tk.X, padx=6, pady=(0, 6))
+        ttk.Label(row, text="One cloud per:").pack(side=tk.LEFT)
+        ttk.Combobox(row, textvariable=self.time_bucket, values=("none", "week", "month"),
+                     state="readonly", width=8).pack(side=tk.LEFT, padx=(6, 0))
+        ttk.Checkbutton(row, text="Animate as GIF", variable=self.animate).pack(side=tk.LEFT, padx=(8, 0))
+
+    def _build_tokenizer_row(self, parent):
+        row = ttk.Frame(parent)
+        row.pack(fill=tk.X, padx=6, pady=(0, 6))
+        ttk.Label(row, text="Tokenization:").pack(side=tk.LEFT)
+        ttk.Combobox(row, textvariable=self.tokenizer_mode, values=tokenizer_modes(),
+                     state="readonly", width=12).pack(side=tk.LEFT, padx=(6, 0))
+        ttk.Label(row, text="(unicode: casefolded, Cyrillic-aware words; a language adds Snowball stemming)",
+                  foreground="#555").pack(side=tk.LEFT, padx=(8, 0))
+
+    def _build_group_row(self, parent):
+        row = ttk.Frame(parent)
+        row.pack(fill=tk.X, padx=6, pady=(0, 6))
+        ttk.Label(row, text="Also one cloud per:").pack(side=tk.LEFT)
+        # Editable: any column of the loaded data can be typed in.
+        ttk.Combobox(row, textvariable=self.group_by, values=("none", *GROUP_COLUMNS, *TIME_BUCKETS),
+                     width=12).pack(side=tk.LEFT, padx=(6, 0))
+        ttk.Label(row, text="for the top").pack(side=tk.LEFT, padx=(8, 0))
+        ttk.Spinbox(row, from_=1, to=1000, textvariable=self.group_top, width=5).pack(side=tk.LEFT, padx=(6, 0))
+        ttk.Label(row, text="groups, weighted by").pack(side=tk.LEFT, padx=(6, 0))
+        # tfidf/logodds score each group's words against all the other groups (distinctive terms).
+        ttk.Combobox(row, textvariable=self.group_weight, values=("frequency", *SCORING_METHODS),
+                     state="readonly", width=10).pack(side=tk.LEFT, padx=(6, 0))
+
+    def _build_live_row(self, parent):
+        row = ttk.Frame(parent)
+        row.pack(fill=tk.X, padx=6, pady=(0, 6))
+        ttk.Checkbutton(row, text="Live mode: keep following new posts, refresh every", variable=self.live).pack(side=tk.LEFT)
+        ttk.Spinbox(row, from_=1, to=3600, textvariable=self.live_interval, width=5).pack(side=tk.LEFT, padx=(6, 0))
+        ttk.Label(row, text="s, counting the last").pack(side=tk.LEFT, padx=(6, 0))
+        ttk.Spinbox(row, from_=0, to=10080, textvariable=self.live_window, width=6).pack(side=tk.LEFT, padx=(6, 0))
+        ttk.Label(row, text="min (0 = everything since start)").pack(side=tk.LEFT, padx=(6, 0))
+
+    def _build_scope_frame(self, tab, title):
+        # Both tabs share the same scope variables so switching source keeps the selection.
+        range_frame = ttk.LabelFrame(tab, text=title)
+        range_frame.pack(fill=tk.X, pady=(8, 0))
+        modes = ttk.Frame(range_frame)
+        modes.pack(fill=tk.X, padx=6, pady=4)
+        ttk.Radiobutton(modes, text="All posts", variable=self.download_mode, value="all",
+                        command=self._update_date_widgets).pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Radiobutton(modes, text="Date range", variable=self.download_mode, value="range",
+                        command=self._update_date_widgets).pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Radiobutton(modes, text="Last N posts", variable=self.download_mode, value="last",
+                        command=self._update_date_widgets).pack(side=tk.LEFT)
+
+        date_frame = ttk.Frame(range_frame)
+        date_frame.pack(fill=tk.X, padx=6, pady=(4, 0))
+        ttk.Label(date_frame, text="From (YYYY-MM-DD):").grid(row=0, column=0, sticky="w")
+        ttk.Entry(date_frame, textvariable=self.date_from, width=18).grid(row=0, column=1, padx=4, pady=2, sticky="w")
+        ttk.Label(date_frame, text="To (YYYY-MM-DD):").grid(row=0, column=2, sticky="w")
+        ttk.Entry(date_frame, textvariable=self.date_to, width=18).grid(row=0, column=3, padx=4, pady=2, sticky="w")
+        self.date_frames.append(date_frame)
+
+        last_frame = ttk.Frame(range_frame)
+        last_frame.pack(fill=tk.X, padx=6, pady=(4, 6))
+        ttk.Label(last_frame, text="Last N posts:").grid(row=0, column=0, sticky="w")
+        ttk.Entry(last_frame, textvariable=self.last_n, width=10).grid(row=0, column=1, padx=4, pady=2, sticky="w")
+        self.last_frames.append(last_frame)
 
     def _build_telethon_tab(self):
         tab = ttk.Frame(self.nb, padding=8)
@@ -193,6 +422,11 @@ class App(tk.Tk):
         ttk.Label(r, text="Phone (+countrycode):").pack(side=tk.LEFT, padx=(0, 6))
         ttk.Entry(r, textvariable=self.phone, width=24).pack(side=tk.LEFT)
 
+        r = ttk.Frame(creds); r.pack(fill=tk.X, padx=6, pady=4)
+        ttk.Button(r, text="Check authentication", command=self.on_check_auth).pack(side=tk.LEFT)
+        self.auth_status = ttk.Label(r, text="Session status unknown", foreground="#666")
+        self.auth_status.pack(side=tk.LEFT, padx=(8, 0))
+
         chan = ttk.LabelFrame(tab, text="Channel & Output")
         chan.pack(fill=tk.X, pady=(8, 0))
         self.channel = tk.StringVar()
@@ -204,6 +438,7 @@ class App(tk.Tk):
         ttk.Label(r, text="Save images/messages to:").pack(side=tk.LEFT)
         ttk.Entry(r, textvariable=self.out_dir, width=50).pack(side=tk.LEFT, padx=6, fill=tk.X, expand=True)
         ttk.Button(r, text="Browse", command=self._pick_out_dir).pack(side=tk.LEFT)
+        self._build_font_row(chan)
 
         opts = ttk.LabelFrame(tab, text="Processing options")
         opts.pack(fill=tk.X, pady=(8, 0))
@@ -211,34 +446,20 @@ class App(tk.Tk):
         ttk.Checkbutton(opts, text="Download channel messages only (skip wordcloud)",
                         variable=self.download_only).pack(anchor="w", padx=6, pady=6)
         ttk.Checkbutton(opts, text="Save wordcloud image", variable=self.save_image).pack(anchor="w", padx=6, pady=(0,6))
-
-        range_frame = ttk.LabelFrame(tab, text="Download scope")
-        range_frame.pack(fill=tk.X, pady=(8, 0))
-        self.download_mode = tk.StringVar(value="all")
-        modes = ttk.Frame(range_frame)
-        modes.pack(fill=tk.X, padx=6, pady=4)
-        ttk.Radiobutton(modes, text="All posts", variable=self.download_mode, value="all",
-                        command=self._update_date_widgets).pack(side=tk.LEFT, padx=(0, 8))
-        ttk.Radiobutton(modes, text="Date range", variable=self.download_mode, value="range",
-                        command=self._update_date_widgets).pack(side=tk.LEFT, padx=(0, 8))
-        ttk.Radiobutton(modes, text="Last N posts", variable=self.download_mode, value="last",
-                        command=self._update_date_widgets).pack(side=tk.LEFT)
-
-        self.date_frame = ttk.Frame(range_frame)
-        self.date_frame.pack(fill=tk.X, padx=6, pady=(4, 0))
-        ttk.Label(self.date_frame, text="From (YYYY-MM-DD):").grid(row=0, column=0, sticky="w")
-        self.date_from = tk.StringVar()
-        ttk.Entry(self.date_frame, textvariable=self.date_from, width=18).grid(row=0, column=1, padx=4, pady=2, sticky="w")
-        ttk.Label(self.date_frame, text="To (YYYY-MM-DD):").grid(row=0, column=2, sticky="w")
-        self.date_to = tk.StringVar()
-        ttk.Entry(self.date_frame, textvariable=self.date_to, width=18).grid(row=0, column=3, padx=4, pady=2, sticky="w")
-
-        self.last_frame = ttk.Frame(range_frame)
-        self.last_frame.pack(fill=tk.X, padx=6, pady=(4, 6))
-        ttk.Label(self.last_frame, text="Last N posts:").grid(row=0, column=0, sticky="w")
-        self.last_n = tk.StringVar()
-        ttk.Entry(self.last_frame, textvariable=self.last_n, width=10).grid(row=0, column=1, padx=4, pady=2, sticky="w")
-
+        self._build_image_format_row(opts)
+        ttk.Checkbutton(opts, text="Approximate counting (fixed memory, for very large corpora)",
+                        variable=self.approx_counts).pack(anchor="w", padx=6, pady=(0, 6))
+        self._build_dedup_row(opts)
+        self._build_time_bucket_row(opts)
+        self.bulk_export = tk.BooleanVar(value=False)
+        ttk.Checkbutton(opts, text="Bulk export (takeout session, faster for large archives)",
+                        variable=self.bulk_export).pack(anchor="w", padx=6, pady=(0,6))
+        self.live = tk.BooleanVar(value=False)
+        self.live_interval = tk.IntVar(value=int(LIVE_RENDER_INTERVAL))
+        self.live_window = tk.IntVar(value=0)
+        self._build_live_row(opts)
+
+        self._build_scope_frame(tab, "Download scope")
         self._update_date_widgets()
 
         ttk.Label(tab, text="Note: Telethon required; get API ID/hash at my.telegram.org").pack(anchor="w", padx=6, pady=(8,0))
@@ -274,6 +495,19 @@ class App(tk.Tk):
         if path:
             self.json_path.set(path)
 
+    def _pick_freq(self):
+        path = filedialog.askopenfilename(
+            title="Select a saved frequency table",
+            filetypes=(("Frequency tables", "*.wcf *.csv *.json"), ("All files", "*.*")),
+        )
+        if path:
+            self.freq_path.set(path)
+
+    def _pick_dir(self):
+        path = filedialog.askdirectory(title="Select a folder of Telegram exports (CSV/JSON)")
+        if path:
+            self.dir_path.set(path)
+
     def copy_preview_to_clipboard(self):
         if not self.last_wordcloud_image:
             messagebox.showinfo("TelegramWordCloud", "Generate a word cloud first.")
@@ -320,13 +554,47 @@ class App(tk.Tk):
             messagebox.showerror("TelegramWordCloud", f"Unable to save image: {exc}")
 
     def _update_csv_inputs(self):
-        json_mode = self.csv_mode.get() == "json"
-        csv_state = "disabled" if json_mode else "normal"
-        json_state = "normal" if json_mode else "disabled"
-        self.csv_entry.configure(state=csv_state)
-        self.csv_browse.configure(state=csv_state)
-        self.json_entry.configure(state=json_state)
-        self.json_browse.configure(state=json_state)
+        mode = self.csv_mode.get()
+        for widgets, active in (
+            ((self.csv_entry, self.csv_browse), mode == "csv"),
+            ((self.json_entry, self.json_browse), mode == "json"),
+            ((self.dir_entry, self.dir_browse, self.per_file_check), mode == "dir"),
+            ((self.freq_entry, self.freq_browse, *self.restyle_widgets), mode == "freq"),
+            ((self.entity_check,), mode in ("json", "dir")),
+        ):
+            for widget in widgets:
+                widget.configure(state="normal" if active else "disabled")
+
+    def _load_font_index(self):
+        # A cold index opens every installed font, which can take seconds; never on the Tk thread.
+        def load():
+            try:
+                choices = self.core.font_index().choices()
+            except Exception as exc:
+                logger.warning("Unable to index fonts: %s", exc)
+                return
+            self.after(0, self._fill_font_choices, choices)
+
+        threading.Thread(target=load, name="font-index", daemon=True).start()
+
+    def _fill_font_choices(self, choices):
+        self._font_paths = dict(choices)
+        for box in self._font_boxes:
+            box.configure(values=("auto", *self._font_paths))
+
+    def _pick_font(self):
+        path = filedialog.askopenfilename(
+            title="Select a font",
+            filetypes=(("Fonts", "*.ttf *.otf *.ttc"), ("All files", "*.*")),
+        )
+        if path:
+            self.font_choice.set(path)
+
+    def _on_font_change(self, *_):
+        choice = self.font_choice.get()
+        self.core.font_path = None if choice == "auto" else self._font_paths.get(choice, choice)
+        if self.core.font_path:
+            self._log(f"Font: {self.core.font_path}")
 
     def _pick_out_dir(self):
         d = filedialog.askdirectory(title="Select output directory", initialdir=self.out_dir.get())
@@ -336,20 +604,42 @@ class App(tk.Tk):
     def _update_date_widgets(self):
         mode = self.download_mode.get()
         state_range = "normal" if mode == "range" else "disabled"
-        for child in self.date_frame.winfo_children():
-            child.configure(state=state_range)
+        for frame in self.date_frames:
+            for child in frame.winfo_children():
+                child.configure(state=state_range)
 
         state_last = "normal" if mode == "last" else "disabled"
-        for child in self.last_frame.winfo_children():
-            child.configure(state=state_last)
+        for frame in self.last_frames:
+            for child in frame.winfo_children():
+                child.configure(state=state_last)
 
     def on_cancel(self):
-        if not self.current_thread or not self.current_thread.is_alive():
-            return
-        self.cancel_event.set()
-        self.cancel_button.config(state="disabled")
-        self._set_status("Cancelling...")
-        self._log("Cancellation requested...")
+        # Cancel the selected jobs, or every unfinished job when nothing is selected.
+        selected = [int(item) for item in self.jobs_view.selection()]
+        targets = selected or [job.id for job in self.jobs.active()]
+        for job_id in targets:
+            if self.jobs.cancel(job_id):
+                self._log(f"[#{job_id}] Cancellation requested...")
+
+    def on_clear_finished_jobs(self):
+        for job in self.jobs.clear_finished():
+            if self.jobs_view.exists(str(job.id)):
+                self.jobs_view.delete(str(job.id))
+
+    def _apply_job_limits(self):
+        try:
+            self.jobs.set_limit("io", int(self.io_limit.get()))
+            self.jobs.set_limit("cpu", int(self.cpu_limit.get()))
+        except (ValueError, tk.TclError):
+            pass
+
+    def _spin_value(self, var, default):
+        # Spinboxes accept free typing; fall back to ``default`` for anything that is not a positive number.
+        try:
+            value = int(var.get())
+        except (ValueError, tk.TclError):
+            return default
+        return value if value > 0 else default
 
     def _load_env(self):
         creds = self.core.read_env_credentials()
@@ -377,6 +667,17 @@ class App(tk.Tk):
         self._log("Credentials saved to .env.")
         messagebox.showinfo("TelegramWordCloud", "Credentials saved to .env.")
 
+    def on_check_auth(self):
+        self._run_background(("auth", self.api_id.get().strip(), self.api_hash.get().strip()))
+
+    def on_close(self):
+        self.jobs.cancel_all()
+        try:
+            self.core.close()
+        except Exception as exc:
+            logger.warning("Error while closing Telethon session: %s", exc)
+        self.destroy()
+
     def on_help(self):
         txt = "help.txt could not be found."
         try:
@@ -406,6 +707,149 @@ class App(tk.Tk):
 
         ttk.Button(editor, text="Save", command=save).pack(pady=6)
 
+    def on_history(self):
+        if self.history_window is not None and self.history_window.winfo_exists():
+            self.history_window.lift()
+            return
+        win = tk.Toplevel(self)
+        win.title("Run history")
+        win.geometry("860x520")
+        self.style.configure("History.Treeview", rowheight=THUMBNAIL_SIZE[1] + 6)
+        columns = ("created", "source", "scope", "seconds", "messages")
+        frame = ttk.Frame(win, padding=8)
+        frame.pack(fill=tk.BOTH, expand=True)
+        tree = ttk.Treeview(frame, columns=columns, style="History.Treeview", selectmode="browse")
+        tree.heading("#0", text="Cloud")
+        tree.column("#0", width=THUMBNAIL_SIZE[0] + 24, stretch=False)
+        for col, text, width in zip(columns, ("Date", "Source", "Scope", "Time (s)", "Messages"), (140, 180, 160, 70, 80)):
+            tree.heading(col, text=text)
+            tree.column(col, width=width, anchor="w")
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+
+        def on_scroll(first, last):
+            # Thumbnails are only made for the rows scrolled into view.
+            scrollbar.set(first, last)
+            self._schedule_thumbnails()
+
+        tree.configure(yscrollcommand=on_scroll)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        tree.bind("<Double-1>", lambda _: self._open_run())
+        tree.bind("<Configure>", lambda _: self._schedule_thumbnails())
+
+        buttons = ttk.Frame(win, padding=(8, 0, 8, 8))
+        buttons.pack(fill=tk.X)
+        ttk.Button(buttons, text="Open", command=self._open_run).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="Forget", command=self._forget_run).pack(side=tk.LEFT, padx=(8, 0))
+        ttk.Button(buttons, text="Import earlier exports", command=self._import_runs).pack(side=tk.LEFT, padx=(8, 0))
+
+        self.history_window, self.history_view = win, tree
+        self._history_thumbs = {}
+        self._thumbs_pending = set()
+        self._refresh_history()
+
+    def _refresh_history(self):
+        if self.history_window is None or not self.history_window.winfo_exists():
+            return
+        tree = self.history_view
+        tree.delete(*tree.get_children())
+        for run in self.core.run_history().runs():
+            seconds = f"{run['seconds']:.1f}" if run["seconds"] is not None else ""
+            values = (run["created"].replace("T", " "), run["source"], run["scope"] or "", seconds, run["messages"] or "")
+            iid = str(run["id"])
+            photo = self._history_thumbs.get(iid)
+            tree.insert("", "end", iid=iid, values=values, **({"image": photo} if photo else {}))
+        self._schedule_thumbnails()
+
+    def _schedule_thumbnails(self):
+        # Debounced: scrolling fires many events, only the final position needs thumbnails.
+        if self._thumbs_after is not None:
+            self.after_cancel(self._thumbs_after)
+        self._thumbs_after = self.after(80, self._load_visible_thumbnails)
+
+    def _load_visible_thumbnails(self):
+        self._thumbs_after = None
+        if self.history_window is None or not self.history_window.winfo_exists():
+            return
+        tree = self.history_view
+        item = tree.identify_row(2)
+        last = tree.identify_row(tree.winfo_height() - 2)
+        wanted = []
+        while item:
+            if item not in self._history_thumbs and item not in self._thumbs_pending:
+                wanted.append(item)
+            if item == last:
+                break
+            item = tree.next(item)
+        if not wanted:
+            return
+        self._thumbs_pending.update(wanted)
+        history = self.core.run_history()
+
+        def make():
+            for iid in wanted:
+                try:
+                    data = history.thumbnail(int(iid))
+                except sqlite3.Error as exc:
+                    logger.warning("Unable to load thumbnail for run %s: %s", iid, exc)
+                    data = None
+                self.after(0, self._show_thumbnail, iid, data)
+
+        threading.Thread(target=make, daemon=True).start()
+
+    def _show_thumbnail(self, iid, data):
+        self._thumbs_pending.discard(iid)
+        if data is None or self.history_window is None or not self.history_window.winfo_exists():
+            return  # image not written yet; retried on the next scroll
+        if self.history_view.exists(iid):
+            photo = ImageTk.PhotoImage(Image.open(io.BytesIO(data)))
+            self._history_thumbs[iid] = photo
+            self.history_view.item(iid, image=photo)
+
+    def _selected_run(self):
+        selection = self.history_view.selection()
+        return self.core.run_history().get(int(selection[0])) if selection else None
+
+    def _open_run(self):
+        run = self._selected_run()
+        if run is None:
+            return
+        # Saved artifacts only: no re-reading the source, no new layout.
+        if not Path(run["image_path"]).exists():
+            messagebox.showerror("TelegramWordCloud", f"{run['image_path']} no longer exists.", parent=self.history_window)
+            return
+        try:
+            with Image.open(run["image_path"]) as img:
+                self._render_image(img.convert("RGB"))
+        except OSError as exc:
+            messagebox.showerror("TelegramWordCloud", f"Cannot show {run['image_path']}: {exc}", parent=self.history_window)
+            return
+        self._log(f"Opened run from {run['created'].replace('T', ' ')}: {run['image_path']}")
+        if run["table_path"] and Path(run["table_path"]).exists():
+            try:
+                table = self.core.load_frequency_table(run["table_path"], self.core.load_stopwords(str(STOPWORDS_PATH)))
+            except (OSError, ValueError) as exc:
+                self._log(f"Could not read {run['table_path']}: {exc}")
+                return
+            top = sorted(table.frequencies.items(), key=lambda item: item[1], reverse=True)[:10]
+            self._log(f"{len(table.frequencies)} words; top: " + ", ".join(f"{w} ({c:g})" for w, c in top))
+            # Ready to restyle with Run, straight from the saved counts.
+            self.csv_mode.set("freq")
+            self.freq_path.set(run["table_path"])
+            self._update_csv_inputs()
+
+    def _forget_run(self):
+        run = self._selected_run()
+        if run is not None:
+            self.core.run_history().remove(run["id"])
+            self._history_thumbs.pop(str(run["id"]), None)
+            self._refresh_history()
+
+    def _import_runs(self):
+        added = self.core.run_history().import_exports(self.out_dir.get().strip() or os.getcwd())
+        self._log(f"Added {added} earlier runs to the history.")
+        self._refresh_history()
+
     def on_run(self):
         selected_id = self.nb.select()
         tab_text = self.nb.tab(selected_id, "text")
@@ -415,12 +859,24 @@ class App(tk.Tk):
                 if not source:
                     messagebox.showerror("TelegramWordCloud", "Select a Telegram JSON export (result.json) first.")
                     return
+            elif self.csv_mode.get() == "freq":
+                source = self.freq_path.get().strip()
+                if not source:
+                    messagebox.showerror("TelegramWordCloud", "Select a saved frequency table first.")
+                    return
+            elif self.csv_mode.get() == "dir":
+                source = self.dir_path.get().strip()
+                if not source:
+                    messagebox.showerror("TelegramWordCloud", "Select a folder of exports or enter a glob pattern first.")
+                    return
             else:
                 source = self.csv_path.get().strip()
                 if not source:
                     messagebox.showerror("TelegramWordCloud", "Select a CSV export file first.")
                     return
-            args = ("csv", self.csv_mode.get(), source, self.out_dir.get().strip(), self.save_image.get())
+            args = ("csv", self.csv_mode.get(), source, self.out_dir.get().strip(),
+                    self.download_mode.get(), self.date_from.get().strip(), self.date_to.get().strip(),
+                    self.last_n.get().strip(), self._processing_options())
         else:
             channel_value = self.channel.get().strip()
             if not channel_value:
@@ -434,28 +890,57 @@ class App(tk.Tk):
                     channel_value,
                     self.out_dir.get().strip(),
                     self.download_only.get(),
-                    self.save_image.get(),
                     self.download_mode.get(),
                     self.date_from.get().strip(),
                     self.date_to.get().strip(),
-                    self.last_n.get().strip())
+                    self.last_n.get().strip(),
+                    self.bulk_export.get(),
+                    self._processing_options())
         self._run_background(args)
 
+    def _processing_options(self):
+        # Snapshot of the options shared by every data source, read on the main thread.
+        return {
+            "save_image": self.save_image.get(),
+            "image_formats": tuple(fmt for fmt, var in self.image_formats.items() if var.get()) or DEFAULT_IMAGE_FORMATS,
+            "image_scales": (1, 2) if self.double_size.get() else (1,),
+            "jpeg_quality": min(self._spin_value(self.jpeg_quality, DEFAULT_JPEG_QUALITY), 100),
+            "time_bucket": self.time_bucket.get(),
+            "animate": self.animate.get(),
+            "approx_counts": self.approx_counts.get(),
+            "dedup": self.dedup.get() or self.near_dup.get(),
+            "near_dup": self.near_dup.get(),
+            "tokenizer": self.tokenizer_mode.get(),
+            "group_by": self.group_by.get().strip() or "none",
+            "group_top": self._spin_value(self.group_top, TOP_GROUPS),
+            "group_weight": self.group_weight.get(),
+            "per_file": self.per_file.get() and self.csv_mode.get() == "dir",
+            "entity_clouds": self.entity_clouds.get() and self.csv_mode.get() in ("json", "dir"),
+            "live": self.live.get(),
+            "live_interval": self._spin_value(self.live_interval, int(LIVE_RENDER_INTERVAL)),
+            "live_window": self._spin_value(self.live_window, 0),
+            "width": self._spin_value(self.restyle_width, WORDCLOUD_WIDTH),
+            "height": self._spin_value(self.restyle_height, WORDCLOUD_HEIGHT),
+            "max_words": self._spin_value(self.restyle_max_words, WORDCLOUD_MAX_WORDS),
+            "colormap": None if self.restyle_colormap.get().strip() in ("", "default") else self.restyle_colormap.get().strip(),
+        }
+
     # ---------- Worker thread ----------
     def _run_background(self, args_tuple):
-        self.progress.config(mode="indeterminate")
-        self.progress["value"] = 0
-        self.progress.start(10)
-        self.status.config(text="Working...")
-        if self.current_thread and self.current_thread.is_alive():
-            messagebox.showinfo("TelegramWordCloud", "A job is already running. Cancel it before starting another.")
-            return
-        self.cancel_event.clear()
-        self.run_button.config(state="disabled")
-        self.cancel_button.config(state="normal")
-        t = threading.Thread(target=self._worker, args=(args_tuple,), daemon=True)
-        t.start()
-        self.current_thread = t
+        mode = args_tuple[0]
+        if mode == "csv":
+            title, kind = f"Cloud from {Path(args_tuple[2]).name}", "cpu"
+        elif mode == "telethon":
+            if args_tuple[-1]["live"] and not args_tuple[6]:
+                action = "Live"
+            else:
+                action = "Download" if args_tuple[6] else "Download + cloud"
+            # Only the Telegram part runs here: the cloud after a download is queued as its own
+            # "cpu" job, and live renders each take a "cpu" slot (see _run_live).
+            title, kind = f"{action}: {args_tuple[4]}", "io"
+        else:
+            title, kind = "Check authentication", "io"
+        self.jobs.submit(title, kind, lambda job: self._worker(job, args_tuple))
 
     def _call_on_main_thread(self, func, *args, **kwargs):
         if threading.current_thread() is threading.main_thread():
@@ -474,38 +959,86 @@ class App(tk.Tk):
             return payload
         raise payload
 
-    def _worker(self, args):
+    def _worker(self, job, args):
+        # Runs on a job thread; everything job-specific (cancel event, progress, log prefix) goes through ``job``.
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         try:
             mode = args[0]
             if mode == "csv":
-                _, file_format, source_path, out_dir, save_img = args
-                if file_format == "json":
-                    self._log("Reading JSON export...")
-                    df = self.core.load_json_export(source_path)
+                _, file_format, source_path, out_dir, scope_mode, scope_from, scope_to, scope_last, opts = args
+                if file_format == "freq":
+                    self._render_frequency_table(job, source_path, out_dir, opts)
+                    job.log("Done.")
+                    return
+                date_from, date_to, last_n = self._parse_scope(scope_mode, scope_from, scope_to, scope_last)
+                if file_format == "dir":
+                    job.log("Reading exports in parallel...")
+                    df = self.core.load_exports(source_path, date_from=date_from, date_to=date_to, cancel_event=job.cancel_event)
+                    self._report_ingest(job, df)
+                elif file_format == "json":
+                    job.log("Reading JSON export...")
+                    df = self.core.load_json_export(source_path, date_from=date_from, date_to=date_to, cancel_event=job.cancel_event)
                 else:
-                    self._log("Reading CSV...")
-                    df = self.core.load_csv(source_path)
-                self._raise_if_cancelled()
-                tokens = self.core.flatten_text_columns(df)
-                if not tokens:
-                    raise ValueError("No text messages were found to process.")
-                stop = self.core.load_stopwords(str(STOPWORDS_PATH))
-                self._raise_if_cancelled()
-                self._log("Generating word cloud...")
-                wc = self.core.build_wordcloud(tokens, stop)
-                self._render_cloud(wc)
-                if save_img:
-                    out = self.core.ensure_dir(out_dir)
-                    self._raise_if_cancelled()
-                    fn = self.core.save_wordcloud_image(wc, out)
-                    self._log(f"Saved image -> {fn}")
+                    job.log("Reading CSV...")
+                    df = self.core.load_csv(source_path, date_from=date_from, date_to=date_to, cancel_event=job.cancel_event)
+                if last_n:
+                    df = self.core.slice_by_date(df, last_n=last_n)
+                job.check_cancelled()
+                df = self._dedupe(job, df, opts)
+                source_name = Path(source_path).name
+                scope = self._describe_scope(scope_mode, scope_from, scope_to, scope_last)
+                if opts["per_file"]:
+                    job.log("Generating one word cloud per file...")
+                    stop = self.core.load_stopwords(str(STOPWORDS_PATH))
+                    per_file_dir = self.core.build_export_dir(out_dir, Path(source_path).stem or "exports")
+                    tokenizer = build_tokenizer(opts["tokenizer"], stop)
+                    paths = []
+                    for label, path in self.core.build_per_file_wordclouds(
+                        df, stop, str(per_file_dir), cancel_event=job.cancel_event, tokenizer=tokenizer
+                    ):
+                        job.log(f"Saved {label} -> {path}")
+                        paths.append(path)
+                    self._report_tokenizer(job, tokenizer)
+                    self._record_batch(job, source_name, f"{scope}, per file", paths, len(df))
+                if opts["group_by"] != "none":
+                    paths = self._render_group_clouds(job, df, self.core.build_export_dir(out_dir, Path(source_path).stem or "exports"), opts)
+                    self._record_batch(job, source_name, f"{scope}, per {opts['group_by']}", paths, len(df))
+                if opts["entity_clouds"]:
+                    job.log("Generating hashtag, mention and domain clouds...")
+                    entity_dir = self.core.build_export_dir(out_dir, Path(source_path).stem or "exports")
+                    paths = []
+                    for label, path in self.core.build_entity_wordclouds(df, str(entity_dir), cancel_event=job.cancel_event):
+                        job.log(f"Saved {label} -> {path}")
+                        paths.append(path)
+                    self._record_batch(job, source_name, f"{scope}, hashtags/mentions/domains", paths, len(df))
+                if opts["time_bucket"] != "none":
+                    # No run folder for a preview: nothing would be written into it.
+                    export_dir = self.core.build_export_dir(out_dir, Path(source_path).stem) if opts["save_image"] else None
+                    paths = self._render_time_slices(job, df, export_dir, opts)
+                    self._record_batch(job, source_name, f"{scope}, per {opts['time_bucket']}", paths, len(df))
                 else:
-                    self._log("Preview only (not saved).")
+                    started = time.perf_counter()
+                    tokens = self.core.flatten_text_columns(df, cancel_event=job.cancel_event)
+                    if not tokens:
+                        raise ValueError("No text messages were found to process.")
+                    stop = self.core.load_stopwords(str(STOPWORDS_PATH))
+                    job.check_cancelled()
+                    job.log("Generating word cloud...")
+                    wc, freqs = self._build_cloud(job, tokens, stop, opts)
+                    self._report_dedup_savings(job, df, time.perf_counter() - started)
+                    image = self._render_cloud(wc)
+                    if opts["save_image"]:
+                        job.check_cancelled()
+                        outputs = self._save_outputs(job, wc, image, out_dir, None, opts)
+                        table_fn = self._save_frequencies(job, freqs, df, source_path, stop, opts, next(iter(outputs)))
+                        fn = self._finish_outputs(job, outputs)
+                        self._record_run(job, source_name, scope, fn, table_fn, len(df))
+                    else:
+                        job.log("Preview only (not saved).")
 
             elif mode == "telethon":
-                _, aid, ah, ph, channel, out_dir, dl_only, save_img, scope_mode, scope_from, scope_to, scope_last = args
+                _, aid, ah, ph, channel, out_dir, dl_only, scope_mode, scope_from, scope_to, scope_last, bulk, opts = args
                 if not (aid and ah and ph):
                     raise ValueError("Enter API ID, API hash, and phone number before running Telethon downloads.")
                 try:
@@ -519,103 +1052,419 @@ class App(tk.Tk):
                         kwargs["show"] = "*"
                     return self._call_on_main_thread(simpledialog.askstring, "Telegram", prompt, **kwargs)
 
-                def progress_callback(done, total):
-                    if self.cancel_event.is_set():
-                        raise CancelledError()
-                    self._update_download_progress(done, total)
-                date_from = date_to = None
-                last_n = None
-                if scope_mode == "range":
-                    date_from = self._parse_date(scope_from)
-                    date_to = self._parse_date(scope_to)
-                elif scope_mode == "last":
-                    try:
-                        last_n = int(scope_last)
-                    except ValueError:
-                        raise ValueError("Enter a numeric value for last N posts.")
-                self._raise_if_cancelled()
-                self._log("Downloading channel messages...")
+                date_from, date_to, last_n = self._parse_scope(scope_mode, scope_from, scope_to, scope_last)
+                job.check_cancelled()
+                if opts["live"] and not dl_only:
+                    self._run_live(job, aid_int, ah, ph, channel, code_provider, out_dir, (date_from, date_to, last_n), opts)
+                    return
+                self._note_live_session(job)
+                job.log("Downloading channel messages...")
                 df = self.core.download_channel(
                     aid_int,
                     ah,
                     ph,
                     channel,
                     code_provider,
-                    progress_callback=progress_callback,
+                    progress_callback=job.report_progress,
                     date_from=date_from,
                     date_to=date_to,
                     last_n=last_n,
+                    bulk_export=bulk,
+                    cancel_event=job.cancel_event,
                 )
-                self._raise_if_cancelled()
+                stats = df.attrs.get("download_stats")
+                if stats:
+                    job.log(
+                        f"Downloaded {stats['messages']} messages in {stats['seconds']:.1f}s "
+                        f"({stats['rate']:.0f} msg/s, {stats['mode']} mode)."
+                    )
                 export_dir = self.core.build_export_dir(out_dir, channel)
                 csv_fn = self.core.save_messages_csv(df, str(export_dir), channel, filename="messages.csv")
-                self._log(f"Exported messages -> {csv_fn}")
-                if not dl_only:
-                    tokens = self.core.flatten_text_columns(df)
+                job.log(f"Exported messages -> {csv_fn}")
+                if stats and stats.get("cancelled"):
+                    job.log(f"Download cancelled; kept the {stats['messages']} messages fetched so far.")
+                    raise CancelledError()
+                if dl_only:
+                    job.log("Download-only mode (no word cloud).")
+                else:
+                    # The cloud is CPU work: hand it to a "cpu" job so it counts against that limit.
+                    scope = self._describe_scope(scope_mode, scope_from, scope_to, scope_last)
+                    cloud = self.jobs.submit(
+                        f"Cloud: {channel}", "cpu",
+                        lambda cloud_job: self._worker(cloud_job, ("downloaded", channel, df, export_dir, scope, opts)),
+                    )
+                    job.log(f"Word cloud queued as job #{cloud.id}.")
+            elif mode == "downloaded":
+                _, channel, df, export_dir, scope, opts = args
+                df = self._dedupe(job, df, opts)
+                if opts["group_by"] != "none":
+                    paths = self._render_group_clouds(job, df, export_dir, opts)
+                    self._record_batch(job, channel, f"{scope}, per {opts['group_by']}", paths, len(df))
+                if opts["time_bucket"] != "none":
+                    paths = self._render_time_slices(job, df, export_dir, opts)
+                    self._record_batch(job, channel, f"{scope}, per {opts['time_bucket']}", paths, len(df))
+                else:
+                    started = time.perf_counter()
+                    tokens = self.core.flatten_text_columns(df, cancel_event=job.cancel_event)
                     stop = self.core.load_stopwords(str(STOPWORDS_PATH))
-                    self._raise_if_cancelled()
-                    self._log("Generating word cloud...")
-                    wc = self.core.build_wordcloud(tokens, stop)
-                    self._render_cloud(wc)
-                    if save_img:
-                        self._raise_if_cancelled()
-                        img_fn = self.core.save_wordcloud_image(wc, str(export_dir), filename="wordcloud.jpg")
-                        self._log(f"Saved image -> {img_fn}")
+                    job.check_cancelled()
+                    job.log("Generating word cloud...")
+                    wc, freqs = self._build_cloud(job, tokens, stop, opts)
+                    self._report_dedup_savings(job, df, time.perf_counter() - started)
+                    image = self._render_cloud(wc)
+                    if opts["save_image"]:
+                        job.check_cancelled()
+                        outputs = self._save_outputs(job, wc, image, str(export_dir), "wordcloud", opts)
+                        table_fn = self._save_frequencies(job, freqs, df, channel, stop, opts, next(iter(outputs)))
+                        img_fn = self._finish_outputs(job, outputs)
+                        self._record_run(job, channel, scope, img_fn, table_fn, len(df))
+            elif mode == "auth":
+                _, aid, ah = args
+                if not (aid and ah):
+                    raise ValueError("Enter API ID and API hash before checking authentication.")
+                try:
+                    aid_int = int(aid)
+                except ValueError as exc:
+                    raise ValueError("Enter a numeric API ID.") from exc
+                self._note_live_session(job)
+                job.log("Checking Telethon session...")
+                try:
+                    authorized = self.core.check_authorization(aid_int, ah)
+                except Exception:
+                    self._set_auth_status("Authentication check failed", "#c0392b")
+                    raise
+                if authorized:
+                    self._set_auth_status("Signed in", "#2e8b57")
+                    job.log("Telethon session is authenticated.")
                 else:
-                    self._log("Download-only mode (no word cloud).")
+                    self._set_auth_status("Login required", "#d35400")
+                    job.log("Telethon session needs a login code.")
             else:
                 raise ValueError("Unknown mode.")
-            self._set_status("Done.")
+            job.log("Done.")
+        except CancelledError:
+            job.log("Operation cancelled by user.")
+            raise
         except Exception as exc:
-            self._set_status("Error.")
-            self._log(f"Error: {exc}")
-            logger.exception("Worker error: %s", exc)
-            self._call_on_main_thread(messagebox.showerror, "TelegramWordCloud", str(exc))
+            job.log(f"Error: {exc}")
+            # Not waited for: the job must release its slot now, not when the dialog is dismissed.
+            self.after(0, messagebox.showerror, "TelegramWordCloud", f"{job.title}: {exc}")
+            raise
         finally:
             loop.close()
-            self.after(0, self._reset_progress_bar)
-            self.after(0, self._finalize_worker)
+
+    def _dedupe(self, job, df, opts):
+        if not opts["dedup"]:
+            return df
+        job.log("Removing duplicate messages...")
+        df = self.core.deduplicate_messages(
+            df, near_duplicates=opts["near_dup"], cancel_event=job.cancel_event
+        )
+        job.check_cancelled()
+        return df
+
+    def _report_ingest(self, job, df):
+        stats = df.attrs.get("ingest_stats", [])
+        for entry in stats:
+            if entry["error"]:
+                job.log(f"Skipped {entry['file']}: {entry['error']}")
+            else:
+                job.log(f"Read {entry['file']}: {entry['messages']} messages in {entry['seconds']:.2f}s")
+        failed = sum(1 for entry in stats if entry["error"])
+        job.log(f"Merged {len(df)} messages from {len(stats) - failed} of {len(stats)} files.")
+
+    def _report_dedup_savings(self, job, df, cloud_seconds):
+        stats = df.attrs.get("dedup_stats")
+        if not stats:
+            return
+        total_chars = stats["kept_chars"] + stats["removed_chars"]
+        share = stats["removed_chars"] / total_chars if total_chars else 0.0
+        # Tokenizing and counting scale with text volume, so the removed share of characters
+        # approximates the share of that work that was skipped.
+        saved = cloud_seconds * stats["removed_chars"] / stats["kept_chars"] if stats["kept_chars"] else 0.0
+        job.log(
+            f"Dropped {stats['removed']} duplicate messages ({share:.0%} of text) in {stats['seconds']:.2f}s; "
+            f"about {saved:.1f}s of tokenizing/counting saved."
+        )
+
+    def _build_cloud(self, job, tokens, stop, opts):
+        # Count first so the frequencies can be saved next to the image.
+        tokenizer = build_tokenizer(opts["tokenizer"], stop)
+        if opts["approx_counts"]:
+            freqs = self.core.count_words_approx(tokens, stop, cancel_event=job.cancel_event, tokenizer=tokenizer)
+        else:
+            freqs = self.core.count_words(tokens, stop, cancel_event=job.cancel_event, tokenizer=tokenizer)
+        self._report_tokenizer(job, tokenizer)
+        job.check_cancelled()
+        return self.core.build_wordcloud(freqs, stop, cancel_event=job.cancel_event), freqs
+
+    def _report_tokenizer(self, job, tokenizer):
+        if tokenizer is not None:
+            job.log(tokenizer.describe())
+
+    def _save_frequencies(self, job, freqs, df, source, stop, opts, image_path):
+        table = self.core.frequency_table(
+            freqs, df, source, stop, approximate=opts["approx_counts"], tokenizer=opts["tokenizer"]
+        )
+        image_path = Path(image_path)
+        paths = self.core.save_frequency_tables(table, str(image_path.parent), f"{image_path.stem}_frequencies")
+        job.log(f"Saved frequency table -> {paths[0]} (+ .csv/.json)")
+        return paths[0]
+
+    def _record_run(self, job, source, scope, image_path, table_path, messages):
+        try:
+            self.core.run_history().record(
+                source=source, scope=scope, image_path=image_path, table_path=table_path, messages=messages,
+                seconds=time.time() - job.started_at if job.started_at else None,
+            )
+        except sqlite3.Error as exc:
+            job.log(f"Could not add the run to the history: {exc}")
+            return
+        self.after(0, self._refresh_history)
+
+    def _record_batch(self, job, source, scope, paths, messages):
+        # One history entry per batch of clouds, shown with its first image.
+        images = [path for path in paths if Path(path).suffix.lower() in IMAGE_SUFFIXES]
+        if images:
+            self._record_run(job, source, f"{scope} ({len(paths)} clouds)", images[0], None, messages)
+
+    def _note_live_session(self, job):
+        # monitor_channel keeps the Telegram connection for the whole session; say why this job waits.
+        live = self._live_job
+        if live is not None and live is not job and not live.is_finished:
+            job.log(f"Waiting for live job #{live.id} to stop; it holds the Telegram connection until cancelled.")
+
+    def _run_live(self, job, api_id, api_hash, phone, channel, code_provider, out_dir, scope, opts):
+        date_from, date_to, backfill = scope
+        stop = self.core.load_stopwords(str(STOPWORDS_PATH))
+        window = opts["live_window"] * 60 or None
+
+        def on_update(image, stats):
+            self._render_image(image)
+            job.log(
+                f"Live: {stats['messages']} messages, {stats['words']} distinct words; "
+                f"redrawn in {stats['render_seconds']:.2f}s ({stats['reused_layouts']} of "
+                f"{stats['full_layouts'] + stats['reused_layouts']} renders reused the layout)."
+            )
+
+        self._note_live_session(job)
+        described = f"the last {opts['live_window']} min" if window else "everything since start"
+        if date_from:
+            described += f", seeded with posts since {date_from:%Y-%m-%d}"
+        elif backfill:
+            described += f", seeded with the last {backfill} posts"
+        ending = f" until {date_to:%Y-%m-%d %H:%M}" if date_to else ""
+        job.log(f"Following {channel}{ending} ({described}, refresh every {opts['live_interval']}s); cancel the job to stop.")
+        self._live_job = job
+        try:
+            counts = self.core.monitor_channel(
+                api_id, api_hash, phone, channel, code_provider, stop, on_update,
+                window_seconds=window,
+                render_interval=opts["live_interval"],
+                backfill=backfill or 0,
+                since=date_from,
+                until=date_to,
+                tokenizer=build_tokenizer(opts["tokenizer"], stop),
+                render_slot=lambda: self.jobs.slot("cpu", job.cancel_event),
+                cancel_event=job.cancel_event,
+            )
+        finally:
+            if self._live_job is job:
+                self._live_job = None
+        # Cancelling is how a live session normally ends, so the job finishes as done, not cancelled.
+        job.log(f"Stopped following {channel} after {counts.messages} messages.")
+        if opts["save_image"] and counts.counts:
+            wc = self.core.build_wordcloud(dict(counts.counts), stop)
+            export_dir = self.core.build_export_dir(out_dir, channel)
+            fn = self._finish_outputs(job, self._save_outputs(job, wc, None, str(export_dir), "wordcloud_live", opts))
+            scope = f"live, last {opts['live_window']} min" if window else "live"
+            self._record_run(job, channel, scope, fn, None, counts.messages)
+
+    def _save_outputs(self, job, wc, image, out_dir, stem, opts):
+        # Encoding starts on the core's background threads while the job carries on (the preview
+        # is already shown); _finish_outputs waits for it before the job can finish.
+        futures = self.core.save_wordcloud_outputs(
+            wc, out_dir, stem, formats=opts["image_formats"], scales=opts["image_scales"],
+            quality=opts["jpeg_quality"], image=image,
+        )
+        job.log(f"Saving {len(futures)} image file(s) -> {Path(next(iter(futures))).parent}")
+        return futures
+
+    def _finish_outputs(self, job, futures):
+        """Wait for the encodes started by ``_save_outputs``; returns the first saved path, raises if any failed."""
+        errors = []
+        for path, future in futures.items():
+            try:
+                result = future.result()
+            except Exception as exc:
+                errors.append(f"{Path(path).name}: {exc}")
+                job.log(f"Error saving {path}: {exc}")
+                continue
+            job.log(f"Saved {result['format'].upper()} ({result['scale']}x, encoded in {result['seconds']:.2f}s) -> {path}")
+        if errors:
+            raise OSError(f"Could not save {len(errors)} of {len(futures)} image files ({'; '.join(errors)}).")
+        # The history shows thumbnails, so prefer a raster file over SVG.
+        raster = [path for path in futures if Path(path).suffix.lower() in IMAGE_SUFFIXES]
+        return raster[0] if raster else next(iter(futures))
+
+    def _render_frequency_table(self, job, path, out_dir, opts):
+        started = time.perf_counter()
+        stop = self.core.load_stopwords(str(STOPWORDS_PATH))
+        table = self.core.load_frequency_table(path, stop)
+        meta = table.metadata
+        job.log(
+            f"Loaded {len(table.frequencies)} words counted from {meta.get('messages', '?')} messages "
+            f"of {meta.get('source', 'unknown source')} ({meta.get('date_from') or '?'} to {meta.get('date_to') or '?'})."
+        )
+        wc = self.core.build_wordcloud(
+            table.frequencies, stop, cancel_event=job.cancel_event,
+            width=opts["width"], height=opts["height"], max_words=opts["max_words"], colormap=opts["colormap"],
+        )
+        job.log(f"Laid out word cloud in {time.perf_counter() - started:.2f}s (ingestion skipped).")
+        image = self._render_cloud(wc)
+        if opts["save_image"]:
+            self._finish_outputs(job, self._save_outputs(job, wc, image, out_dir, None, opts))
+
+    def _render_group_clouds(self, job, df, export_dir, opts):
+        column = opts["group_by"]
+        stop = self.core.load_stopwords(str(STOPWORDS_PATH))
+        tokenizer = build_tokenizer(opts["tokenizer"], stop)
+        weight = opts["group_weight"]
+        if weight == "frequency":
+            job.log(f"Counting words per '{column}' (top {opts['group_top']} groups)...")
+            counted = self.core.count_words_by_group(
+                df, column, stop, top_groups=opts["group_top"], tokenizer=tokenizer, cancel_event=job.cancel_event
+            )
+            table = self.core.save_group_top_words(counted, str(export_dir), column)
+        else:
+            job.log(f"Scoring distinctive words per '{column}' by {weight} (top {opts['group_top']} groups)...")
+            counted = self.core.distinctive_terms(
+                df, column, stop, method=weight, top_groups=opts["group_top"], tokenizer=tokenizer,
+                cancel_event=job.cancel_event,
+            )
+            table = self.core.save_group_top_words(counted, str(export_dir), f"{column}_{weight}", value_name=weight)
+            counted = [(f"distinctive_{label}", weights) for label, weights in counted]
+        self._report_tokenizer(job, tokenizer)
+        job.log(f"Saved top words per {column} -> {table}")
+        paths = []
+        for label, path in self.core.build_group_wordclouds(counted, str(export_dir), cancel_event=job.cancel_event):
+            job.log(f"Saved {label} -> {path}")
+            paths.append(path)
+        return paths
+
+    def _render_time_slices(self, job, df, export_dir, opts):
+        bucket = opts["time_bucket"]
+        stop = self.core.load_stopwords(str(STOPWORDS_PATH))
+        tokenizer = build_tokenizer(opts["tokenizer"], stop)
+        job.check_cancelled()
+        if not opts["save_image"]:
+            # Preview only: every period is counted, but only the latest is laid out and nothing is written.
+            counted = self.core.count_words_by_period(
+                df, stop, bucket=bucket, cancel_event=job.cancel_event, tokenizer=tokenizer
+            )
+            self._report_tokenizer(job, tokenizer)
+            label, counts = counted[-1]
+            job.check_cancelled()
+            self._render_cloud(self.core.build_wordcloud(counts, stop, cancel_event=job.cancel_event))
+            skipped = " The animation is only made when saving is on." if opts["animate"] else ""
+            job.log(f"Preview only (not saved): counted {len(counted)} periods, showing {label}.{skipped}")
+            return []
+        if opts["animate"]:
+            job.log(f"Animating word clouds per {bucket}...")
+            path = self.core.build_wordcloud_animation(
+                df, stop, str(export_dir), bucket=bucket, tween=2, cancel_event=job.cancel_event, tokenizer=tokenizer
+            )
+            self._report_tokenizer(job, tokenizer)
+            job.log(f"Saved animation -> {path}")
+            with Image.open(path) as img:
+                self._render_image(img.convert("RGB"))
+            return [path]
+        job.log(f"Generating one word cloud per {bucket}...")
+        results = self.core.build_time_sliced_wordclouds(
+            df, stop, str(export_dir), bucket=bucket, cancel_event=job.cancel_event, tokenizer=tokenizer
+        )
+        self._report_tokenizer(job, tokenizer)
+        for label, path in results:
+            job.log(f"Saved {label} -> {path}")
+        with Image.open(results[-1][1]) as img:
+            self._render_image(img.copy())
+        return [path for _, path in results]
 
     # ---------- UI helpers ----------
     def _render_cloud(self, wc):
+        image = wc.to_image()
+        self._render_image(image)
+        return image
+
+    def _render_image(self, image):
         def draw():
             self.ax.clear()
             self.ax.axis("off")
-            self.ax.imshow(wc, interpolation="bilinear")
+            self.ax.imshow(image, interpolation="bilinear")
             self.canvas.draw_idle()
-        self.last_wordcloud_image = wc.to_image()
+        self.last_wordcloud_image = image
         self.after(0, draw)
 
+    def _set_auth_status(self, text, color):
+        self.after(0, lambda: self.auth_status.config(text=text, foreground=color))
+
     def _set_status(self, text):
         self.after(0, lambda: self.status.config(text=text))
 
-    def _update_download_progress(self, processed, total):
-        def update():
-            if total and total > 0:
-                self.progress.stop()
-                self.progress.config(mode="determinate", maximum=total)
-                self.progress["value"] = min(processed, total)
-                self.status.config(text=f"Downloading... {processed}/{total}")
-            else:
-                if self.progress["mode"] != "indeterminate":
-                    self.progress.config(mode="indeterminate")
-                    self.progress.start(10)
-                self.status.config(text=f"Downloading... {processed}")
-        self.after(0, update)
-
-    def _reset_progress_bar(self):
-        self.progress.stop()
-        self.progress.config(mode="indeterminate")
-        self.progress["value"] = 0
-
-    def _finalize_worker(self):
-        self.current_thread = None
-        self.run_button.config(state="normal")
-        self.cancel_button.config(state="disabled")
-
-    def _raise_if_cancelled(self):
-        if self.cancel_event.is_set():
-            raise CancelledError()
+    def _on_job_change(self, job):
+        # Called from job threads; Tk widgets may only be touched on the main loop.
+        self.after(0, self._refresh_job, job)
+
+    def _refresh_job(self, job):
+        if job.id not in {j.id for j in self.jobs.jobs()}:
+            return  # cleared from the list while this update was queued
+        item = str(job.id)
+        if job.total:
+            progress = f"{job.done}/{job.total} ({min(job.done / job.total, 1):.0%})"
+        else:
+            progress = str(job.done) if job.done else ""
+        values = (f"#{job.id} {job.title}", job.state, progress, job.message)
+        if self.jobs_view.exists(item):
+            self.jobs_view.item(item, values=values)
+        else:
+            self.jobs_view.insert("", "end", iid=item, values=values)
+        self._refresh_job_summary()
+
+    def _refresh_job_summary(self):
+        active = self.jobs.active()
+        running = sum(1 for job in active if job.state != "queued")
+        queued = len(active) - running
+        if active:
+            self.status.config(text=f"{running} running, {queued} queued")
+            if not self._progress_running:
+                self.progress.start(10)
+                self._progress_running = True
+        else:
+            self.status.config(text="Ready")
+            self.progress.stop()
+            self.progress["value"] = 0
+            self._progress_running = False
+        self.cancel_button.config(state="normal" if active else "disabled")
+
+    def _describe_scope(self, scope_mode, scope_from, scope_to, scope_last):
+        if scope_mode == "range":
+            return f"{scope_from or 'start'} to {scope_to or 'now'}"
+        if scope_mode == "last":
+            return f"last {scope_last} posts"
+        return "all posts"
+
+    def _parse_scope(self, scope_mode, scope_from, scope_to, scope_last):
+        date_from = date_to = None
+        last_n = None
+        if scope_mode == "range":
+            date_from = self._parse_date(scope_from)
+            date_to = self._parse_date(scope_to)
+        elif scope_mode == "last":
+            try:
+                last_n = int(scope_last)
+            except ValueError:
+                raise ValueError("Enter a numeric value for last N posts.")
+        return date_from, date_to, last_n
 
     def _parse_date(self, value: str):
         value = value.strip()